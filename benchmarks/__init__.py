@@ -0,0 +1,51 @@
+import time
+
+
+def measure(func, repeat=5, number=1):
+    """
+    Measure the best elapsed time of the function call.
+
+    :param func: Target function without any arguments.
+    :param repeat: Repeat count to choose the best result.
+    :param number: Call count in a single measurement.
+    :return: Best elapsed seconds per a function call.
+    """
+    best = None
+
+    for _ in range(repeat):
+        begin = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        elapsed = (time.perf_counter() - begin) / number
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def report(title, header, rows):
+    """
+    Print the benchmark result table.
+
+    :param title: Benchmark title.
+    :param header: Column names.
+    :param rows: Row values. Float values are printed as micro seconds.
+    """
+    def _fmt(value):
+        if isinstance(value, float):
+            return '{:.2f}us'.format(value * 1e6)
+
+        return str(value)
+
+    table = [list(header)] + [[_fmt(v) for v in row] for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+
+    print('== {} =='.format(title))
+
+    for row in table:
+        print('  '.join(v.rjust(w) for v, w in zip(row, widths)))
+
+    print()
@@ -0,0 +1,108 @@
+"""
+Configuration load benchmark of each registered format. The same configs are
+written in every format whose writer is available, and the latency to load the
+file and to read a single and all categories is reported.
+
+    python -m benchmarks.bench_config_format [category count]
+"""
+import configparser
+import io
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+
+from benchmarks import measure, report
+from sglove.parser.config import _open_config
+
+__OPTION_COUNT = 32
+
+
+def __gen_configs(count):
+    return {
+        'cat{}'.format(i): {
+            'opt{}'.format(n): ''.join(random.choices(string.ascii_letters,
+                                                      k=16))
+            for n in range(__OPTION_COUNT)
+        }
+        for i in range(count)
+    }
+
+
+def __dump_toml(configs):
+    return '\n'.join(
+        '[{}]\n{}\n'.format(category, '\n'.join(
+            '{} = {}'.format(name, json.dumps(value))
+            for name, value in values.items()
+        ))
+        for category, values in configs.items()
+    ).encode()
+
+
+def __dump_ini(configs):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.optionxform = str
+    parser.read_dict(configs)
+
+    buffer = io.StringIO()
+    parser.write(buffer)
+
+    return buffer.getvalue().encode()
+
+
+def __writers():
+    writers = [
+        ('json', '.json', lambda c: json.dumps(c).encode()),
+        ('toml', '.toml', __dump_toml),
+        ('ini', '.ini', __dump_ini),
+    ]
+
+    try:
+        import msgpack
+        writers.append(('msgpack', '.msgpack', msgpack.packb))
+
+    except ImportError:
+        pass
+
+    try:
+        import yaml
+        writers.append(('yaml', '.yaml',
+                        lambda c: yaml.safe_dump(c).encode()))
+
+    except ImportError:
+        pass
+
+    return writers
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    configs = __gen_configs(count)
+    rows = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, extension, dump in __writers():
+            path = os.path.join(temp_dir, 'config' + extension)
+
+            with open(path, 'wb') as f_out:
+                f_out.write(dump(configs))
+
+            def load_all():
+                config = _open_config(path)
+
+                for category in config:
+                    config[category]
+
+            rows.append((name,
+                         '{}KB'.format(os.path.getsize(path) // 1024),
+                         measure(lambda: _open_config(path)['cat0']),
+                         measure(load_all)))
+
+    report('Config format load ({} categories)'.format(count),
+           ('format', 'size', 'single category', 'all categories'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Configuration loading benchmark of the eager json.load() path, the lazy
+indexed path and the warm SGLConfigCache path. Each case runs in a fresh
+interpreter to report its own peak resident memory.
+
+    python -m benchmarks.bench_config_load [size in MB]
+"""
+import json
+import os
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import report
+
+__CATEGORY_SIZE = 64 * 1024
+
+
+def __gen_config(path, size):
+    # Each category has the ~64KB options, and the application reads only
+    # a single category.
+    with open(path, 'w') as f_out:
+        f_out.write('{')
+
+        for i in range(max(1, size // __CATEGORY_SIZE)):
+            category = {
+                'opt{}'.format(n): ''.join(random.choices(string.ascii_letters,
+                                                          k=16))
+                for n in range(__CATEGORY_SIZE // 32)
+            }
+
+            f_out.write('{}"cat{}": '.format(',' if i else '', i))
+            json.dump(category, f_out)
+
+        f_out.write('}')
+
+
+def __child(mode, path):
+    begin = time.perf_counter()
+
+    if mode == 'eager':
+        with open(path, 'r') as f_in:
+            value = json.load(f_in)['cat0']['opt0']
+
+    elif mode == 'lazy':
+        from sglove.parser.config import _LazyJSONConfig
+        value = _LazyJSONConfig(path)['cat0']['opt0']
+
+    else:
+        from sglove.parser.config import SGLConfigCache
+        cache = SGLConfigCache(os.path.join(os.path.dirname(path), 'cache'))
+        value = cache.load(path)['cat0']['opt0']
+
+    elapsed = time.perf_counter() - begin
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({'elapsed': elapsed, 'rss': rss, 'value': value}))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'config.json')
+        __gen_config(path, size * 1024 * 1024)
+
+        rows = []
+
+        # The first cached run builds the cache entry, and the second one
+        # shows the warm start.
+        for label, mode in [('eager', 'eager'), ('lazy', 'lazy'),
+                            ('cold cache', 'cached'),
+                            ('warm cache', 'cached')]:
+            output = subprocess.check_output([
+                sys.executable, '-m', 'benchmarks.bench_config_load',
+                '--child', mode, path
+            ])
+
+            result = json.loads(output)
+            rows.append((label, result['elapsed'],
+                         '{}KB'.format(result['rss'])))
+
+    report('Config load ({}MB)'.format(size),
+           ('mode', 'latency', 'peak rss'), rows)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        __child(*sys.argv[2:4])
+    else:
+        main()
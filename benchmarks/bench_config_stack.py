@@ -0,0 +1,43 @@
+"""
+Configuration stack benchmark of the full merge and the incremental merge.
+The incremental merge visits only the keys of the changed layer, so its cost
+doesn't grow with the number of the unchanged layers.
+
+    python -m benchmarks.bench_config_stack
+"""
+from benchmarks import measure, report
+from sglove.parser import SGLConfigStack
+
+__LAYER_COUNTS = (2, 8, 32)
+__VARIABLE_COUNT = 1000
+
+
+def __layer(index):
+    return {
+        'group{}'.format(i % 10): {
+            'opt{}_{}'.format(index, i): i for i in range(__VARIABLE_COUNT)
+        } for i in range(10)
+    }
+
+
+def main():
+    rows = []
+
+    for count in __LAYER_COUNTS:
+        stack = SGLConfigStack()
+
+        for index in range(count):
+            stack.add_mapping('layer{}'.format(index), __layer(index))
+
+        top = 'layer{}'.format(count - 1)
+
+        rows.append((count, len(stack.items()),
+                     measure(stack.rebuild),
+                     measure(lambda: stack.refresh(top))))
+
+    report('Configuration stack merge',
+           ('layers', 'variables', 'full', 'incremental'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Batch type conversion benchmark of the per-value converter loop, the
+convert_batch() with the list and, if the NumPy is installed, with the NumPy
+array.
+
+    python -m benchmarks.bench_convert
+"""
+import random
+
+from benchmarks import measure, report
+from sglove.parser import convert_batch, _converter, _numpy
+
+__VALUE_COUNT = 100000
+
+
+def __gen_values():
+    # Label, type and values. The NumPy converts the numeric values
+    # vectorized, but the numeric strings are converted one by one.
+    return [
+        ('bool', bool, [random.choice(['on', 'off', 'yes', 'no'])
+                        for _ in range(__VALUE_COUNT)]),
+        ('int', int, [str(random.randint(0, 99999))
+                      for _ in range(__VALUE_COUNT)]),
+        ('float', float, [str(random.random()) for _ in range(__VALUE_COUNT)]),
+        ('str', str, [' value{} '.format(i) for i in range(__VALUE_COUNT)]),
+        ('float->int', int, [random.uniform(0, 99999)
+                             for _ in range(__VALUE_COUNT)]),
+    ]
+
+
+def main():
+    np = _numpy()
+    rows = []
+
+    for label, type, values in __gen_values():
+        convert = _converter(type)
+
+        def each():
+            for value in values:
+                convert(value)
+
+        row = [label,
+               measure(each) / __VALUE_COUNT,
+               measure(lambda: convert_batch(values, type)) / __VALUE_COUNT]
+
+        if np is not None:
+            array = np.array(values)
+            row.append(measure(lambda: convert_batch(array, type))
+                       / __VALUE_COUNT)
+        else:
+            row.append('-')
+
+        rows.append(row)
+
+    report('Batch conversion ({} values)'.format(__VALUE_COUNT),
+           ('type', 'per value', 'batch list', 'batch numpy'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Environment resolution benchmark of the per-option os.environ probing and the
+prefix filtered snapshot. The snapshot scans the environment only once
+regardless of the option count.
+
+    python -m benchmarks.bench_environ
+"""
+import os
+
+from benchmarks import measure, report
+from sglove.parser import _OptionManager
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNTS = (10, 1000, 10000)
+
+
+def main():
+    rows = []
+
+    for count in __OPTION_COUNTS:
+        manager = _OptionManager(__APP_NAME)
+        options = [manager.compile('group', 'opt{}'.format(i), type=int)
+                   for i in range(count)]
+
+        # Half of the options are given by the environment.
+        environ = {option.env: str(i)
+                   for i, option in enumerate(options) if i % 2}
+
+        saved = dict(os.environ)
+        os.environ.update(environ)
+
+        try:
+            def probing():
+                for option in options:
+                    if option.env in os.environ:
+                        option.convert(os.environ.get(option.env))
+
+            def snapshot():
+                manager.refresh_environ()
+
+                for option in options:
+                    manager.resolve(option, default=0)
+
+            rows.append((count, len(os.environ),
+                         measure(probing), measure(snapshot)))
+
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+
+    report('Environment resolution',
+           ('options', 'environ', 'probing', 'snapshot'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Raise and catch benchmark of the SGLException in each caller info mode. The
+message is read in the last column to show the cost of the lazy building.
+
+    python -m benchmarks.bench_exception
+"""
+from benchmarks import measure, report
+from sglove.exception import SGLException
+from sglove.parser.exception import SGL_PARSER_INVALID_CONFIG
+
+__RAISE_COUNT = 10000
+
+
+class __Validator:
+    def validate(self):
+        raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+
+def __raise_all(read):
+    validator = __Validator()
+
+    for _ in range(__RAISE_COUNT):
+        try:
+            validator.validate()
+
+        except SGLException as err:
+            if read:
+                str(err)
+
+
+def main():
+    rows = []
+
+    for mode in [SGLException.CALLER_INFO_EAGER,
+                 SGLException.CALLER_INFO_LAZY,
+                 SGLException.CALLER_INFO_OFF]:
+        previous = SGLException.set_caller_info(mode)
+
+        try:
+            rows.append((mode,
+                         measure(lambda: __raise_all(False)) / __RAISE_COUNT,
+                         measure(lambda: __raise_all(True)) / __RAISE_COUNT))
+
+        finally:
+            SGLException.set_caller_info(previous)
+
+    report('SGLException raise/catch', ('mode', 'raise', 'raise+str'), rows)
+
+
+if __name__ == '__main__':
+    main()
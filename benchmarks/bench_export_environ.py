@@ -0,0 +1,76 @@
+"""
+Child process start benchmark of the configuration file loading and the
+exported options. The child builds the parser and resolves all options from
+the file, from the '<APP>_<CATEGORY>_<NAME>' variables or from the single
+blob variable of the SGLParser.export_environ().
+
+    python -m benchmarks.bench_export_environ
+"""
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNTS = (10, 1000, 10000)
+__PER_GROUP = 100
+
+
+def __build(count, path):
+    parser = SGLParser(__APP_NAME, default_config=path,
+                       warn_unknown_env=False)
+
+    for i in range(0, count, __PER_GROUP):
+        group = parser.add_argument_group('group{}'.format(i // __PER_GROUP))
+
+        for j in range(min(__PER_GROUP, count - i)):
+            group.add_argument('opt{}'.format(j), default=0, type=int)
+
+    return parser
+
+
+def main():
+    sys.argv = [sys.argv[0]]
+    rows = []
+
+    for count in __OPTION_COUNTS:
+        config = {}
+        for i in range(count):
+            config.setdefault('group{}'.format(i // __PER_GROUP), {})[
+                'opt{}'.format(i % __PER_GROUP)
+            ] = i
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f_out:
+            json.dump(config, f_out)
+            f_out.flush()
+
+            def child():
+                __build(count, f_out.name).parse_args([])
+
+            parent = __build(count, f_out.name)
+            row = [count, measure(child)]
+
+            for blob in (False, True):
+                exported = parent.export_environ([], blob=blob)
+
+                saved = dict(os.environ)
+                os.environ.update(exported)
+
+                try:
+                    row.append(measure(child))
+
+                finally:
+                    os.environ.clear()
+                    os.environ.update(saved)
+
+            rows.append(row)
+
+    report('Child process start', ('options', 'file', 'environ', 'blob'),
+           rows)
+
+
+if __name__ == '__main__':
+    main()
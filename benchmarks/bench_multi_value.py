@@ -0,0 +1,54 @@
+"""
+Multi-valued option benchmark of the delimited integer lists. The naive
+conversion splits the whole string into the list of strings and builds the
+list of integers, but SGLList(int) converts it chunk by chunk into the
+array. The peak and the result sizes are measured by the tracemalloc.
+
+    python -m benchmarks.bench_multi_value
+"""
+import tracemalloc
+
+from benchmarks import measure, report
+from sglove.parser import SGLList
+
+__ITEM_COUNTS = (1000, 100000, 1000000)
+
+
+def __peak(func):
+    tracemalloc.start()
+
+    try:
+        result = func()
+        size, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return '{}KB/{}KB'.format(size // 1024, peak // 1024)
+
+
+def main():
+    rows = []
+
+    for count in __ITEM_COUNTS:
+        text = ','.join(str(i * 7919) for i in range(count))
+        convert = SGLList(int)
+
+        def naive():
+            return [int(value) for value in text.split(',')]
+
+        def chunked():
+            return convert(text)
+
+        rows.append((count, measure(naive), measure(chunked),
+                     __peak(naive), __peak(chunked)))
+
+    report('Delimited integer list',
+           ('items', 'naive', 'SGLList', 'naive size/peak',
+            'SGLList size/peak'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Option name and default resolution benchmark of the per-call name building
+path and the compiled option record path.
+
+The per-call path validates and formats the names on every call, but the
+compiled path builds them once at the registration and does only the lookups.
+
+    python -m benchmarks.bench_option_schema
+"""
+from benchmarks import measure, report
+from sglove.parser import SGLParser, _OptionManager
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNTS = (1000, 10000)
+
+
+def __build(count):
+    parser = SGLParser(__APP_NAME)
+    group = parser.add_argument_group('group')
+
+    for i in range(count):
+        group.add_argument('opt{}'.format(i), default=i, type=int)
+
+    return parser
+
+
+def main():
+    rows = []
+    manager = _OptionManager(__APP_NAME, environ={})
+
+    for count in __OPTION_COUNTS:
+        names = ['opt{}'.format(i) for i in range(count)]
+        options = [manager.compile('group', name, type=int) for name in names]
+
+        def per_call_names():
+            for name in names:
+                manager.dest_name('group', name)
+                manager.env_name('group', name)
+                manager.long_arg('group', name)
+
+        def per_call_defaults():
+            for i, name in enumerate(names):
+                manager.default_value('group', name, default=i, type=int)
+
+        def compiled_defaults():
+            for i, option in enumerate(options):
+                manager.resolve(option, default=i)
+
+        parser = __build(count)
+
+        rows.append((count,
+                     measure(per_call_names),
+                     measure(per_call_defaults),
+                     measure(compiled_defaults),
+                     measure(lambda: __build(count), repeat=3),
+                     measure(lambda: parser.parse_args([]))))
+
+    report('Option schema',
+           ('options', 'names per call', 'defaults per call',
+            'compiled defaults', 'construct', 'parse_args'), rows)
+
+
+if __name__ == '__main__':
+    main()
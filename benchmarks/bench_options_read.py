@@ -0,0 +1,87 @@
+"""
+Threaded read throughput benchmark of the parsed options. The nested
+argparse.Namespace and the frozen options from the parse_frozen() are read by
+the same number of threads, while a writer swaps the whole snapshot.
+
+    python -m benchmarks.bench_options_read
+"""
+import sys
+import threading
+import time
+
+from benchmarks import report
+from sglove.parser import SGLOptionsHolder, SGLParser
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNT = 100
+__THREAD_COUNTS = (1, 4, 16)
+__READ_COUNT = 20000
+
+
+def __build():
+    parser = SGLParser(__APP_NAME)
+    group = parser.add_argument_group('group')
+
+    for i in range(__OPTION_COUNT):
+        group.add_argument('opt{}'.format(i), default=i, type=int)
+
+    return parser
+
+
+def __throughput(holder, parse, threads):
+    names = ['opt{}'.format(i % __OPTION_COUNT) for i in range(__READ_COUNT)]
+    stop = threading.Event()
+
+    def read():
+        for name in names:
+            getattr(holder.current.group, name)
+
+    def write():
+        while not stop.is_set():
+            holder.swap(parse())
+
+    readers = [threading.Thread(target=read) for _ in range(threads)]
+    writer = threading.Thread(target=write)
+
+    writer.start()
+    begin = time.perf_counter()
+
+    for reader in readers:
+        reader.start()
+
+    for reader in readers:
+        reader.join()
+
+    elapsed = time.perf_counter() - begin
+
+    stop.set()
+    writer.join()
+
+    return '{:.2f}M/s'.format(threads * __READ_COUNT / elapsed / 1e6)
+
+
+def main():
+    saved = sys.argv
+    rows = []
+
+    try:
+        sys.argv = [saved[0]]
+
+        parser = __build()
+
+        for threads in __THREAD_COUNTS:
+            rows.append((threads,
+                         __throughput(SGLOptionsHolder(parser.parse_args()),
+                                      parser.parse_args, threads),
+                         __throughput(SGLOptionsHolder(parser.parse_frozen()),
+                                      parser.parse_frozen, threads)))
+
+    finally:
+        sys.argv = saved
+
+    report('Options read throughput',
+           ('threads', 'namespace', 'frozen'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Option registration benchmark of the add_argument() calls and the bulk
+add_schema(). Both of them check the duplicates with the dictionary and
+the set indexes, so the time per option stays flat as the option count
+grows.
+
+    python -m benchmarks.bench_register
+"""
+import sys
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNTS = (100, 1000, 10000)
+__GROUP_SIZE = 50
+
+
+def __schema(count):
+    groups = {}
+
+    for i in range(count):
+        group = groups.setdefault('group{}'.format(i // __GROUP_SIZE), {
+            'type': 'object', 'properties': {}
+        })
+
+        group['properties']['opt{}'.format(i)] = {'type': 'integer',
+                                                  'default': i}
+
+    return {'properties': groups}
+
+
+def main():
+    argv = sys.argv
+    sys.argv = [argv[0]]
+
+    rows = []
+
+    try:
+        for count in __OPTION_COUNTS:
+            schema = __schema(count)
+
+            def each():
+                parser = SGLParser(__APP_NAME)
+
+                for name, group in schema['properties'].items():
+                    target = parser.add_argument_group(name)
+
+                    for opt, prop in group['properties'].items():
+                        target.add_argument(opt, default=prop['default'],
+                                            type=int)
+
+            def bulk():
+                SGLParser(__APP_NAME).add_schema(schema)
+
+            def deferred():
+                SGLParser.restore(SGLParser(__APP_NAME).snapshot()) \
+                    .add_schema(schema)
+
+            elapsed = [measure(func, repeat=3)
+                       for func in (each, bulk, deferred)]
+
+            rows.append((count,) + tuple(elapsed)
+                        + ('{:.2f}us'.format(elapsed[2] / count * 1e6),))
+
+    finally:
+        sys.argv = argv
+
+    report('Option registration',
+           ('options', 'add_argument', 'add_schema', 'deferred',
+            'deferred/option'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Worker propagation benchmark. The options are sent to the 64 spawned pool
+workers by parsing again in each worker, by pickling the nested namespace
+with every task, and by the shared memory handle. The shared handle is
+pickled as the block name only, and each worker imports the options once.
+
+    python -m benchmarks.bench_shared_options
+"""
+import multiprocessing
+import pickle
+import sys
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser, SGLSharedOptions
+
+__APP_NAME = 'BENCH'
+__WORKER_COUNT = 64
+__TASK_COUNT = 64 * 20
+__GROUP_COUNT = 20
+__OPTION_COUNT = 100
+
+
+def _build():
+    argv = sys.argv
+    sys.argv = [argv[0]]
+
+    try:
+        parser = SGLParser(__APP_NAME)
+
+        for i in range(__GROUP_COUNT):
+            group = parser.add_argument_group('group{}'.format(i))
+
+            for j in range(__OPTION_COUNT):
+                group.add_argument('opt{}'.format(j), default=j, type=int)
+
+        return parser
+
+    finally:
+        sys.argv = argv
+
+
+_parsed = None
+
+
+def _init_parse():
+    global _parsed
+    _parsed = _build().parse_args([])
+
+
+def _read_parsed(_):
+    return _parsed.group0.opt1
+
+
+def _read_namespace(namespace):
+    return namespace.group0.opt1
+
+
+def _read_shared(shared):
+    return shared.get().group0.opt1
+
+
+def main():
+    parser = _build()
+    namespace = parser.parse_args([])
+    shared = SGLSharedOptions(parser.parse_frozen([]))
+
+    context = multiprocessing.get_context('spawn')
+
+    def run(func, payload, initializer=None):
+        def _run():
+            with context.Pool(__WORKER_COUNT, initializer=initializer) as pool:
+                pool.map(func, [payload] * __TASK_COUNT, chunksize=1)
+
+        return _run
+
+    try:
+        rows = [
+            ('reparse', 0,
+             measure(run(_read_parsed, None, _init_parse), repeat=3)),
+            ('namespace', len(pickle.dumps(namespace)),
+             measure(run(_read_namespace, namespace), repeat=3)),
+            ('shared', len(pickle.dumps(shared)),
+             measure(run(_read_shared, shared), repeat=3)),
+        ]
+
+    finally:
+        shared.close()
+
+    report('{} workers, {} tasks, {} options'.format(
+        __WORKER_COUNT, __TASK_COUNT, __GROUP_COUNT * __OPTION_COUNT
+    ), ('method', 'task bytes', 'elapsed'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Repeated parser construction benchmark of the separate configuration file
+loadings and the SGLSourceRegistry. The parsers of the registry share the
+loaded configuration and the environment snapshot.
+
+    python -m benchmarks.bench_source_registry
+"""
+import json
+import sys
+import tempfile
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser, SGLSourceRegistry
+
+__APP_NAME = 'BENCH'
+__CONFIG_SIZES = (100, 10000, 100000)
+__OPTION_COUNT = 10
+
+
+def main():
+    sys.argv = [sys.argv[0]]
+    rows = []
+
+    for size in __CONFIG_SIZES:
+        config = {'group{}'.format(i): {'opt{}'.format(j): j
+                                        for j in range(__OPTION_COUNT)}
+                  for i in range(size // __OPTION_COUNT)}
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f_out:
+            json.dump(config, f_out)
+            f_out.flush()
+
+            registry = SGLSourceRegistry()
+
+            def construct(registry=None):
+                parser = SGLParser(__APP_NAME, default_config=f_out.name,
+                                   warn_unknown_env=False, registry=registry)
+
+                group = parser.add_argument_group('group0')
+                for j in range(__OPTION_COUNT):
+                    group.add_argument('opt{}'.format(j), default=0, type=int)
+
+                parser.parse_args([])
+
+            rows.append((size, measure(construct, number=10),
+                         measure(lambda: construct(registry), number=10)))
+
+    report('Repeated construction', ('options', 'separate', 'registry'), rows)
+
+
+if __name__ == '__main__':
+    main()
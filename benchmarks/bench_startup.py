@@ -0,0 +1,61 @@
+"""
+Startup benchmark of SGLParser.
+
+The config file discovery should be flat regardless of the registered option
+count because it is a simple prefix scan on the argv. The restored parser
+from the snapshot skips the argparse construction if there is no argument.
+
+    python -m benchmarks.bench_startup
+"""
+import sys
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser, _scan_config
+
+__APP_NAME = 'BENCH'
+__OPTION_COUNTS = (10, 100, 1000)
+
+
+def __build(count):
+    parser = SGLParser(__APP_NAME)
+    group = parser.add_argument_group('group')
+
+    for i in range(count):
+        group.add_argument('opt{}'.format(i), default=i, type=int)
+
+    return parser
+
+
+def main():
+    rows = []
+    saved = sys.argv
+
+    for count in __OPTION_COUNTS:
+        # Keep the argv length even if the option count grows.
+        argv = ['--group-opt{}={}'.format(i, i) for i in range(10)]
+        argv += ['-c', 'not-exist.json']
+
+        try:
+            sys.argv = [saved[0]] + argv
+
+            parser = __build(count)
+            data = parser.snapshot()
+
+            rows.append((count,
+                         measure(lambda: _scan_config(argv), number=100),
+                         measure(lambda: __build(count)),
+                         measure(lambda: parser.parse_args(argv)),
+                         measure(lambda: SGLParser.restore(data)),
+                         measure(lambda: SGLParser.restore(data)
+                                 .parse_args([]))))
+
+        finally:
+            sys.argv = saved
+
+    report('SGLParser startup',
+           ('options', 'config scan', 'construct', 'parse_args', 'restore',
+            'restore+parse'), rows)
+
+
+if __name__ == '__main__':
+    main()
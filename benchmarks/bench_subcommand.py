@@ -0,0 +1,58 @@
+"""
+Subcommand startup benchmark. Every subcommand defined as the argument group
+is built at the construction, but the lazy subcommands build only the
+selected one. So the lazy startup time doesn't grow with the command count.
+
+    python -m benchmarks.bench_subcommand
+"""
+import sys
+
+from benchmarks import measure, report
+from sglove.parser import SGLParser
+
+__APP_NAME = 'BENCH'
+__COMMAND_COUNTS = (1, 10, 60)
+__OPTION_COUNT = 30
+
+
+def __define(target):
+    for i in range(__OPTION_COUNT):
+        target.add_argument('opt{}'.format(i), default=i, type=int)
+
+
+def main():
+    argv = sys.argv
+    sys.argv = [argv[0]]
+
+    rows = []
+
+    try:
+        for count in __COMMAND_COUNTS:
+            names = ['command{}'.format(i) for i in range(count)]
+
+            def eager():
+                parser = SGLParser(__APP_NAME)
+
+                for name in names:
+                    __define(parser.add_argument_group(name))
+
+                parser.parse_args(['--command0-opt0', '1'])
+
+            def lazy():
+                parser = SGLParser(__APP_NAME)
+
+                for name in names:
+                    parser.add_subcommand(name, __define)
+
+                parser.parse_args(['command0', '--command0-opt0', '1'])
+
+            rows.append((count, measure(eager), measure(lazy)))
+
+    finally:
+        sys.argv = argv
+
+    report('Subcommand startup', ('commands', 'eager', 'lazy'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Regression benchmark suite of the SGLParser construction, the configuration
+loading, the first parse_args() of a fresh parser and the repeated
+parse_args(). The schemas, configuration files and the
+environments are generated, so it runs offline. Each case runs in a fresh
+interpreter to report its own peak resident memory, and the time, the
+tracemalloc peak and the peak RSS are compared with the stored baseline.
+
+    python -m benchmarks.suite [--quick] [--save] [--baseline PATH]
+                               [--threshold RATIO]
+
+The --save stores the results as the baseline of this machine. Without it,
+the results are compared with the baseline, and the exit status is 1 if any
+metric is slower or larger than the baseline over the threshold ratio.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import report
+
+__APP_NAME = 'BENCH'
+__BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'baseline.json')
+
+# Each axis is swept with the other axes fixed at the first values.
+__OPTIONS = (10, 100, 1000, 10000)
+__GROUPS = (1, 50, 500)
+__CONFIG_SIZES = (1024, 1024 * 1024, 50 * 1024 * 1024)
+__ENV_SIZES = (10, 1000, 10000)
+
+__QUICK_CONFIG_SIZES = (1024, 1024 * 1024)
+
+# Compared metrics and the minimum absolute difference to be a regression.
+# Tiny values are dominated by the measurement noise.
+__METRICS = (('construct', 1e-3), ('load', 1e-3), ('cold', 1e-3),
+             ('parse', 1e-3), ('parse_cli', 1e-3), ('alloc', 256 * 1024),
+             ('rss', 4096))
+
+__CLI_COUNT = 10
+__CATEGORY_SIZE = 64 * 1024
+
+
+# ===============
+# Synthetic cases
+# ===============
+def __cases(quick):
+    base = {'options': 100, 'groups': 10, 'config': 1024, 'env': 10}
+    sizes = __QUICK_CONFIG_SIZES if quick else __CONFIG_SIZES
+
+    cases = []
+
+    for key, values in [('options', __OPTIONS), ('groups', __GROUPS),
+                        ('config', sizes), ('env', __ENV_SIZES)]:
+        for value in values:
+            case = dict(base, **{key: value})
+
+            # Every group has at least one option.
+            case['options'] = max(case['options'], case['groups'])
+
+            if case not in cases:
+                cases.append(case)
+
+    return cases
+
+
+def __case_name(case):
+    return 'o{options}-g{groups}-c{config}-e{env}'.format(**case)
+
+
+def __gen_config(path, size, groups, per_group):
+    # Registered options are in the first categories, and the padding
+    # categories fill the file up to the size.
+    with open(path, 'w') as f_out:
+        f_out.write('{')
+
+        for i in range(groups):
+            f_out.write('{}"group{}": '.format(',' if i else '', i))
+            json.dump({'opt{}'.format(j): j for j in range(per_group)}, f_out)
+
+        padding = 0
+
+        while f_out.tell() < size:
+            f_out.write(',"padding{}": '.format(padding))
+            json.dump({'pad{}'.format(n): 'x' * 24
+                       for n in range(min(__CATEGORY_SIZE,
+                                          size - f_out.tell()) // 36 + 1)},
+                      f_out)
+            padding += 1
+
+        f_out.write('}')
+
+
+def __gen_environ(count, groups, per_group):
+    # Half of the variables are the options, and the others are unrelated
+    # variables which the environment snapshot should skip.
+    environ = {}
+    prefix = __APP_NAME.upper()
+
+    for i in range(count):
+        if i % 2 and i // 2 < groups * per_group:
+            index = i // 2
+            environ['{}_GROUP{}_OPT{}'.format(
+                prefix, index % groups, index // groups % per_group
+            )] = str(i)
+        else:
+            environ['OTHER_VARIABLE_{}'.format(i)] = str(i)
+
+    return environ
+
+
+# ==========
+# Child runs
+# ==========
+def __best(func, repeat=3):
+    best = None
+
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - begin
+
+        best = elapsed if best is None or elapsed < best else best
+
+    return best
+
+
+def __child(case, path):
+    from sglove.parser import SGLParser
+    from sglove.parser.config import _open_config
+
+    groups, options = case['groups'], case['options']
+    per_group = options // groups
+
+    argv = ['--group{}-opt{}'.format(i % groups, i // groups % per_group)
+            for i in range(__CLI_COUNT)]
+    argv = [token for arg in argv for token in (arg, '1')]
+
+    sys.argv = [sys.argv[0]]
+
+    def construct():
+        parser = SGLParser(__APP_NAME, default_config=path,
+                           warn_unknown_env=False)
+
+        for i in range(groups):
+            group = parser.add_argument_group('group{}'.format(i))
+
+            for j in range(per_group):
+                group.add_argument('opt{}'.format(j), default=j, type=int)
+
+        return parser
+
+    def load():
+        # The JSON file is indexed at the first category access, so the
+        # loading is timed until the index is built.
+        config = _open_config(path)
+
+        return len(config), config.get('group0')
+
+    parser = construct()
+
+    result = {
+        'construct': __best(construct),
+        'load': __best(load),
+        'cold': __best(lambda: construct().parse_args([])),
+        'parse': __best(lambda: parser.parse_args([])),
+        'parse_cli': __best(lambda: parser.parse_args(argv)),
+    }
+
+    # Allocations are measured separately because the tracing slows down
+    # the timing.
+    tracemalloc.start()
+    construct().parse_args(argv)
+    result['alloc'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps(result))
+
+
+def __run(case, temp_dir):
+    per_group = case['options'] // case['groups']
+    path = os.path.join(temp_dir, '{}.json'.format(__case_name(case)))
+
+    __gen_config(path, case['config'], case['groups'], per_group)
+
+    try:
+        env = dict(os.environ)
+        env.update(__gen_environ(case['env'], case['groups'], per_group))
+
+        output = subprocess.check_output([
+            sys.executable, '-m', 'benchmarks.suite', '--child',
+            json.dumps(case), path
+        ], env=env)
+
+    finally:
+        os.unlink(path)
+
+    return json.loads(output)
+
+
+# ===================
+# Baseline comparison
+# ===================
+def __compare(results, baseline, threshold):
+    regressions = []
+
+    for name, result in results.items():
+        for metric, noise in __METRICS:
+            base = baseline.get(name, {}).get(metric)
+
+            if not base:
+                continue
+
+            if result[metric] > base * (1 + threshold) \
+                    and result[metric] - base > noise:
+                regressions.append((name, metric, base, result[metric],
+                                    '{:.2f}x'.format(result[metric] / base)))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='Skip the 50MB configuration file.')
+    parser.add_argument('--save', action='store_true',
+                        help='Store the results as the baseline.')
+    parser.add_argument('--baseline', default=__BASELINE,
+                        help='Baseline file path.')
+    parser.add_argument('--threshold', default=0.25, type=float,
+                        help='Allowed slowdown ratio over the baseline.')
+    args = parser.parse_args()
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for case in __cases(args.quick):
+            results[__case_name(case)] = __run(case, temp_dir)
+
+    report('Parser suite', ('case',) + tuple(m for m, _ in __METRICS), [
+        (name,) + tuple(result[m] if isinstance(result[m], float)
+                        else '{}KB'.format(result[m] // 1024) if m == 'alloc'
+                        else '{}KB'.format(result[m])
+                        for m, _ in __METRICS)
+        for name, result in results.items()
+    ])
+
+    if args.save:
+        with open(args.baseline, 'w') as f_out:
+            json.dump(results, f_out, indent=2, sort_keys=True)
+
+        print('Baseline is stored in {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline. Run with --save to store it.')
+        return 0
+
+    with open(args.baseline, 'r') as f_in:
+        regressions = __compare(results, json.load(f_in), args.threshold)
+
+    if regressions:
+        report('Regressions over {:.0%}'.format(args.threshold),
+               ('case', 'metric', 'baseline', 'current', 'ratio'),
+               regressions)
+        return 1
+
+    print('No regression over {:.0%}.'.format(args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        __child(json.loads(sys.argv[2]), sys.argv[3])
+    else:
+        sys.exit(main())
@@ -20,12 +20,18 @@ LONG_DESCRIPTION = open('README.md', 'r').read()
 ENTRY_POINTS = {}
 
 PACKAGES = setuptools.find_packages(
-    exclude=['temp']
+    exclude=['temp', 'benchmarks', 'benchmarks.*']
 )
 
 INSTALL_REQUIRES = []
 
-EXTRAS_REQUIRE = {}
+EXTRAS_REQUIRE = {
+    'numpy': ['numpy'],
+    'orjson': ['orjson'],
+    'msgpack': ['msgpack'],
+    'toml': ['tomli; python_version < "3.11"'],
+    'yaml': ['PyYAML'],
+}
 
 TEST_SUITE = 'setup.test_suite'
 
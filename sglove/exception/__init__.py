@@ -1,53 +1,143 @@
 from collections import namedtuple
 
-import inspect
+import sys
 
 __ErrorCode = namedtuple('__ErrorCode', ['no', 'desc'])
 
 
 class SGLException(Exception):
-    @staticmethod
-    def __caller_info():
-        # 0. Get grand parent name from this function
-        p_frame = inspect.currentframe().f_back
-        if not p_frame or not p_frame.f_back:
-            return ''
+    # Caller information modes. The 'lazy' mode keeps only the caller's code
+    # and line, and builds its names when the message is read first. The
+    # 'eager' mode builds them at the construction, and the 'off' mode never
+    # appends them.
+    CALLER_INFO_EAGER = 'eager'
+    CALLER_INFO_LAZY = 'lazy'
+    CALLER_INFO_OFF = 'off'
+
+    __caller_info_mode = CALLER_INFO_LAZY
+
+    # Frame depth of the function which raised this exception. Child classes
+    # which build the description in their constructor add their own frame.
+    _caller_depth = 1
+
+    # Module names of the source files. inspect.getmodule() scans the
+    # sys.modules, so its result is reused.
+    __module_names = {}
+
+    @classmethod
+    def set_caller_info(cls, mode):
+        """
+        Change the caller information mode of all SGLException objects.
+
+        :param mode: One of the CALLER_INFO_EAGER, CALLER_INFO_LAZY and
+                     CALLER_INFO_OFF.
+        :return: Previous mode.
+        """
+        if mode not in (cls.CALLER_INFO_EAGER,
+                        cls.CALLER_INFO_LAZY,
+                        cls.CALLER_INFO_OFF):
+            raise ValueError('Unknown caller info mode: {}'.format(mode))
+
+        previous = SGLException.__caller_info_mode
+        SGLException.__caller_info_mode = mode
+
+        return previous
 
-        gp_frame = p_frame.f_back
-        del p_frame
+    @staticmethod
+    def __caller_info(code, owner):
+        # 0. Inspect module is required only to build the caller names.
+        import inspect
 
         names = []
-        line_no = gp_frame.f_lineno
 
-        # 2. Get module name if that exists.
-        module = inspect.getmodule(gp_frame)
-        if module:
-            names.append(module.__name__)
+        # 1. Get module name if that exists.
+        modules = SGLException.__module_names
 
-        # 3. Get class name if that exists.
-        if 'self' in gp_frame.f_locals:
-            names.append(gp_frame.f_locals['self'].__class__.__name__)
+        if code.co_filename not in modules:
+            module = inspect.getmodule(code)
+            modules[code.co_filename] = module.__name__ if module else None
 
-        # 4. Get caller function name if that exists.
-        code_name = gp_frame.f_code.co_name
-        if code_name != '<module>':
-            names.append(code_name)
+        if modules[code.co_filename]:
+            names.append(modules[code.co_filename])
 
-        # 5. Clean-up used frame information
-        del gp_frame
+        # 2. Get class name if that exists.
+        if owner is not None:
+            names.append(owner.__name__)
 
-        return line_no, '.'.join(names)
+        # 3. Get caller function name if that exists.
+        if code.co_name != '<module>':
+            names.append(code.co_name)
 
-    def __init__(self, code, desc=None, *args, **kwargs):
-        line_no, caller = self.__caller_info()
+        return '.'.join(names)
 
-        message = '{} {}'.format(code.desc, desc) if desc else code.desc
+    def __init__(self, code, desc=None, *args, **kwargs):
+        super(SGLException, self).__init__(*args, **kwargs)
 
         self.__code = code
-        self.__message = '{} ({}:L#{})'.format(message, caller, line_no)
+        self.__desc = '{} {}'.format(code.desc, desc) if desc else code.desc
+        self.__message = None
+        self.__caller = None
+
+        mode = SGLException.__caller_info_mode
+
+        if mode != self.CALLER_INFO_OFF:
+            # Keep only the cheap values of the function which raised this
+            # exception. The frame itself can go on or be cleared after this.
+            frame = sys._getframe(self._caller_depth)
+            f_code = frame.f_code
+
+            # Reading the f_locals is expensive, so read it only if the
+            # function has the 'self' variable.
+            owner = None
+            if 'self' in f_code.co_varnames or 'self' in f_code.co_cellvars:
+                owner = frame.f_locals.get('self', owner)
+                owner = owner.__class__ if owner is not None else None
+
+            self.__caller = (f_code, owner, frame.f_lineno)
+
+            del frame
+
+            # Eager mode builds the message right now.
+            if mode == self.CALLER_INFO_EAGER:
+                self.__message = self.message
+
+    def __str__(self):
+        return self.message
 
-        super(self.__class__, self).__init__(self.__message, *args, **kwargs)
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.message)
+
+    @property
+    def args(self):
+        # The message is the first argument like the other exceptions. It is
+        # put in the arguments when it is built.
+        self.message
+
+        return BaseException.args.__get__(self)
+
+    @args.setter
+    def args(self, value):
+        BaseException.args.__set__(self, value)
 
     @property
     def code(self):
         return self.__code
+
+    @property
+    def message(self):
+        if self.__message is None:
+            if self.__caller is None:
+                self.__message = self.__desc
+
+            else:
+                f_code, owner, line_no = self.__caller
+
+                self.__message = '{} ({}:L#{})'.format(
+                    self.__desc, self.__caller_info(f_code, owner), line_no
+                )
+
+            BaseException.args.__set__(
+                self, (self.__message,) + BaseException.args.__get__(self)
+            )
+
+        return self.__message
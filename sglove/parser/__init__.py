@@ -1,67 +1,349 @@
-import argparse
-import json
 import os
-import re
 import sys
+import warnings
 
+from collections import namedtuple
+
+from sglove.parser.config import SGLConfigCache, register_config_format, \
+    _open_config
 from sglove.parser.exception import *
-from sglove.utils import classproperty
+from sglove.parser.options import SGLOptionsHolder, _frozen_type, \
+    _init_fields, _is_options_class, _slots_type
+from sglove.parser.profile import SGLProfiler, _timing
+from sglove.parser.types import SGLDict, SGLList, SGLSet, _converter, \
+    _to_bool, _to_str
+from sglove.parser.validate import _compile_constraints, \
+    _compile_relation, _split_constraints
+from sglove.utils import classproperty, lazy_regex
+
+
+# ===============
+# Lazy attributes
+# ===============
+# Public names of the modules which are imported at the first access. Those
+# modules import the argparse, the asyncio or the multiprocessing, or are
+# used only by the some applications.
+__LAZY_ATTRIBUTES = {
+    '_FileEnvAction': 'sglove.parser.action',
+    'SGLConfigStack': 'sglove.parser.stack',
+    'SGLConfigWatcher': 'sglove.parser.watcher',
+    'SGLSharedOptions': 'sglove.parser.shared',
+    'SGLSnapshotStore': 'sglove.parser.snapshot',
+    'SGLSourceRegistry': 'sglove.parser.registry',
+    'default_registry': 'sglove.parser.registry',
+    'export_options': 'sglove.parser.shared',
+    'import_options': 'sglove.parser.shared',
+}
+
+
+def __getattr__(name):
+    if name in __LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(__LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+
+        return value
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,
+                                                                    name))
+
+
+# ==========================
+# Batch conversion functions
+# ==========================
+SGLBatchResult = namedtuple('SGLBatchResult', ['values', 'errors'])
+
+__numpy = None
+
+
+def _numpy():
+    """
+    Import the NumPy at the first use.
+
+    :return: numpy module or None if it is not installed.
+    """
+    global __numpy
+
+    if __numpy is None:
+        try:
+            import numpy
+            __numpy = numpy
+
+        except ImportError:
+            __numpy = False
+
+    return __numpy or None
+
+
+def __convert_each(values, convert):
+    # Try the single pass first. Only if there is a bad value, convert it
+    # again one by one to collect the errors of each index.
+    try:
+        return list(map(convert, values)), {}
+
+    except Exception:
+        pass
+
+    converted = []
+    errors = {}
+
+    for index, value in enumerate(values):
+        try:
+            converted.append(convert(value))
+
+        except Exception as err:
+            converted.append(None)
+            errors[index] = err
+
+    return converted, errors
+
+
+def __convert_array(np, values, type):
+    # Vectorized conversion of the NumPy array. Return None if the dtype can't
+    # be converted by the NumPy equally with the scalar converters, or it is
+    # not faster than the scalar converters like the string to the number.
+    kind = values.dtype.kind
+
+    if type is bool:
+        return values.copy() if kind == 'b' else None
+
+    if type is str:
+        return np.char.strip(values) if kind == 'U' else None
+
+    if type not in (int, float) or kind not in 'biuf':
+        return None
+
+    # NaN and infinite floats can't be the integer, and the values out of
+    # the int64 range are wrapped by the astype(). The scalar int() keeps
+    # them, so those are left to the scalar converters.
+    if type is int and values.size:
+        if kind == 'f' and not (np.isfinite(values).all()
+                                and np.abs(values).max() < 2.0 ** 63):
+            return None
+
+        if kind == 'u' and values.max() > np.iinfo(np.int64).max:
+            return None
+
+    return values.astype(np.int64 if type is int else np.float64)
+
+
+def convert_batch(values, type=str):
+    """
+    Change the sequence of values to the type at once. The values are
+    converted equally with the option values, and the bad values don't stop
+    the conversion of the others.
+
+    :param values: Sequence of raw values. If the NumPy is installed and the
+                   values are the 1 dimensional NumPy array, the numeric to
+                   numeric, boolean to boolean and string to string
+                   conversions are done by the vectorized operations.
+    :param type: Variable's type name
+    :return: SGLBatchResult of the converted values and the {index: error}
+             dictionary. The values of the bad indices are None. The values
+             are the NumPy array if the input is the NumPy array, otherwise
+             the list.
+    """
+    np = _numpy()
+
+    if np is not None and isinstance(values, np.ndarray):
+        if values.ndim == 1:
+            converted = __convert_array(np, values, type)
+
+            if converted is not None:
+                return SGLBatchResult(converted, {})
+
+        converted, errors = __convert_each(values.tolist(), _converter(type))
+
+        # Bad indices are None, so only the object array can keep them.
+        if errors:
+            return SGLBatchResult(np.array(converted, dtype=object), errors)
+
+        array = np.array(converted)
+
+        # Big integers become the floats, so keep them in the object array.
+        if type is int and array.dtype.kind not in 'iu':
+            array = np.array(converted, dtype=object)
+
+        return SGLBatchResult(array, errors)
+
+    return SGLBatchResult(*__convert_each(values, _converter(type)))
 
 
 # ===========================
-# String manipulate functions
+# Argument scanning functions
 # ===========================
-__true_candidates = ['on', 'yes', 'y', 'true', 't', '1']
-__false_candidates = ['off', 'no', 'n', 'false', 'f', '0', 'none']
+def __is_config_prefix(arg):
+    # '--c' is the shortest abbreviation of the '--config'.
+    return len(arg) >= 3 and '--config'.startswith(arg)
+
+
+def _scan_config(args, default=None):
+    """
+    Find the configuration file path from the argument list without running
+    the argparse. The separated (-c path, --config path) and the attached
+    (-cpath, -c=path, --config=path) forms are supported, and the last one
+    wins like argparse does. The abbreviations like --conf are also the
+    config argument because argparse allows them. If one of them is
+    ambiguous with the other options, argparse fails the parsing anyway.
+
+    :param args: Argument list except the program name.
+    :param default: Default path if there is no config argument.
+    :return: Configuration file path.
+    """
+    path = default
+    args = iter(args)
+
+    for arg in args:
+        # Every token after '--' is a positional value.
+        if arg == '--':
+            break
 
+        elif arg == '-c' or __is_config_prefix(arg):
+            path = next(args, path)
 
-def _to_bool(value):
+        elif arg.startswith('--') and '=' in arg \
+                and __is_config_prefix(arg.partition('=')[0]):
+            path = arg.partition('=')[2]
+
+        elif arg.startswith('-c='):
+            path = arg[3:]
+
+        elif arg.startswith('-c'):
+            path = arg[2:]
+
+    return path
+
+
+def _is_config_only(args):
     """
-    Change object to boolean value.
-    :param value: value to change boolean
-    :return: True/False
+    Check the argument list has only the config arguments. Those are applied
+    without the argparse, so the other arguments and the malformed config
+    arguments are left to the argparse.
+
+    :param args: Argument list except the program name.
+    :return: True if there is no argument or only the config arguments.
     """
-    # 1. Check value is string and change string to boolean
-    if isinstance(value, str):
-        value = value.strip().lower()
+    args = iter(args)
+
+    for arg in args:
+        if arg == '-c' or arg == '--config':
+            # Missing value is the argparse error.
+            value = next(args, None)
 
-        if value in __true_candidates:
-            return True
+            if value is None or value.startswith('-'):
+                return False
 
-        elif value in __false_candidates:
+        elif arg.startswith('--'):
+            if not arg.startswith('--config='):
+                return False
+
+        elif not arg.startswith('-c'):
             return False
 
-    # 2. Check
-    elif isinstance(value, bool) or value is None:
-        return bool(value)
+    return True
 
-    raise SGLException(SGL_PARSER_ABNORMAL_BOOLEAN)
 
+def _scan_command(args):
+    """
+    Find the subcommand name from the argument list without running the
+    argparse. Every option of the SGLParser takes a single value, so the
+    token after the option without the attached value is skipped.
 
-def _to_str(string):
-    return str(string).strip() if string else ''
+    :param args: Argument list except the program name.
+    :return: (first positional argument or None, help flag) tuple.
+    """
+    help = False
+    args = iter(args)
 
+    for arg in args:
+        if arg == '--':
+            return next(args, None), help
 
-def _to_obj(value, type):
-    if type is str:
-        return _to_str(value)
+        elif arg == '-h' or arg == '--help':
+            help = True
 
-    elif type is bool:
-        return _to_bool(value)
+        elif arg.startswith('--'):
+            if '=' not in arg:
+                next(args, None)
 
-    else:
-        return type(value)
+        elif arg.startswith('-') and len(arg) == 2:
+            next(args, None)
+
+        elif not arg.startswith('-') or arg == '-':
+            return arg, help
+
+    return None, help
 
 
 # ==========================================
 # Option management class using env and file
 # ==========================================
+class _CompiledOption:
+    """
+    Immutable record of a registered option. All name forms and the value
+    converter are built once at the registration, so the parsing and the
+    default resolution phases only do the attribute and dictionary lookups.
+    """
+    __slots__ = ('category', 'name', 'dest', 'env', 'arg', 'type', 'convert',
+                 'constraints', 'validate')
+
+    def __init__(self, category, name, dest, env, arg, type=str,
+                 constraints=None):
+        """
+        Constructor
+
+        :param category: Configuration file's first depth category name.
+        :param name: Configuration file's second depth variable name.
+        :param dest: Destination field form name.
+        :param env: Environment variable name.
+        :param arg: Long argument name.
+        :param type: Variable's type name
+        :param constraints: Optional declarative constraints dictionary. Those
+                            are compiled into the validate once.
+        """
+        for field, value in (('category', category), ('name', name),
+                             ('dest', dest), ('env', env), ('arg', arg),
+                             ('type', type), ('convert', _converter(type)),
+                             ('constraints', constraints),
+                             ('validate', _compile_constraints(constraints))):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('{} is immutable.'.format(type(self).__name__))
+
+    def __delattr__(self, key):
+        raise AttributeError('{} is immutable.'.format(type(self).__name__))
+
+    def __reduce__(self):
+        return _CompiledOption, (self.category, self.name, self.dest,
+                                 self.env, self.arg, self.type,
+                                 self.constraints)
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(type(self).__name__,
+                                       self.category, self.name)
+
+
+def _violation(option, value, message):
+    """
+    Build the violation record of the option.
+
+    :param option: _CompiledOption object.
+    :param value: Violating value.
+    :param message: Violation message.
+    :return: SGLViolation object of the 'category.name' option key.
+    """
+    return SGLViolation('{}.{}'.format(option.category, option.name), value,
+                        message)
+
+
 class _OptionManager:
     class __OptionName:
         """
         Reformatting class for OptionManager.
         """
-        __REGEX_NAME = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*[a-zA-Z0-9]$')
+        __REGEX_NAME = lazy_regex(r'^[a-zA-Z][a-zA-Z0-9_-]*[a-zA-Z0-9]$')
 
         def __is_valid(self, name):
             return isinstance(name, str) and self.__REGEX_NAME.fullmatch(name)
@@ -115,13 +397,15 @@ class _OptionManager:
             """
             return self.__name.replace('-', '_')
 
-    def __init__(self, name, environ=None):
+    def __init__(self, name, environ=None, profiler=None):
         """
         Constructor
 
         :param name: Application name
         :param environ: User specified environ dictionary. If not specified it,
                         use system environment dictionary
+        :param profiler: Optional SGLProfiler object to record the provenance
+                         and the cost of each resolution.
         """
 
         if environ and not isinstance(environ, dict):
@@ -129,8 +413,108 @@ class _OptionManager:
 
         self.__app_name = name
         self.__env_header = self.__OptionName(name).upper_form()
+        self.__env_prefix = '{}_'.format(self.__env_header)
         self.__file_opts = None
+        self.__file_origin = None
         self.__environ = environ if environ else os.environ
+        self.__env_snapshot = None
+        self.__exported = None
+        self.__profiler = profiler
+
+    @property
+    def app_name(self):
+        return self.__app_name
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @property
+    def source(self):
+        """
+        (loaded configuration, its origin, environment snapshot) tuple to
+        share with the other managers by the load_source().
+        """
+        return self.__file_opts, self.__file_origin, self._env_snapshot
+
+    @property
+    def _env_snapshot(self):
+        """
+        Environment variables which have the app name prefix. The environment
+        is scanned only once at the first access instead of probing it for
+        each option.
+        """
+        if self.__env_snapshot is None:
+            prefix = self.__env_prefix
+
+            with _timing(self.__profiler, 'env_scan'):
+                self.__env_snapshot = {
+                    key: value for key, value in self.__environ.items()
+                    if key.startswith(prefix)
+                }
+
+            # Exported values are the resolved ones, so those precede the
+            # inherited environment variables.
+            if self.__exported:
+                self.__env_snapshot.update(self.__exported)
+
+        return self.__env_snapshot
+
+    @property
+    def export_env(self):
+        """
+        Environment variable name of the exported options. The option names
+        never start with the under bar, so it doesn't collide with them.
+        """
+        return '{}__OPTIONS'.format(self.__env_header)
+
+    def load_exported(self):
+        """
+        Use the options exported by the SGLParser.export_environ() instead of
+        the configuration file. The exported values are resolved as the
+        environment values.
+
+        :return: True if the environment has the exported options.
+        """
+        text = self.__environ.get(self.export_env)
+
+        if text is None:
+            return False
+
+        if text:
+            from sglove.parser.environ import _decode_blob
+
+            with _timing(self.__profiler, 'config_load'):
+                self.__exported = _decode_blob(text)
+
+        self.__file_opts = None
+        self.__file_origin = None
+        self.__env_snapshot = None
+
+        return True
+
+    def refresh_environ(self):
+        """
+        Drop the environment snapshot to scan the environment again.
+        """
+        self.__env_snapshot = None
+
+    def unknown_environ(self, options, prefixes=()):
+        """
+        Find the environment variables which have the app name prefix but
+        don't match any option.
+
+        :param options: Iterable of the registered _CompiledOption objects.
+        :param prefixes: Environment name prefixes of the options which are
+                         not registered yet. Those are never reported.
+        :return: Sorted list of the unknown environment variable names.
+        """
+        known = {option.env for option in options}
+        known.add(self.export_env)
+        prefixes = tuple(prefixes)
+
+        return sorted(key for key in self._env_snapshot
+                      if key not in known and not key.startswith(prefixes))
 
     def dest_name(self, name, sub_name=None):
         """
@@ -165,18 +549,113 @@ class _OptionManager:
         """
         return self.__OptionName(name, sub_name).arg_form()
 
-    def load(self, path):
+    def compile(self, category, name, type=str, constraints=None):
+        """
+        Validate the option name and build its compiled record.
+
+        :param category: Configuration file's first depth category name.
+        :param name: Configuration file's second depth variable name.
+        :param type: Variable's type name
+        :param constraints: Optional declarative constraints dictionary.
+        :return: _CompiledOption object of the option.
+        """
+        option = self.__OptionName(category, name)
+
+        return _CompiledOption(category, name,
+                               dest=option.dest_form(),
+                               env='{}_{}'.format(self.__env_header,
+                                                  option.upper_form()),
+                               arg=option.arg_form(),
+                               type=type,
+                               constraints=constraints)
+
+    def load(self, path, cache=None, format=None):
         """
         Load configuration file. Configuration file must be consisted with the
-        two depth dictionary JSON script file.
+        two depth dictionary. The JSON file is read and indexed, and each
+        category is decoded when the default_value() asks it first. The other
+        formats registered by the register_config_format() are decoded at
+        once.
+
+        :param path: Configuration file.
+        :param cache: Optional SGLConfigCache object. If specified it, the
+                      parsed result is reused from the cache entry.
+        :param format: Format name. If not specified it, detect it from the
+                       extension or the magic bytes of the file.
+        """
+        if not path or not os.path.exists(path):
+            raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
+
+        with _timing(self.__profiler, 'config_load'):
+            if cache is not None:
+                self.__file_opts = cache.load(path, format=format)
+            else:
+                self.__file_opts = _open_config(path, format)
+
+        self.__file_origin = path
+
+    @staticmethod
+    def __open_indexed(path, cache, format):
+        config = _open_config(path, format) if cache is None \
+            else cache.load(path, format=format)
+
+        # Build the category index of the lazy configuration here too, so
+        # only the requested categories are decoded at the resolution.
+        len(config)
+
+        return config
+
+    async def aload(self, path, cache=None, format=None, executor=None):
+        """
+        Load configuration file with the asyncio. The file I/O, the decoding
+        and the indexing run in the executor, so the event loop is not
+        blocked. The result is same with the load().
 
         :param path: Configuration file.
+        :param cache: Optional SGLConfigCache object. If specified it, the
+                      parsed result is reused from the cache entry.
+        :param format: Format name. If not specified it, detect it from the
+                       extension or the magic bytes of the file.
+        :param executor: Executor of the file I/O. If not specified it, use
+                         the event loop's default executor.
         """
         if not path or not os.path.exists(path):
             raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
 
-        with open(path, 'r') as f_in:
-            self.__file_opts = json.load(f_in)
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        with _timing(self.__profiler, 'config_load'):
+            self.__file_opts = await loop.run_in_executor(
+                executor, self.__open_indexed, path, cache, format
+            )
+
+        self.__file_origin = path
+
+    def load_source(self, config, origin, environ):
+        """
+        Use the loaded configuration and the environment snapshot of the
+        other manager. Those are shared, so they are never modified here.
+
+        :param config: Loaded configuration from the other manager.
+        :param origin: Configuration file path of the config.
+        :param environ: Environment snapshot of the same app name prefix.
+        """
+        self.__file_opts = config
+        self.__file_origin = origin
+        self.__env_snapshot = environ
+
+    def load_stack(self, stack):
+        """
+        Use the SGLConfigStack instead of the single configuration file. The
+        stack's merged view is read directly, so the changes of its layers are
+        applied without loading it again.
+
+        :param stack: SGLConfigStack object.
+        """
+        self.__file_opts = stack
+        self.__file_origin = None
 
     def default_value(self, category, name, env=None, default=None, type=str):
         """
@@ -190,102 +669,131 @@ class _OptionManager:
         :param type: Variable's type name
         :return: Default value from the configuration file or environment.
         """
-        # 1. First check environment value.
         if not env:
             env = self.env_name(category, name)
 
-        if env in self.__environ:
-            return _to_obj(self.__environ.get(env), type)
+        return self.resolve(_CompiledOption(category, name, dest=None,
+                                            env=env, arg=None, type=type),
+                            default=default)
+
+    def resolve(self, option, default=None):
+        """
+        Retrieve the default variable of the compiled option from the
+        configuration file or environment.
+
+        :param option: _CompiledOption object from the compile().
+        :param default: Default value if there is no value from file and env.
+        :return: Default value from the configuration file or environment.
+        """
+        if self.__profiler is not None:
+            return self.__resolve_traced(option, default)
+
+        # 1. First check environment value. The user specified environment
+        #    name without the app name prefix is not in the snapshot.
+        if option.env.startswith(self.__env_prefix):
+            value = self._env_snapshot.get(option.env)
+        else:
+            value = self.__environ.get(option.env)
+
+        if value is not None:
+            return option.convert(value)
 
         # 2. If there is no environment value, check __file_opts
-        if self.__file_opts \
-                and category in self.__file_opts \
-                and name in self.__file_opts[category]:
-            return _to_obj(self.__file_opts[category].get(name), type)
+        if self.__file_opts is not None \
+                and option.category in self.__file_opts:
+            values = self.__file_opts[option.category]
+
+            if option.name in values:
+                return option.convert(values[option.name])
 
         # 3. If there is no values from file and env,
         #    return "default" as default value
-        return _to_obj(default, type)
-
+        return option.convert(default)
 
-# =======================
-# Argument action classes
-# =======================
-class _FileEnvAction(argparse.Action):
-    def __init__(self, manager, category, name,
-                 default=None,
-                 type=str,
-                 choices=None,
-                 required=False,
-                 **kwargs):
+    def __resolve_traced(self, option, default):
+        # Same lookups with the resolve(), but every looked up location and
+        # the selected source are recorded into the profiler.
+        profiler = self.__profiler
+        path = ['env:{}'.format(option.env)]
 
-        if not isinstance(manager, _OptionManager):
-            raise SGLException(SGL_PARSER_UNEXPECTED_MANAGER)
-
-        if 'nargs' in kwargs and kwargs['nargs'] != 1:
-            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
-                               'Nargs should be 1.')
+        if option.env.startswith(self.__env_prefix):
+            value = self._env_snapshot.get(option.env)
         else:
-            kwargs.pop('nargs', None)
+            value = self.__environ.get(option.env)
 
-        if 'const' in kwargs:
-            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
-                               'Const cannot be supported.')
+        if value is not None:
+            return profiler.convert(option, 'env', value, path,
+                                    origin=option.env)
 
-        # 1. Remove 'const' option because of the inversion-revoke case from
-        #    env and file. If the value already selected from 'env' and 'file',
-        #    users can't revoke to the default values from a single argument.
-        #    Also if this action use this option reverting the 'env' or 'file'
-        #    driven value not default, it can make confusions about the meaning
-        #    of that arguments.
-        #    Anyway FileEnvAction should have values in case about the store_*.
-        #    (store_true, store_false, store_const, and so on.)
-        kwargs.pop('const', None)
+        if self.__file_opts is not None:
+            path.append('file:{}.{}'.format(option.category, option.name))
 
-        default = manager.default_value(category, name,
-                                        default=default, type=type)
+            if option.category in self.__file_opts:
+                values = self.__file_opts[option.category]
 
-        # Store type to convert from string to the wanted value type at the
-        # parsing phase.
-        self.__type = type
+                if option.name in values:
+                    # The stack knows which layer has the value.
+                    from sglove.parser.stack import SGLConfigStack
 
-        if self.__type is bool:
-            choices = None
-            default = False if default is None else default
+                    origin = self.__file_origin
+                    if isinstance(self.__file_opts, SGLConfigStack):
+                        origin = self.__file_opts.source(option.category,
+                                                         option.name)
 
-        # If already has default value, remove required field.
-        if required and default is not None:
-            required = False
+                    return profiler.convert(option, 'file',
+                                            values[option.name], path,
+                                            origin=origin)
 
-        super(_FileEnvAction, self).__init__(nargs=None,
-                                             const=None,
-                                             default=default,
-                                             type=str,
-                                             choices=choices,
-                                             required=required,
-                                             **kwargs)
+        path.append('default')
 
-    def __call__(self, parser, namespace, values, option_string=None):
-        setattr(namespace, self.dest, _to_obj(values, self.__type))
+        return profiler.convert(option, 'default', default, path)
 
 
 # ===========================
 # Parse and its group classes
 # ===========================
 class _SGLParserBase:
-    __RESERVED_KEYWORD = ['manager', 'category', 'dest']
+    __RESERVED_KEYWORD = ['manager', 'category', 'dest', 'option']
+    __RESERVED_KEYWORD_SET = frozenset(__RESERVED_KEYWORD)
+
+    # Keywords which the _FileEnvAction passes to the argparse.Action. The
+    # 'action' is replaced by the _FileEnvAction.
+    __ARGUMENT_KEYWORDS = frozenset(
+        ['action', 'nargs', 'const', 'choices', 'required', 'help', 'metavar']
+        + (['deprecated'] if sys.version_info >= (3, 13) else [])
+    )
 
-    def __init__(self, parser, name, manager, reserved=None):
+    # Option strings of the config and the help arguments.
+    __RESERVED_OPTION_STRINGS = ('-c', '--config', '-h', '--help')
+
+    def __init__(self, parser, name, manager, reserved=None,
+                 option_strings=None):
         if reserved and not isinstance(reserved, list):
             raise SGLException(SGL_PARSER_INTERNAL_ERROR)
 
         self.__manager = manager
         self.__parser = parser
         self.__category = name
-        self.__arguments = reserved if reserved else []
+        self.__options = {
+            arg: manager.compile(name, arg) for arg in (reserved or [])
+        }
+
+        # Registered (option, short, default, kwargs) specs. Those are used to
+        # add arguments to the deferred argparse parser and to take snapshot.
+        self.__specs = []
+
+        # Registered options which have the constraints.
+        self.__constrained = []
+
+        # Option strings of the argparse parser which this object is added
+        # to. The argparse parser may be never built, so the conflicts are
+        # checked with them at the registration. Groups share the set with
+        # their parser.
+        self.__option_strings = set(self.__RESERVED_OPTION_STRINGS) \
+            if option_strings is None else option_strings
 
     def _has_duplicate(self, name):
-        return name in self.__arguments
+        return name in self.__options
 
     @classproperty
     def reserved_option_keywords(self):
@@ -295,120 +803,1086 @@ class _SGLParserBase:
     def _manager(self):
         return self.__manager
 
+    @property
+    def _options(self):
+        return self.__options
+
+    @property
+    def _specs(self):
+        return self.__specs
+
+    @property
+    def _constrained(self):
+        return self.__constrained
+
+    @property
+    def _option_strings(self):
+        return self.__option_strings
+
+    @property
+    def _is_bound(self):
+        return self.__parser is not None
+
+    def __add_to_parser(self, option, short, default, kwargs):
+        from sglove.parser.action import _FileEnvAction
+
+        args = [short, option.arg] if short else [option.arg]
+
+        kwargs = dict(kwargs)
+        kwargs.update({
+            'dest': option.dest,
+            'action': _FileEnvAction,
+            'manager': self.__manager,
+            'category': self.__category,
+            'name': option.name,
+            'default': default,
+            'type': option.type,
+            'option': option
+        })
+
+        with _timing(self.__manager.profiler, 'argparse_build'):
+            self.__parser.add_argument(*args, **kwargs)
+
+    def _bind(self, parser):
+        """
+        Bind the argparse parser, and add all registered arguments into it.
+
+        :param parser: Argparse parser or its argument group.
+        """
+        self.__parser = parser
+
+        for spec in self.__specs:
+            self.__add_to_parser(*spec)
+
+    def _unbind(self):
+        """
+        Drop the bound argparse parser. The arguments are added again at the
+        next _bind() with the newly resolved default values.
+        """
+        self.__parser = None
+
+    def _restore(self, specs):
+        """
+        Register the specs from the snapshot. The specs have been validated
+        when they were registered to the other parser, so only the
+        registration is done.
+
+        :param specs: Specs from the other parser's _specs.
+        """
+        for spec in specs:
+            self.__options[spec[0].name] = spec[0]
+            self.__option_strings.update(filter(None, [spec[1], spec[0].arg]))
+
+            if spec[0].validate is not None:
+                self.__constrained.append(spec[0])
+
+        self.__specs.extend(specs)
+
     def _add_argument_group(self, name, desc=None):
         return self.__parser.add_argument_group(name, desc)
 
+    def _add_subparsers(self, **kwargs):
+        return self.__parser.add_subparsers(**kwargs)
+
     def _parse_args(self, args=None, namespace=None):
         return self.__parser.parse_args(args, namespace)
 
     def _parse_local(self, opts):
         return {
-            name: opts.get(self.__manager.dest_name(self.__category, name))
-            for name in self.__arguments
+            name: opts.get(option.dest)
+            for name, option in self.__options.items()
         }
 
-    def add_argument(self, name, short=None, default=None, type=str, **kwargs):
-        # 1. Check arguments
+    def _resolve_local(self, opts, violations):
+        """
+        Resolve the default values of the registered arguments like the
+        _FileEnvAction does, but without the argparse. The constraints are
+        checked in the same pass.
+
+        :param opts: Dictionary to store the dest and value pairs.
+        :param violations: List to append the SGLViolation objects.
+        :return: False if there is the missing required argument. The caller
+                 should run the argparse to report that error.
+        """
+        for option, _, default, kwargs in self.__specs:
+            value = self.__manager.resolve(option, default=default)
+
+            if option.type is bool and value is None:
+                value = False
+
+            if value is None and kwargs.get('required'):
+                return False
+
+            if option.validate is not None:
+                message = option.validate(value)
 
-        # Manager, category and dest can't use for add_argument because of
-        # the internal uses.
-        for reserved in self.__RESERVED_KEYWORD:
-            if reserved in kwargs:
+                if message is not None:
+                    violations.append(_violation(option, value, message))
+
+            opts[option.dest] = value
+
+        return True
+
+    def _validate(self, opts, violations):
+        """
+        Check the constraints of the parsed values.
+
+        :param opts: Parsed dest and value dictionary.
+        :param violations: List to append the SGLViolation objects.
+        """
+        for option in self.__constrained:
+            value = opts.get(option.dest)
+            message = option.validate(value)
+
+            if message is not None:
+                violations.append(_violation(option, value, message))
+
+    def _extend(self, entries):
+        """
+        Register the arguments in one pass. All entries are validated and
+        compiled before the registration, so nothing is registered if any
+        entry is invalid.
+
+        :param entries: Iterable of the (name, short, default, type, kwargs)
+                        tuples.
+        """
+        reserved = self.__RESERVED_KEYWORD_SET
+        names = set()
+        strings = set()
+        specs = []
+
+        for name, short, default, type, kwargs in entries:
+            # 1. Check arguments
+            kwargs, constraints = _split_constraints(kwargs)
+
+            # Manager, category and dest can't use for add_argument because
+            # of the internal uses.
+            if not reserved.isdisjoint(kwargs):
                 raise SGLException(SGL_PARSER_INVALID_PARSING_ARG)
 
-        if self._has_duplicate(name):
-            raise SGLException(SGL_PARSER_DUPLICATED_NAME)
+            # The argparse parser may be built later, so check the keywords
+            # which the _FileEnvAction rejects at this time.
+            unknown = set(kwargs).difference(self.__ARGUMENT_KEYWORDS)
 
-        # 2. Add arguments
-        short = '-{}'.format(short) if isinstance(short, str) else None
-        long = self.__manager.long_arg(self.__category, name)
+            if unknown:
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'Unknown keywords {}.'.format(
+                                       ', '.join(sorted(unknown))))
 
-        args = [short, long] if short else [long]
-        kwargs.update({
-            'dest': self.__manager.dest_name(self.__category, name),
-            'action': _FileEnvAction,
-            'manager': self.__manager,
-            'category': self.__category,
-            'name': name,
-            'default': default,
-            'type': type
-        })
+            if kwargs.get('nargs', 1) != 1 or 'const' in kwargs:
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'Nargs should be 1 without const.')
+
+            if name in names or self._has_duplicate(name):
+                raise SGLException(SGL_PARSER_DUPLICATED_NAME)
+
+            names.add(name)
+
+            # 2. Compile the option once. Every name form is reused at the
+            #    parsing and the default resolution phases.
+            option = self.__manager.compile(self.__category, name, type=type,
+                                            constraints=constraints)
+            short = '-{}'.format(short) if isinstance(short, str) else None
 
-        self.__parser.add_argument(*args, **kwargs)
+            for string in filter(None, [short, option.arg]):
+                if string in strings or string in self.__option_strings:
+                    raise SGLException(SGL_PARSER_DUPLICATED_NAME,
+                                       '{} is already used.'.format(string))
 
-        # 3. Register argument name in reserved field
-        self.__arguments.append(name)
+                strings.add(string)
+
+            # The prefix scan reads '-cvalue' as the config path.
+            if short and short.startswith('-c'):
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'Short name should not start with c.')
+
+            specs.append((option, short, default, kwargs))
+
+        self.__option_strings.update(strings)
+
+        for spec in specs:
+            # 3. Add arguments
+            if self._is_bound:
+                self.__add_to_parser(*spec)
+
+            # 4. Register the compiled option in reserved field
+            self.__options[spec[0].name] = spec[0]
+            self.__specs.append(spec)
+
+            if spec[0].validate is not None:
+                self.__constrained.append(spec[0])
+
+    def add_argument(self, name, short=None, default=None, type=str, **kwargs):
+        """
+        Register the argument. Besides the argparse keywords, the 'minimum',
+        'maximum', 'pattern', 'path' ('exists', 'file', 'dir' or True) and
+        'check' (callable returns False for the bad value) constraints are
+        compiled once, and checked whenever the value is resolved.
+
+        :param name: Option name.
+        :param short: Optional short argument name without the hyphen.
+        :param default: Default value if there is no value from file and env.
+        :param type: Variable's type name
+        :param kwargs: Argparse keywords and the constraints.
+        """
+        self._extend([(name, short, default, type, kwargs)])
 
 
 class _SGLGroup(_SGLParserBase):
-    def __init__(self, parser, name, manager):
+    def __init__(self, parser, name, manager, desc=None,
+                 option_strings=None):
         super(_SGLGroup, self).__init__(parser=parser,
                                         name=name,
-                                        manager=manager)
+                                        manager=manager,
+                                        option_strings=option_strings)
+
+        self.__desc = desc
+
+    @property
+    def description(self):
+        return self.__desc
 
     def parse_group(self, opts):
         return self._parse_local(opts)
 
 
+class _SGLCommand(_SGLGroup):
+    """
+    Subcommand of the SGLParser. Its arguments are defined by the builder
+    function only when the subcommand is selected, and their environment
+    and file values use the subcommand name as the category.
+    """
+    def __init__(self, name, manager, builder, desc=None):
+        super(_SGLCommand, self).__init__(parser=None,
+                                          name=name,
+                                          manager=manager,
+                                          desc=desc)
+
+        self.__name = name
+        self.__builder = builder
+        self.__built = False
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def builder(self):
+        return self.__builder
+
+    @property
+    def is_built(self):
+        return self.__built
+
+    def _materialize(self):
+        """
+        Define the arguments by the builder at the first selection.
+        """
+        if not self.__built:
+            self.__built = True
+            self.__builder(self)
+
+
 class SGLParser(_SGLParserBase):
-    def __init__(self, app_name, default_config=None):
-        parser = argparse.ArgumentParser()
-        manager = _OptionManager(app_name)
+    def __init__(self, app_name, default_config=None, cache=None,
+                 warn_unknown_env=True, stack=None, profiler=None,
+                 registry=None):
+        """
+        Constructor
 
+        :param app_name: Application name used as the environment prefix.
+        :param default_config: Default configuration file path.
+        :param cache: Optional SGLConfigCache object to reuse the parsed
+                      configuration file.
+        :param warn_unknown_env: Warn the environment variables which have the
+                                 app name prefix but match no option at the
+                                 first parsing.
+        :param stack: Optional SGLConfigStack object. If specified it, the
+                      stack is used as the configuration source, and the
+                      config file from the argument or default_config is
+                      put on the top of it as the 'config' layer.
+        :param profiler: Optional SGLProfiler object to record the provenance
+                         of each option and the cost of each phase.
+        :param registry: Optional SGLSourceRegistry object. If specified it,
+                         the loaded configuration file is shared with the
+                         other parsers of the same app name, file and
+                         environment.
+        """
+        self.__setup(app_name, default_config, cache,
+                     warn_unknown_env=warn_unknown_env, stack=stack,
+                     profiler=profiler, registry=registry)
+
+    def __setup(self, app_name, default_config, cache,
+                warn_unknown_env=True, stack=None, profiler=None,
+                registry=None, load=True):
+        manager = _OptionManager(app_name, profiler=profiler)
+
+        self.__app_name = app_name
+        self.__default_config = default_config
+        self.__cache = cache
+        self.__stack = stack
+        self.__profiler = profiler
         self.__groups = {}
-
-        # 1. Append initial options for config file
-        parser.add_argument(
-            '-c', '--config',
-            action='store', default=default_config, type=str, dest='config',
-            help='Configuration file path for {}'.format(app_name)
+        self.__commands = {}
+        self.__subparsers = None
+        self.__command_parsers = {}
+        self.__frozen_types = {}
+        self.__fill_builders = {}
+        self.__relations = []
+        self.__warn_unknown_env = warn_unknown_env
+
+        # 1. Find the config file path using the prefix scan. The argv is
+        #    tokenized by argparse only once at the parse_args() phase.
+        config_path = _scan_config(sys.argv[1:])
+
+        self.__config_path = default_config if config_path is None \
+            else config_path
+
+        # The exported options of the parent process replace the default
+        # file, but not the one from the config argument.
+        self.__exported = config_path is None and manager.load_exported()
+
+        config_exists = load and not self.__exported \
+            and self.__config_path and os.path.exists(self.__config_path)
+
+        if stack is not None:
+            if config_exists:
+                with _timing(profiler, 'config_load'):
+                    stack.add_file(self.__config_path, name='config')
+
+            manager.load_stack(stack)
+
+        elif config_exists and registry is not None:
+            registry.acquire(manager, self.__config_path, cache=cache)
+
+        elif config_exists:
+            manager.load(self.__config_path, cache=cache)
+
+        # 2. Argparse parser is built only when there are the arguments to
+        #    parse. Without them, the values are resolved from the compiled
+        #    options directly.
+        super(SGLParser, self).__init__(
+            parser=None,
+            name='core',
+            manager=manager,
+            reserved=['config']
         )
 
-        # 2. Initial parser to get the config file path
-        loading_args = sys.argv[1:]
+    @classmethod
+    async def create(cls, app_name, default_config=None, cache=None,
+                     warn_unknown_env=True, stack=None, profiler=None,
+                     executor=None, registry=None):
+        """
+        Build the parser with the asyncio. The configuration file is loaded in
+        the executor, and the other parts are same with the constructor.
+
+        :param app_name: Application name used as the environment prefix.
+        :param default_config: Default configuration file path.
+        :param cache: Optional SGLConfigCache object to reuse the parsed
+                      configuration file.
+        :param warn_unknown_env: Warn the environment variables which have the
+                                 app name prefix but match no option at the
+                                 first parsing.
+        :param stack: Optional SGLConfigStack object.
+        :param profiler: Optional SGLProfiler object.
+        :param executor: Executor of the file I/O. If not specified it, use
+                         the event loop's default executor.
+        :param registry: Optional SGLSourceRegistry object. The shared entry
+                         is acquired in the executor too.
+        :return: SGLParser object.
+        """
+        parser = cls.__new__(cls)
+        parser.__setup(app_name, default_config, cache,
+                       warn_unknown_env=warn_unknown_env, stack=stack,
+                       profiler=profiler, load=False)
 
-        if '-h' in loading_args:
-            loading_args.remove('-h')
+        path = parser.__config_path
 
-        if '--help' in loading_args:
-            loading_args.remove('--help')
+        if path and os.path.exists(path) and not parser.__exported:
+            if stack is None and registry is not None:
+                import asyncio
 
-        config_path = parser.parse_args(loading_args).config
-        if config_path and os.path.exists(config_path):
-            manager.load(config_path)
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, registry.acquire, parser._manager, path, cache
+                )
 
-        super(SGLParser, self).__init__(parser=parser,
-                                        name='core',
-                                        manager=manager,
-                                        reserved=['config'])
+            else:
+                await parser.__aload(path, executor)
+
+        return parser
+
+    async def __aload(self, path, executor):
+        if self.__stack is None:
+            await self._manager.aload(path, cache=self.__cache,
+                                      executor=executor)
+
+        else:
+            with _timing(self.__profiler, 'config_load'):
+                await self.__stack.aadd_files([('config', path)],
+                                              executor=executor)
+
+    def __new_parser(self):
+        with _timing(self.__profiler, 'argparse_build'):
+            import argparse
+
+            parser = argparse.ArgumentParser()
+
+            # Append initial options for config file
+            parser.add_argument(
+                '-c', '--config',
+                action='store', default=self.__default_config, type=str,
+                dest='config',
+                help='Configuration file path for {}'.format(self.__app_name)
+            )
+
+        return parser
+
+    def __bind_all(self):
+        if self._is_bound:
+            return
+
+        self._bind(self.__new_parser())
+
+        for name, group in self.__groups.items():
+            group._bind(self._add_argument_group(name, group.description))
+
+    def __resolve_all(self, args, namespace, violations):
+        # Argparse is skipped if there is no argument except the config ones.
+        # The values from the env and file are resolved with the compiled
+        # options like the _FileEnvAction does.
+        args = sys.argv[1:] if args is None else args
+
+        if namespace is not None or not _is_config_only(args):
+            return None
+
+        opts = {'config': _scan_config(args, self.__default_config)}
+
+        if not self._resolve_local(opts, violations):
+            return None
+
+        for group in self.__groups.values():
+            if not group._resolve_local(opts, violations):
+                return None
+
+        return opts
 
     def _has_duplicate(self, name):
         return super(SGLParser, self)._has_duplicate(name) \
-               or name in self.__groups
+               or name in self.__groups or name in self.__commands
+
+    @property
+    def config_path(self):
+        return self.__config_path
+
+    @property
+    def stack(self):
+        return self.__stack
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    def reload(self, path=None):
+        """
+        Reload the configuration file. The argparse parser is dropped, so the
+        next parse_args() resolves the default values again. If the parser
+        uses the SGLConfigStack, only the changed layers are reloaded.
+
+        :param path: Configuration file path. If not specified it, reload the
+                     current configuration file.
+        """
+        if self.__stack is None:
+            path = path or self.__config_path
+
+            self._manager.load(path, cache=self.__cache)
+
+        else:
+            with _timing(self.__profiler, 'config_load'):
+                if path:
+                    self.__stack.add_file(path, name='config')
+                else:
+                    self.__stack.refresh()
+
+        self.__invalidate(path)
+
+    async def areload(self, path=None, executor=None):
+        """
+        Reload the configuration file with the asyncio like the reload(). The
+        file I/O runs in the executor.
+
+        :param path: Configuration file path. If not specified it, reload the
+                     current configuration file.
+        :param executor: Executor of the file I/O. If not specified it, use
+                         the event loop's default executor.
+        """
+        if self.__stack is None or path:
+            await self.__aload(path or self.__config_path, executor)
+
+        else:
+            with _timing(self.__profiler, 'config_load'):
+                await self.__stack.arefresh(executor=executor)
+
+        self.__invalidate(path)
+
+    def __invalidate(self, path):
+        # Drop the resolved values of the argparse parser and the environment.
+        self._manager.refresh_environ()
+        self.__config_path = path or self.__config_path
+
+        self._unbind()
+
+        for group in self.__groups.values():
+            group._unbind()
+
+        for command in self.__commands.values():
+            command._unbind()
+
+        self.__subparsers = None
+        self.__command_parsers = {}
 
     def add_argument_group(self, name, desc=None):
         if self._has_duplicate(name):
             raise SGLException(SGL_PARSER_DUPLICATED_NAME)
 
-        group = _SGLGroup(self._add_argument_group(name, desc=desc),
-                          name=name, manager=self._manager)
+        parser = self._add_argument_group(name, desc) \
+            if self._is_bound else None
+
+        group = _SGLGroup(parser, name=name, manager=self._manager, desc=desc,
+                          option_strings=self._option_strings)
 
         self.__groups.update({name: group})
 
         return group
 
-    def parse_args(self, args=None, namespace=None):
+    def add_schema(self, schema):
+        """
+        Register the options and the groups of the declarative schema in one
+        pass. The whole schema is validated before the registration, so
+        nothing is registered if any option is invalid.
+
+        The schema is the JSON schema like dictionary or the dataclass. In the
+        dictionary, the 'object' properties which have the 'properties' are
+        the groups, and the others are the options of this parser. The
+        'type', 'default', 'description', 'enum', 'required', 'short' and
+        the 'minimum', 'maximum' and 'pattern' constraints of the properties
+        are used. In the dataclass, the fields of the dataclass type are the
+        groups, and the field types and defaults are used.
+
+        :param schema: Dictionary, dataclass or its instance.
+        :return: Dictionary of the added group objects.
+        """
+        from sglove.parser.schema import _schema_entries
+
+        core, entries = _schema_entries(schema)
+
+        # 1. Check the group names against the registered and the new ones.
+        names = {entry[0] for entry in core}
+
+        for name, _, _ in entries:
+            if name in names or self._has_duplicate(name):
+                raise SGLException(SGL_PARSER_DUPLICATED_NAME)
+
+            names.add(name)
+
+        # 2. Build the groups without the registration. The option strings
+        #    are taken back if any option is invalid.
+        groups = {}
+        strings = set(self._option_strings)
+
+        try:
+            for name, desc, group_entries in entries:
+                group = _SGLGroup(None, name=name, manager=self._manager,
+                                  desc=desc,
+                                  option_strings=self._option_strings)
+                group._extend(group_entries)
+
+                groups[name] = group
+
+            # 3. Register all of them.
+            self._extend(core)
+
+        except SGLException:
+            self._option_strings.intersection_update(strings)
+            raise
+
+        for name, group in groups.items():
+            if self._is_bound:
+                group._bind(self._add_argument_group(name, group.description))
+
+            self.__groups[name] = group
+
+        return groups
+
+    def add_subcommand(self, name, builder, desc=None):
+        """
+        Register the subcommand. The builder is called with the subcommand
+        object to add its arguments only when the subcommand is selected, so
+        the unused subcommands cost nothing at the startup. The parsed
+        subcommand name is stored in the 'command' field, and its values are
+        in the field of the subcommand name.
+
+        :param name: Subcommand name. It is also the category of its options.
+        :param builder: Function which adds the arguments into the subcommand
+                        object passed as its only argument. Use the module
+                        level function to take the snapshot().
+        :param desc: Description of the subcommand.
+        :return: Subcommand object.
+        """
+        if name == 'command' or self._has_duplicate(name):
+            raise SGLException(SGL_PARSER_DUPLICATED_NAME)
+
+        if not callable(builder):
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Builder should be callable.')
+
+        # Validate the name like the other categories.
+        self._manager.dest_name(name)
+
+        command = _SGLCommand(name, self._manager, builder, desc=desc)
+
+        self.__commands[name] = command
+
+        return command
+
+    def add_constraint(self, check, *names, message=None):
+        """
+        Register the cross-field constraint. It is checked after all values
+        are resolved, and its violation is reported with the violations of
+        the option constraints.
+
+        :param check: Function of the option values in the names order which
+                      returns False for the bad combination. Use the module
+                      level function to take the snapshot().
+        :param names: Option names. The group options are the 'group.name'
+                      form, and the others are the options of this parser.
+        :param message: Optional violation message.
+        """
+        dests = []
+
+        for name in names:
+            category, _, sub = name.rpartition('.')
+            target = self.__groups.get(category) if category else self
+
+            option = target._options.get(sub) if target is not None else None
+            if option is None:
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'Unknown option {}.'.format(name))
+
+            dests.append(option.dest)
+
+        self.__relations.append((check, names, message, dests,
+                                 _compile_relation(check, dests, message)))
+
+    def __validate(self, opts, command, violations):
+        # The argparse path checks only the constrained options.
+        targets = [self] + list(self.__parsed_groups(command).values())
+
+        for target in targets:
+            target._validate(opts, violations)
+
+    def __select_command(self, args):
+        # Only the selected subcommand is materialized. If there is no valid
+        # subcommand, every subcommand name is listed to the argparse for
+        # the help and the error messages.
+        if not self.__commands:
+            return None, False
+
+        name, help = _scan_command(sys.argv[1:] if args is None else args)
+        command = self.__commands.get(name)
+
+        if command is not None:
+            command._materialize()
+
+        return command, command is None and (name is not None or help)
+
+    def __bind_commands(self, command, listing):
+        if not self.__commands:
+            return
+
+        if self.__subparsers is None:
+            self.__subparsers = self._add_subparsers(dest='command',
+                                                     metavar='command')
+
+        names = list(self.__commands) if listing \
+            else [command.name] if command is not None else []
+
+        for name in names:
+            if name not in self.__command_parsers:
+                self.__command_parsers[name] = self.__subparsers.add_parser(
+                    name, help=self.__commands[name].description
+                )
+
+        if command is not None and not command._is_bound:
+            command._bind(self.__command_parsers[command.name])
+
+    def __check_environ(self):
+        # Typos of the environment variables are warned only once.
+        if not self.__warn_unknown_env:
+            return
+
+        self.__warn_unknown_env = False
+
+        options = list(self._options.values())
+        for group in self.__groups.values():
+            options.extend(group._options.values())
+
+        # Options of the subcommands are not defined until the selection.
+        prefixes = ['{}_'.format(self._manager.env_name(name))
+                    for name in self.__commands]
+
+        unknown = self._manager.unknown_environ(options, prefixes)
+        if unknown:
+            warnings.warn('Unknown environment variables for {}: {}'.format(
+                self.__app_name, ', '.join(unknown)
+            ), SGLUnknownEnvWarning, stacklevel=4)
+
+    def __parse_all(self, args, namespace):
+        self.__check_environ()
+
+        with _timing(self.__profiler, 'parse'):
+            # Get 1 dimensional dictionary. The deferred parser resolves it
+            # without the argparse if there is no argument, and checks the
+            # constraints at the same time.
+            violations = []
+            opts = self.__resolve_all(args, namespace, violations)
+
+            if opts is None:
+                command, listing = self.__select_command(args)
+
+                self.__bind_all()
+                self.__bind_commands(command, listing)
+
+                opts = vars(self._parse_args(args=args, namespace=namespace))
+
+                violations = []
+                self.__validate(opts, self.__parsed_command(opts),
+                                violations)
+
+            for _, names, _, dests, validate in self.__relations:
+                message = validate(opts)
+
+                if message is not None:
+                    violations.append(SGLViolation(
+                        ','.join(names),
+                        tuple(opts.get(dest) for dest in dests), message
+                    ))
+
+        if violations:
+            raise SGLValidationError(violations)
+
+        return opts
+
+    def __parsed_command(self, opts):
+        return self.__commands.get(opts.get('command'))
+
+    def __parsed_groups(self, command):
+        groups = dict(self.__groups)
+        if command is not None:
+            groups[command.name] = command
+
+        return groups
+
+    def __schema_key(self, groups):
+        return (tuple(self._options),
+                tuple((name, tuple(group._options))
+                      for name, group in groups.items()),
+                bool(self.__commands))
+
+    def __frozen_type(self, command=None):
+        # Generated classes are reused until the schema is changed.
+        key = self.__schema_key(self.__parsed_groups(command))
+
+        if key not in self.__frozen_types:
+            root = key[0] + tuple(name for name, _ in key[1])
+            if self.__commands:
+                root += ('command',)
+
+            self.__frozen_types[key] = (
+                _frozen_type('SGLOptions', root),
+                [_frozen_type(name, fields) for name, fields in key[1]]
+            )
+
+        return self.__frozen_types[key]
+
+    def __compile_fill(self, cls, options, groups):
+        # Build the function which makes the cls object from the parsed
+        # dictionary. Each constructor parameter is mapped to its value getter
+        # once, so the filling is a single pass without any dictionary.
+        options = {name.replace('-', '_'): option
+                   for name, option in options.items()}
+        groups = {name.replace('-', '_'): group
+                  for name, group in groups.items()}
+
+        getters = []
+
+        for name, hint, default in _init_fields(cls):
+            if name in options:
+                getters.append(
+                    lambda opts, dest=options[name].dest: opts.get(dest)
+                )
+
+            elif name in groups:
+                group = groups[name]
+
+                # Unknown group class is generated from the group's schema.
+                if not _is_options_class(hint):
+                    hint = _slots_type(name, group._options)
+
+                getters.append(self.__compile_fill(hint, group._options, {}))
+
+            elif name == 'command' and self.__commands:
+                getters.append(lambda opts: opts.get('command'))
+
+            elif default is not None:
+                getters.append(lambda opts, default=default: default())
+
+            else:
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'No option for the field {}.'.format(name))
+
+        def fill(opts):
+            return cls(*[getter(opts) for getter in getters])
+
+        return fill
+
+    def __fill_builder(self, into, command):
+        groups = self.__parsed_groups(command)
+        key = (into, self.__schema_key(groups))
+
+        if key not in self.__fill_builders:
+            if into == 'slots':
+                fields = list(self._options) + list(groups)
+                if self.__commands:
+                    fields.append('command')
+
+                cls = _slots_type('SGLOptions', fields)
+            else:
+                cls = into
+
+            self.__fill_builders[key] = self.__compile_fill(cls, self._options,
+                                                            groups)
+
+        return self.__fill_builders[key]
+
+    def parse_args(self, args=None, namespace=None, into=None):
+        """
+        Parse the arguments into the nested namespace. Each group is also the
+        namespace in the field of the group name.
+
+        :param args: Argument list except the program name.
+        :param namespace: Namespace object for the argparse.
+        :param into: Options class to fill instead of the namespace. The
+                     dataclass, the attrs class and the named tuple are
+                     filled by the field names, and the fields of the group
+                     names are filled with their annotated classes. The
+                     'slots' fills the generated __slots__ classes.
+        :return: Namespace or the options class object.
+        """
         # 1. Get 1 dimensional dictionary
-        opts = vars(self._parse_args(args=args, namespace=namespace))
+        opts = self.__parse_all(args, namespace)
+
+        if into is not None:
+            return self.__fill_builder(into, self.__parsed_command(opts))(opts)
 
         # 2. Parse core arguments
+        from argparse import Namespace
+
         kwargs = self._parse_local(opts)
 
         # 3. Parse group arguments
         kwargs.update({
-            name: argparse.Namespace(**group.parse_group(opts))
+            name: Namespace(**group.parse_group(opts))
             for name, group in self.__groups.items()
         })
 
-        # 4. Return re-constructed namespace
-        return argparse.Namespace(**kwargs)
+        # 4. Parse the selected subcommand arguments
+        if self.__commands:
+            command = self.__parsed_command(opts)
+
+            kwargs['command'] = command.name if command else None
+
+            if command is not None:
+                kwargs[command.name] = Namespace(
+                    **command.parse_group(opts)
+                )
+
+        # 5. Return re-constructed namespace
+        return Namespace(**kwargs)
+
+    def parse_frozen(self, args=None):
+        """
+        Parse the arguments into the immutable options. The options class is
+        generated from the registered schema, and each group is also the
+        nested immutable options. Those don't have per-instance __dict__, so
+        the many threads can share and read it without any lock.
+
+        :param args: Argument list except the program name.
+        :return: Frozen options object.
+        """
+        opts = self.__parse_all(args, None)
+        command = self.__parsed_command(opts)
+        root, groups = self.__frozen_type(command)
+
+        parsed = self.__parsed_groups(command).values()
+
+        values = [opts.get(option.dest) for option in self._options.values()]
+        values.extend(
+            group_type(opts.get(option.dest)
+                       for option in group._options.values())
+            for group_type, group in zip(groups, parsed)
+        )
+
+        if self.__commands:
+            values.append(command.name if command else None)
+
+        return root(values)
+
+    def export_environ(self, args=None, blob=False):
+        """
+        Export the resolved options as the environment variables of the
+        child processes. The child SGLParser of the same app name finds the
+        '<APP>__OPTIONS' variable, and resolves the options from the
+        environment without loading the configuration file. The child which
+        has the config argument loads that file instead. The separate
+        variables still override it as the environment values, so use the
+        blob if the children may change the configuration file.
+
+        :param args: Argument list. If not specified it, use the sys.argv.
+        :param blob: If True, all values are packed into the single
+                     '<APP>__OPTIONS' variable. Otherwise, each value is the
+                     '<APP>_<CATEGORY>_<NAME>' variable.
+        :return: Dictionary of the environment variables to add to the
+                 environment of the child processes.
+        """
+        from sglove.parser.environ import _export_environ
+
+        opts = self.__parse_all(args, None)
+
+        options = [option for group in self.__parsed_groups(
+            self.__parsed_command(opts)
+        ).values() for option in group._options.values()]
+        options.extend(self._options.values())
+
+        return _export_environ(self._manager.export_env, options, opts,
+                               blob=blob)
+
+    def export_shell(self, args=None, blob=False):
+        """
+        Export the resolved options as the POSIX shell snippet like the
+        export_environ().
+
+        :param args: Argument list. If not specified it, use the sys.argv.
+        :param blob: If True, all values are packed into the single variable.
+        :return: Shell snippet of the 'export NAME=value' lines.
+        """
+        from sglove.parser.environ import _shell_snippet
+
+        return _shell_snippet(self.export_environ(args, blob=blob))
+
+    def snapshot(self):
+        """
+        Take the snapshot of the registered schema. The schema includes the
+        groups and the arguments with their types, defaults and the other
+        argparse options, so all of them should be picklable. The subcommand
+        builders are pickled by their names, so those should be the module
+        level functions.
+
+        :return: Snapshot bytes to use in the restore().
+        """
+        from sglove.parser.snapshot import _dump_schema
+
+        return _dump_schema({
+            'app_name': self.__app_name,
+            'core': self._specs,
+            'groups': [(name, group.description, group._specs)
+                       for name, group in self.__groups.items()],
+            'commands': [(name, command.description, command.builder)
+                         for name, command in self.__commands.items()],
+            'relations': [relation[:3] for relation in self.__relations],
+        })
+
+    @classmethod
+    def restore(cls, data, default_config=None, cache=None, profiler=None,
+                registry=None):
+        """
+        Rebuild the parser from the snapshot. The restored parser skips the
+        name validations, and builds the argparse parser only when it is
+        required to parse the arguments.
+
+        :param data: Snapshot bytes from the snapshot().
+        :param default_config: Default configuration file path.
+        :param cache: Optional SGLConfigCache object to reuse the parsed
+                      configuration file.
+        :param profiler: Optional SGLProfiler object.
+        :param registry: Optional SGLSourceRegistry object.
+        :return: Restored SGLParser object.
+        """
+        from sglove.parser.snapshot import _load_schema
+
+        schema = _load_schema(data)
+
+        parser = cls.__new__(cls)
+        parser.__setup(schema['app_name'], default_config, cache,
+                       profiler=profiler, registry=registry)
+
+        parser._restore(schema['core'])
+
+        for name, desc, specs in schema['groups']:
+            parser.add_argument_group(name, desc)._restore(specs)
+
+        for name, desc, builder in schema.get('commands', []):
+            parser.add_subcommand(name, builder, desc)
+
+        for check, names, message in schema.get('relations', []):
+            parser.add_constraint(check, *names, message=message)
+
+        return parser
+
+    @classmethod
+    def from_builder(cls, app_name, builder, default_config=None, cache=None,
+                     store=None, profiler=None, registry=None):
+        """
+        Build the parser with the schema defining function through the
+        snapshot store. The snapshot is keyed by the fingerprint of the
+        builder's code, so it is rebuilt after the code is changed.
+
+        :param app_name: Application name used as the environment prefix.
+        :param builder: Function which adds the arguments and the groups into
+                        the parser passed as its only argument.
+        :param default_config: Default configuration file path.
+        :param cache: Optional SGLConfigCache object to reuse the parsed
+                      configuration file.
+        :param store: Optional SGLSnapshotStore object. If not specified it,
+                      use the store in the default cache directory.
+        :param profiler: Optional SGLProfiler object.
+        :param registry: Optional SGLSourceRegistry object.
+        :return: SGLParser object.
+        """
+        from sglove.parser.snapshot import SGLSnapshotStore, \
+            _builder_fingerprint
+
+        if store is None:
+            store = SGLSnapshotStore()
+
+        key = _builder_fingerprint(builder, app_name)
+
+        data = store.load(key)
+        if data is not None:
+            try:
+                return cls.restore(data, default_config=default_config,
+                                   cache=cache, profiler=profiler,
+                                   registry=registry)
+
+            except SGLException as err:
+                if err.code != SGL_PARSER_INVALID_SNAPSHOT:
+                    raise
+
+                store.invalidate(key)
+
+        parser = cls(app_name, default_config=default_config, cache=cache,
+                     profiler=profiler, registry=registry)
+        builder(parser)
+
+        store.save(key, parser.snapshot())
+
+        return parser
@@ -0,0 +1,91 @@
+import argparse
+
+from sglove.parser.exception import *
+
+
+# =======================
+# Argument action classes
+# =======================
+class _FileEnvAction(argparse.Action):
+    def __init__(self, manager, category, name,
+                 default=None,
+                 type=str,
+                 choices=None,
+                 required=False,
+                 option=None,
+                 **kwargs):
+
+        # The sglove.parser imports this module at the first use, so the
+        # manager class is imported here to avoid the circular import.
+        from sglove.parser import _OptionManager
+
+        if not isinstance(manager, _OptionManager):
+            raise SGLException(SGL_PARSER_UNEXPECTED_MANAGER)
+
+        if 'nargs' in kwargs and kwargs['nargs'] != 1:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Nargs should be 1.')
+        else:
+            kwargs.pop('nargs', None)
+
+        if 'const' in kwargs:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Const cannot be supported.')
+
+        # 1. Remove 'const' option because of the inversion-revoke case from
+        #    env and file. If the value already selected from 'env' and 'file',
+        #    users can't revoke to the default values from a single argument.
+        #    Also if this action use this option reverting the 'env' or 'file'
+        #    driven value not default, it can make confusions about the meaning
+        #    of that arguments.
+        #    Anyway FileEnvAction should have values in case about the store_*.
+        #    (store_true, store_false, store_const, and so on.)
+        kwargs.pop('const', None)
+
+        # Compile the option if the caller didn't pass the compiled one.
+        if option is None:
+            option = manager.compile(category, name, type=type)
+
+        default = manager.resolve(option, default=default)
+
+        # Store the converter to change from string to the wanted value type
+        # at the parsing phase.
+        self.__convert = option.convert
+        self.__merge = getattr(option.convert, 'merge', None)
+        self.__option = option
+        self.__profiler = manager.profiler
+
+        if option.type is bool:
+            choices = None
+            default = False if default is None else default
+
+        # If already has default value, remove required field.
+        if required and default is not None:
+            required = False
+
+        super(_FileEnvAction, self).__init__(nargs=None,
+                                             const=None,
+                                             default=default,
+                                             type=str,
+                                             choices=choices,
+                                             required=required,
+                                             **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if self.__profiler is None:
+            value = self.__convert(values)
+        else:
+            value = self.__profiler.convert(
+                self.__option, 'cli', values,
+                ['cli:{}'.format(option_string)], origin=option_string
+            )
+
+        # Repeated arguments of the multi-valued option are merged. The first
+        # one replaces the default value from the env and file.
+        if self.__merge is not None:
+            current = getattr(namespace, self.dest, None)
+
+            if current is not None and current is not self.default:
+                value = self.__merge(current, value)
+
+        setattr(namespace, self.dest, value)
@@ -0,0 +1,668 @@
+import mmap
+import os
+import struct
+
+from collections import namedtuple
+
+from sglove.parser.exception import *
+from sglove.utils import lazy_regex
+
+
+# =================
+# Fast JSON decoder
+# =================
+__json_loads = None
+
+# The orjson parses the integers out of the 64-bit range as the floats, so
+# the inputs which may have them are decoded by the json module.
+__REGEX_LONG_DIGITS = lazy_regex(rb'[0-9]{19}')
+__REGEX_LONG_DIGITS_TEXT = lazy_regex(r'[0-9]{19}')
+
+
+def _json_loads(data):
+    """
+    Decode the JSON bytes with the fastest available decoder. The orjson is
+    used if it is installed, otherwise the json module. The inputs which may
+    have the integers out of the 64-bit range are always decoded by the json
+    module to keep the exact values.
+
+    :param data: JSON bytes or string.
+    :return: Decoded object.
+    """
+    global __json_loads
+
+    if __json_loads is None:
+        import json
+
+        try:
+            import orjson
+
+            def orjson_loads(data):
+                regex = __REGEX_LONG_DIGITS_TEXT if isinstance(data, str) \
+                    else __REGEX_LONG_DIGITS
+
+                if regex.search(data):
+                    return json.loads(data)
+
+                # orjson rejects some of the json module's extensions like
+                # NaN, so retry them with json module.
+                try:
+                    return orjson.loads(data)
+
+                except ValueError:
+                    return json.loads(data)
+
+            __json_loads = orjson_loads
+
+        except ImportError:
+            __json_loads = json.loads
+
+    return __json_loads(data)
+
+
+# ================================
+# Lazy loading configuration files
+# ================================
+def _map_file(f_in):
+    # Only the cache entries are mapped. Those are replaced by the new files
+    # instead of being rewritten, so the mapped pages are never truncated.
+    # Empty file can't be mapped, so use the empty bytes instead of it.
+    if not os.fstat(f_in.fileno()).st_size:
+        return b''
+
+    return mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _cache_directory(directory=None):
+    """
+    Cache directory of the sglove.
+
+    :param directory: User specified directory. If not specified it, use the
+                      $XDG_CACHE_HOME/sglove or ~/.cache/sglove.
+    :return: Cache directory path.
+    """
+    if directory:
+        return directory
+
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME')
+        or os.path.join(os.path.expanduser('~'), '.cache'),
+        'sglove'
+    )
+
+
+def _write_atomic(directory, path, chunks):
+    """
+    Write the chunks to the temporal file and replace the path with it to
+    avoid the half written file from the other processes. Cache files are
+    just an optimization, so the unwritable directory is ignored.
+
+    :param directory: Directory of the path.
+    :param path: Target file path.
+    :param chunks: Bytes objects to write in order.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        import tempfile
+
+        fd, temp = tempfile.mkstemp(dir=directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f_out:
+                for chunk in chunks:
+                    f_out.write(chunk)
+
+            os.replace(temp, path)
+
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    except OSError:
+        pass
+
+
+class _LazyConfig:
+    """
+    Base class of the two depth configuration which decodes each category
+    on its first access. Child classes should implement _index() to build
+    the category offset table and _decode() to decode a category.
+    """
+    def __init__(self, buffer, offsets=None):
+        self._buffer = buffer
+        self.__offsets = offsets
+        self.__decoded = {}
+
+    def _index(self):
+        raise NotImplementedError
+
+    def _decode(self, begin, end):
+        raise NotImplementedError
+
+    @property
+    def _offsets(self):
+        if self.__offsets is None:
+            self.__offsets = self._index()
+
+        return self.__offsets
+
+    def __contains__(self, category):
+        return category in self._offsets
+
+    def __getitem__(self, category):
+        if category not in self.__decoded:
+            self.__decoded[category] = self._decode(*self._offsets[category])
+
+        return self.__decoded[category]
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, category, default=None):
+        return self[category] if category in self else default
+
+
+class _LazyJSONConfig(_LazyConfig):
+    """
+    Two depth JSON configuration backed by the bytes of the file.
+
+    The byte offsets of the first depth categories are indexed on the first
+    access, and each category is decoded only when it is requested. So the
+    memory usage and the loading latency don't depend on the categories which
+    are never used by the application.
+    """
+    __REGEX_WS = lazy_regex(rb'[ \t\n\r]*')
+    __REGEX_KEY = lazy_regex(rb'"[^"\\]*(?:\\.[^"\\]*)*"[ \t\n\r]*:[ \t\n\r]*')
+    __REGEX_STRING = lazy_regex(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+    __REGEX_SCALAR = lazy_regex(rb'[^,}\] \t\n\r]+')
+
+    # Object which doesn't have any nested object or array. Most of the
+    # categories are matched by this pattern in one step.
+    __REGEX_FLAT = lazy_regex(
+        rb'\{[^{}\[\]"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^{}\[\]"]*)*\}'
+    )
+
+    # Tokens to track the depth of the nested objects and arrays.
+    __REGEX_TOKEN = lazy_regex(rb'"[^"\\]*(?:\\.[^"\\]*)*"|([{\[])|([}\]])')
+
+    def __init__(self, path):
+        """
+        Constructor
+
+        :param path: JSON configuration file path.
+        """
+        # The file is read instead of being mapped. The user may rewrite it
+        # in place, and the truncated pages of the map kill the process with
+        # SIGBUS at the decoding of the next category.
+        with open(path, 'rb') as f_in:
+            super(_LazyJSONConfig, self).__init__(f_in.read())
+
+    def __skip_ws(self, pos):
+        return self.__REGEX_WS.match(self._buffer, pos).end()
+
+    def __char(self, pos):
+        return self._buffer[pos:pos + 1]
+
+    def __skip_flat(self, pos):
+        # Find the closing brace which is placed after the even number of
+        # quotes. It is valid only if there is no escape character and nested
+        # container, so the other cases fall back to the regex matching.
+        buffer = self._buffer
+        begin, quotes = pos + 1, 0
+
+        while True:
+            end = buffer.find(b'}', begin)
+            if end < 0:
+                return None
+
+            segment = buffer[begin:end]
+
+            if b'\\' in segment or b'{' in segment or b'[' in segment:
+                return None
+
+            quotes += segment.count(b'"')
+
+            if not quotes % 2:
+                return end + 1
+
+            begin = end + 1
+
+    def __skip_value(self, pos):
+        char = self.__char(pos)
+
+        if char == b'{':
+            end = self.__skip_flat(pos)
+            if end is not None:
+                return end
+
+            matched = self.__REGEX_FLAT.match(self._buffer, pos)
+            if matched:
+                return matched.end()
+
+        if char in (b'{', b'['):
+            depth = 0
+
+            for token in self.__REGEX_TOKEN.finditer(self._buffer, pos):
+                if token.lastindex == 1:
+                    depth += 1
+
+                elif token.lastindex == 2:
+                    depth -= 1
+
+                    if not depth:
+                        return token.end()
+
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        pattern = self.__REGEX_STRING if char == b'"' else self.__REGEX_SCALAR
+
+        matched = pattern.match(self._buffer, pos)
+        if not matched:
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        return matched.end()
+
+    def _index(self):
+        # Build category name to the (begin, end) byte offsets table. Like the
+        # json module, the last one wins if there are duplicated categories.
+        offsets = {}
+
+        pos = self.__skip_ws(0)
+        if self.__char(pos) != b'{':
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        pos = self.__skip_ws(pos + 1)
+        closed = self.__char(pos) == b'}'
+
+        while not closed:
+            matched = self.__REGEX_KEY.match(self._buffer, pos)
+            if not matched:
+                raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+            key = _json_loads(self._buffer[pos:matched.end()].rstrip()[:-1])
+
+            begin = matched.end()
+            end = self.__skip_value(begin)
+
+            offsets[key] = (begin, end)
+
+            pos = self.__skip_ws(end)
+            char = self.__char(pos)
+
+            if char == b',':
+                pos = self.__skip_ws(pos + 1)
+
+            elif char == b'}':
+                closed = True
+
+            else:
+                raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        if self.__skip_ws(pos + 1) != len(self._buffer):
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        return offsets
+
+    def _decode(self, begin, end):
+        try:
+            return _json_loads(self._buffer[begin:end])
+
+        except ValueError:
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+
+# ======================================
+# Configuration file format registration
+# ======================================
+_ConfigFormat = namedtuple('_ConfigFormat',
+                           ['name', 'open', 'extensions', 'magic'])
+
+__formats = {}
+
+# Head bytes to detect the format without the known extension.
+__MAGIC_SIZE = 16
+
+# Extensions which are used by any format. The magic bytes are checked
+# before them, so the JSON files of these names are loaded as before.
+__GENERIC_EXTENSIONS = ('.cfg', '.conf')
+
+
+def register_config_format(name, open, extensions=(), magic=None):
+    """
+    Register the configuration file format. The later registration of the
+    same name replaces the previous one.
+
+    :param name: Format name.
+    :param open: Function which takes the file path and returns the two depth
+                 mapping of the categories and their variables.
+    :param extensions: File extensions including the dot like '.json'.
+    :param magic: Optional function which takes the head bytes of the file
+                  and returns True if the file is this format.
+    """
+    __formats[name] = _ConfigFormat(name, open, tuple(extensions), magic)
+
+
+def _detect_format(path):
+    """
+    Detect the configuration file format by the extension first, and then by
+    the magic bytes. The generic extensions like '.conf' are decided by the
+    magic bytes first. Unknown files are treated as the JSON.
+
+    :param path: Configuration file path.
+    :return: Format name.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    candidate = 'json'
+
+    for config_format in __formats.values():
+        if extension in config_format.extensions:
+            if extension not in __GENERIC_EXTENSIONS:
+                return config_format.name
+
+            candidate = config_format.name
+            break
+
+    with open(path, 'rb') as f_in:
+        head = f_in.read(__MAGIC_SIZE)
+
+    for config_format in __formats.values():
+        if config_format.magic and config_format.magic(head):
+            return config_format.name
+
+    return candidate
+
+
+def _open_config(path, format=None):
+    """
+    Open the configuration file as the two depth mapping.
+
+    :param path: Configuration file path.
+    :param format: Format name. If not specified it, detect it from the file.
+    :return: Two depth configuration mapping object.
+    """
+    if format is None:
+        format = _detect_format(path)
+
+    if format not in __formats:
+        raise SGLException(SGL_PARSER_UNSUPPORTED_FORMAT, format)
+
+    return __formats[format].open(path)
+
+
+def _eager_config(decode):
+    # Wrap the whole file decoder to check the result and to unify the
+    # decoding errors into the SGLException.
+    def open_config(path):
+        try:
+            with open(path, 'rb') as f_in:
+                config = decode(f_in)
+
+        except SGLException:
+            raise
+
+        except Exception:
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        if not isinstance(config, dict):
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        return config
+
+    return open_config
+
+
+def _backend(*modules):
+    """
+    Import the first available module.
+
+    :param modules: Module names in the preferred order.
+    :return: Imported module.
+    """
+    for module in modules:
+        try:
+            return __import__(module)
+
+        except ImportError:
+            pass
+
+    raise SGLException(SGL_PARSER_UNSUPPORTED_FORMAT,
+                       'Install one of {}.'.format(', '.join(modules)))
+
+
+def __decode_toml(f_in):
+    return _backend('tomllib', 'tomli').load(f_in)
+
+
+def __decode_yaml(f_in):
+    yaml = _backend('yaml')
+
+    return yaml.load(f_in, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def __decode_msgpack(f_in):
+    return _backend('msgpack').unpackb(f_in.read(), raw=False,
+                                       strict_map_key=False)
+
+
+def __decode_ini(f_in):
+    import configparser
+
+    # Keep the case of the variable names and the raw values.
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.optionxform = str
+    parser.read_string(f_in.read().decode())
+
+    return {section: dict(parser[section]) for section in parser.sections()}
+
+
+def __json_magic(head):
+    return head.lstrip()[:1] == b'{'
+
+
+def __msgpack_magic(head):
+    # fixmap, map 16 and map 32
+    return bool(head) and (0x80 <= head[0] <= 0x8f or head[0] in (0xde, 0xdf))
+
+
+def __yaml_magic(head):
+    return head.startswith(b'---') or head.startswith(b'%YAML')
+
+
+register_config_format('json', _LazyJSONConfig, ['.json'], __json_magic)
+register_config_format('msgpack', _eager_config(__decode_msgpack),
+                       ['.msgpack', '.mpk'], __msgpack_magic)
+register_config_format('toml', _eager_config(__decode_toml), ['.toml'])
+register_config_format('yaml', _eager_config(__decode_yaml),
+                       ['.yaml', '.yml'], __yaml_magic)
+register_config_format('ini', _eager_config(__decode_ini),
+                       ['.ini', '.cfg', '.conf'])
+
+
+class _SnapshotConfig(_LazyConfig):
+    """
+    Two depth configuration restored from the SGLConfigCache entry. Each
+    category is stored as a separated pickle, so only the requested
+    categories are unpickled.
+    """
+    def _decode(self, begin, end):
+        import pickle
+
+        return pickle.loads(self._buffer[begin:end])
+
+
+# ==============================
+# Persistent parsed config cache
+# ==============================
+class SGLConfigCache:
+    """
+    On-disk cache of the parsed configuration files.
+
+    Each entry is keyed by the absolute path of the configuration file, and
+    validated by its mtime, size and content hash. If the mtime and size are
+    same, the entry is used without reading the configuration file. If only
+    the mtime is changed, the content hash decides whether the entry is still
+    valid. Invalid entries are rebuilt automatically.
+    """
+    __MAGIC = b'SGLC\x01'
+    __HEADER = struct.Struct('<I')
+
+    def __init__(self, directory=None):
+        """
+        Constructor
+
+        :param directory: Cache directory. If not specified it, use the
+                          $XDG_CACHE_HOME/sglove or ~/.cache/sglove.
+        """
+        self.__directory = _cache_directory(directory)
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def stats(self):
+        return {'hits': self.__hits, 'misses': self.__misses}
+
+    @staticmethod
+    def __digest(buffer):
+        import hashlib
+
+        return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+    def entry_path(self, path):
+        """
+        Cache entry path of the configuration file.
+
+        :param path: Configuration file path.
+        :return: Cache entry file path in the cache directory.
+        """
+        import hashlib
+
+        key = hashlib.blake2b(os.path.abspath(path).encode(),
+                              digest_size=16).hexdigest()
+
+        return os.path.join(self.__directory, '{}.cache'.format(key))
+
+    def __read_entry(self, entry):
+        import pickle
+
+        # Return the header and the memory mapped entry. Broken or
+        # incompatible entries are treated as not existing.
+        try:
+            with open(entry, 'rb') as f_in:
+                buffer = _map_file(f_in)
+
+        except OSError:
+            return None, None
+
+        begin = len(self.__MAGIC) + self.__HEADER.size
+
+        try:
+            if buffer[:len(self.__MAGIC)] != self.__MAGIC:
+                return None, None
+
+            size, = self.__HEADER.unpack(buffer[len(self.__MAGIC):begin])
+            header = pickle.loads(buffer[begin:begin + size])
+
+        except Exception:
+            return None, None
+
+        # Body offsets are relative to the end of header.
+        base = begin + size
+        header['offsets'] = {
+            category: (base + b, base + e)
+            for category, (b, e) in header['offsets'].items()
+        }
+
+        return header, buffer
+
+    def __write_entry(self, entry, header, categories):
+        import pickle
+
+        body = []
+        offsets = {}
+        pos = 0
+
+        for category, blob in categories.items():
+            body.append(blob)
+            offsets[category] = (pos, pos + len(blob))
+            pos += len(blob)
+
+        header = pickle.dumps(dict(header, offsets=offsets),
+                              protocol=pickle.HIGHEST_PROTOCOL)
+
+        _write_atomic(self.__directory, entry,
+                      [self.__MAGIC, self.__HEADER.pack(len(header)), header]
+                      + body)
+
+    def load(self, path, format=None):
+        """
+        Load the configuration file through the cache.
+
+        :param path: Configuration file path.
+        :param format: Format name. If not specified it, detect it from the
+                       file.
+        :return: Two depth configuration mapping object.
+        """
+        stat = os.stat(path)
+        entry = self.entry_path(path)
+
+        header, buffer = self.__read_entry(entry)
+
+        # 1. Fast validation using mtime and size
+        if header and header['mtime'] == stat.st_mtime_ns \
+                and header['size'] == stat.st_size:
+            self.__hits += 1
+
+            return _SnapshotConfig(buffer, header['offsets'])
+
+        with open(path, 'rb') as f_in:
+            content = f_in.read()
+
+        digest = self.__digest(content)
+
+        # 2. Only the mtime is changed. Refresh the entry's mtime and reuse it.
+        if header and header['size'] == stat.st_size \
+                and header['digest'] == digest:
+            self.__hits += 1
+
+            self.__write_entry(entry,
+                               {'mtime': stat.st_mtime_ns,
+                                'size': stat.st_size,
+                                'digest': digest},
+                               {category: buffer[b:e] for category, (b, e)
+                                in header['offsets'].items()})
+
+            return _SnapshotConfig(buffer, header['offsets'])
+
+        # 3. Cache miss. Decode all categories and rebuild the entry.
+        import pickle
+
+        self.__misses += 1
+
+        config = _open_config(path, format)
+
+        self.__write_entry(entry,
+                           {'mtime': stat.st_mtime_ns,
+                            'size': stat.st_size,
+                            'digest': digest},
+                           {category: pickle.dumps(
+                               config[category],
+                               protocol=pickle.HIGHEST_PROTOCOL
+                           ) for category in config})
+
+        return config
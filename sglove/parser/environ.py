@@ -0,0 +1,140 @@
+import array
+import json
+
+from sglove.parser.exception import *
+from sglove.parser.types import _SGLMultiType
+
+# Increase it whenever the exported blob layout is changed.
+_BLOB_VERSION = 2
+
+__BLOB_HEADER = 'SGLE{}:'.format(_BLOB_VERSION)
+
+# Types which are stored in the blob as they are.
+__SCALAR_TYPES = (str, bool, int, float)
+
+
+# ======================
+# Value export functions
+# ======================
+def __plain(value):
+    # Containers of the multi-valued types are changed to the JSON forms,
+    # which the _SGLMultiType accepts like the configuration file values.
+    if isinstance(value, array.array):
+        return value.tolist()
+
+    elif isinstance(value, (set, frozenset)):
+        return list(value)
+
+    return value
+
+
+def __env_text(option, value):
+    if option.type is bool:
+        return 'true' if value else 'false'
+
+    elif isinstance(option.convert, _SGLMultiType):
+        try:
+            return json.dumps(__plain(value), default=str,
+                              separators=(',', ':'))
+
+        except (TypeError, ValueError):
+            raise SGLException(SGL_PARSER_INVALID_VALUE,
+                               '{} can not be exported.'.format(option.env))
+
+    return str(value)
+
+
+def __blob_value(option, value):
+    if option.type in __SCALAR_TYPES:
+        return value
+
+    elif isinstance(option.convert, _SGLMultiType):
+        return __plain(value)
+
+    # The other types are rebuilt from the string like the env value.
+    return str(value)
+
+
+def _encode_blob(values):
+    """
+    Pack the exported values into the single environment value.
+
+    :param values: Dictionary of the environment name and value pairs.
+    :return: Versioned JSON string of the values.
+    """
+    try:
+        data = json.dumps(values, default=str, separators=(',', ':'))
+
+    except (TypeError, ValueError):
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Options have unserializable values.')
+
+    return __BLOB_HEADER + data
+
+
+def _decode_blob(text):
+    """
+    Unpack the environment value from the _encode_blob().
+
+    :param text: Exported blob string.
+    :return: Dictionary of the environment name and value pairs.
+    """
+    if not text.startswith(__BLOB_HEADER):
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Not the exported options.')
+
+    # The blob is the plain JSON, so the environment of the other user never
+    # runs the code in this process.
+    try:
+        values = json.loads(text[len(__BLOB_HEADER):])
+
+    except ValueError:
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Broken exported options.')
+
+    if not isinstance(values, dict):
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Broken exported options.')
+
+    return values
+
+
+def _export_environ(name, options, opts, blob=False):
+    """
+    Build the environment variables of the resolved options.
+
+    :param name: Environment name of the exported options marker.
+    :param options: Iterable of the _CompiledOption objects to export.
+    :param opts: Parsed dest and value dictionary.
+    :param blob: If True, pack all values into the marker variable.
+                 Otherwise, each value is the variable of its env name and
+                 the marker is empty.
+    :return: Dictionary of the environment variables. The options without
+             the value are not exported.
+    """
+    values = {option: opts.get(option.dest) for option in options}
+
+    if blob:
+        return {name: _encode_blob({
+            option.env: __blob_value(option, value)
+            for option, value in values.items() if value is not None
+        })}
+
+    environ = {name: ''}
+    environ.update((option.env, __env_text(option, value))
+                   for option, value in values.items() if value is not None)
+
+    return environ
+
+
+def _shell_snippet(environ):
+    """
+    Format the environment variables as the POSIX shell export commands.
+
+    :param environ: Dictionary of the environment variables.
+    :return: Shell snippet to be sourced or evaluated.
+    """
+    import shlex
+
+    return ''.join('export {}={}\n'.format(key, shlex.quote(value))
+                   for key, value in sorted(environ.items()))
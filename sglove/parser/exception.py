@@ -1,3 +1,5 @@
+from collections import namedtuple
+
 from sglove.exception import SGLException, __ErrorCode
 
 
@@ -9,3 +11,45 @@ SGL_PARSER_ABNORMAL_BOOLEAN = __ErrorCode(5, 'Invalid boolean word.')
 SGL_PARSER_INVALID_PARSING_ARG = __ErrorCode(6, 'Invalid parsing argument.')
 SGL_PARSER_DUPLICATED_NAME = __ErrorCode(7, 'Duplicated argument name.')
 SGL_PARSER_INTERNAL_ERROR = __ErrorCode(8, 'Internal module error.')
+SGL_PARSER_INVALID_CONFIG = __ErrorCode(9, 'Invalid configuration file format.')
+SGL_PARSER_INVALID_SNAPSHOT = __ErrorCode(10, 'Invalid parser snapshot.')
+SGL_PARSER_UNSUPPORTED_FORMAT = __ErrorCode(11, 'Unsupported configuration file format.')
+SGL_PARSER_INVALID_VALUE = __ErrorCode(12, 'Invalid option value.')
+SGL_PARSER_CONSTRAINT_VIOLATION = __ErrorCode(13, 'Option constraint violation.')
+
+SGLViolation = namedtuple('SGLViolation', ['option', 'value', 'message'])
+
+
+class SGLValidationError(SGLException):
+    """
+    Report of all constraint violations found in a single parse. Each
+    violation is the SGLViolation of the 'category.name' option key, the
+    violating value and the message.
+    """
+    _caller_depth = 2
+
+    def __init__(self, violations):
+        """
+        Constructor
+
+        :param violations: List of the SGLViolation objects.
+        """
+        self.__violations = tuple(violations)
+
+        super(SGLValidationError, self).__init__(
+            SGL_PARSER_CONSTRAINT_VIOLATION, '; '.join(
+                '{} {}'.format(violation.option, violation.message)
+                for violation in self.__violations
+            )
+        )
+
+    @property
+    def violations(self):
+        return self.__violations
+
+
+class SGLUnknownEnvWarning(UserWarning):
+    """
+    Warning of the environment variables which have the app name prefix but
+    match no registered option.
+    """
@@ -0,0 +1,297 @@
+import threading
+
+from operator import itemgetter
+
+from sglove.parser.exception import *
+
+
+# =====================
+# Frozen parsed options
+# =====================
+class _FrozenOptions(tuple):
+    """
+    Base class of the immutable parsed options. Child classes are generated
+    from the registered schema by the _frozen_type(). Each value is stored in
+    the tuple slot and read by the property, so there is no per-instance
+    __dict__ and the attribute access is O(1).
+    """
+    __slots__ = ()
+
+    _fields = ()
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(field, value)
+            for field, value in zip(self._fields, self)
+        ))
+
+    def _asdict(self):
+        """
+        Dictionary of the field and value pairs. Nested options are kept as
+        the frozen options.
+
+        :return: Field name to value dictionary.
+        """
+        return dict(zip(self._fields, self))
+
+    def __reduce__(self):
+        # Generated classes can't be found by the name, so the class is
+        # pickled as its name and fields and generated again in the loader.
+        return _frozen_load, (type(self).__name__, self._fields, tuple(self))
+
+
+# Generated classes of the (name, fields) to share them between the parsers
+# and the unpickled options.
+__FROZEN_TYPES = {}
+__FROZEN_TYPES_LOCK = threading.Lock()
+
+
+def _frozen_type(name, fields):
+    """
+    Generate the frozen options class of the fields. The same class is
+    returned for the same name and fields.
+
+    :param name: Class name.
+    :param fields: Field names. Unlike the __slots__, hyphenated names are
+                   also available through the getattr().
+    :return: _FrozenOptions child class.
+    """
+    key = (name, tuple(fields))
+
+    with __FROZEN_TYPES_LOCK:
+        if key not in __FROZEN_TYPES:
+            namespace = {'__slots__': (), '_fields': key[1]}
+            namespace.update({
+                field: property(itemgetter(index))
+                for index, field in enumerate(key[1])
+            })
+
+            __FROZEN_TYPES[key] = type(name, (_FrozenOptions,), namespace)
+
+        return __FROZEN_TYPES[key]
+
+
+def _frozen_load(name, fields, values):
+    """
+    Unpickle the frozen options.
+
+    :param name: Class name.
+    :param fields: Field names.
+    :param values: Field values.
+    :return: _FrozenOptions child object.
+    """
+    return _frozen_type(name, fields)(values)
+
+
+# =======================
+# Mutable slotted options
+# =======================
+class _SlotsOptions:
+    """
+    Base class of the mutable parsed options. Child classes are generated
+    from the registered schema by the _slots_type(). The values are stored in
+    the __slots__, so there is no per-instance __dict__.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(field, getattr(self, field))
+            for field in self.__slots__
+        ))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._astuple() == other._astuple()
+
+    __hash__ = None
+
+    def _astuple(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def _asdict(self):
+        """
+        Dictionary of the field and value pairs. Nested options are kept as
+        the slotted options.
+
+        :return: Field name to value dictionary.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _slots_type(name, fields):
+    """
+    Generate the slotted options class of the fields.
+
+    :param name: Class name.
+    :param fields: Field names. The hyphens are changed to the under bars,
+                   because the __slots__ should be the identifiers.
+    :return: _SlotsOptions child class.
+    """
+    return type(name, (_SlotsOptions,), {
+        '__slots__': tuple(field.replace('-', '_') for field in fields)
+    })
+
+
+# =====================
+# Typed options classes
+# =====================
+def __constant(value):
+    return lambda: value
+
+
+def __is_dataclass(cls):
+    # Same check with the dataclasses.is_dataclass() without its import.
+    return hasattr(cls, '__dataclass_fields__')
+
+
+def _is_options_class(cls):
+    """
+    Check the class can be filled by the constructor parameters.
+
+    :param cls: Class or the type hint.
+    :return: True if the _init_fields() supports the class.
+    """
+    if not isinstance(cls, type):
+        return False
+
+    return __is_dataclass(cls) or hasattr(cls, '__attrs_attrs__') \
+        or issubclass(cls, _SlotsOptions) \
+        or isinstance(getattr(cls, '_fields', None), tuple)
+
+
+def _init_fields(cls):
+    """
+    Constructor parameters of the options class in the positional order. The
+    dataclass, the attrs class and the named tuple like classes including the
+    frozen and the slotted options are supported.
+
+    :param cls: Options class.
+    :return: List of the (name, type, default factory) tuples. The type is
+             None if it is unknown, and the default factory is None if the
+             parameter is required.
+    """
+    if isinstance(cls, type) and __is_dataclass(cls):
+        # Those are already imported to define the dataclass.
+        import dataclasses
+        import typing
+
+        try:
+            hints = typing.get_type_hints(cls)
+
+        except Exception:
+            hints = {}
+
+        fields = []
+
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+
+            if field.default is not dataclasses.MISSING:
+                default = __constant(field.default)
+            elif field.default_factory is not dataclasses.MISSING:
+                default = field.default_factory
+            else:
+                default = None
+
+            fields.append((field.name, hints.get(field.name), default))
+
+        return fields
+
+    if isinstance(cls, type) and hasattr(cls, '__attrs_attrs__'):
+        # attrs is installed if there is the attrs class.
+        import attr
+
+        fields = []
+
+        for field in attr.fields(cls):
+            if not field.init:
+                continue
+
+            default = field.default
+
+            if default is attr.NOTHING:
+                default = None
+            elif isinstance(default, attr.Factory):
+                default = None if default.takes_self else default.factory
+            else:
+                default = __constant(default)
+
+            name = getattr(field, 'alias', None) or field.name.lstrip('_')
+            fields.append((name, field.type, default))
+
+        return fields
+
+    if isinstance(cls, type) and issubclass(cls, _FrozenOptions):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Use the parse_frozen() for the frozen options.')
+
+    if isinstance(cls, type) and issubclass(cls, _SlotsOptions):
+        return [(field, None, None) for field in cls.__slots__]
+
+    if isinstance(cls, type) and isinstance(getattr(cls, '_fields', None),
+                                            tuple):
+        defaults = getattr(cls, '_field_defaults', {})
+
+        return [(field, None, __constant(defaults[field])
+                 if field in defaults else None) for field in cls._fields]
+
+    raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                       'Unsupported options class {!r}.'.format(cls))
+
+
+# ===========================
+# Atomic snapshot replacement
+# ===========================
+class SGLOptionsHolder:
+    """
+    Holder of the current options snapshot for many reader threads.
+
+    Readers take the current reference without any lock. The reference
+    assignment is atomic, so readers see the old or the new snapshot as a
+    whole, never a mixed one. Only the writers are serialized by the lock.
+    """
+    def __init__(self, options=None):
+        """
+        Constructor
+
+        :param options: Initial options snapshot.
+        """
+        self.__options = options
+        self.__lock = threading.Lock()
+
+    @property
+    def current(self):
+        return self.__options
+
+    def swap(self, options):
+        """
+        Replace the snapshot.
+
+        :param options: New options snapshot.
+        :return: Previous options snapshot.
+        """
+        with self.__lock:
+            previous, self.__options = self.__options, options
+
+        return previous
+
+    def compare_and_swap(self, expected, options):
+        """
+        Replace the snapshot only if the current one is the expected.
+
+        :param expected: Snapshot which the writer has read.
+        :param options: New options snapshot.
+        :return: True if replaced.
+        """
+        with self.__lock:
+            if self.__options is not expected:
+                return False
+
+            self.__options = options
+
+        return True
@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+
+# ===================
+# Null timing context
+# ===================
+class _NullTiming:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+__NULL_TIMING = _NullTiming()
+
+
+def _timing(profiler, name):
+    """
+    Timing context of the profiler. If there is no profiler, the shared empty
+    context is returned, so the callers don't need to check it.
+
+    :param profiler: SGLProfiler object or None.
+    :param name: Aggregate timing name.
+    :return: Context manager.
+    """
+    return __NULL_TIMING if profiler is None else profiler.timing(name)
+
+
+# ===================
+# Resolution profiler
+# ===================
+class SGLProfiler:
+    """
+    Instrumentation of the option resolution. Attach it to the SGLParser to
+    record where each option value came from and how long it took. The
+    parser doesn't measure anything without the profiler, so it costs only
+    a None check on each resolution.
+
+    The recorded sources are 'env', 'file', 'default' and 'cli'. The
+    aggregate timings are 'config_load', 'env_scan', 'argparse_build' and
+    'parse'. The 'argparse_build' includes the default resolution of the
+    arguments added to the argparse parser, and the 'parse' includes the
+    'argparse_build' of the first parsing.
+    """
+    def __init__(self):
+        self.__options = {}
+        self.__timings = {}
+
+    @property
+    def options(self):
+        return self.__options
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    def reset(self):
+        """
+        Drop all recorded values.
+        """
+        self.__options = {}
+        self.__timings = {}
+
+    def add_timing(self, name, elapsed):
+        """
+        Accumulate the elapsed time.
+
+        :param name: Aggregate timing name.
+        :param elapsed: Elapsed nanoseconds.
+        """
+        timing = self.__timings.get(name)
+
+        if timing is None:
+            self.__timings[name] = {'count': 1, 'total_ns': elapsed}
+        else:
+            timing['count'] += 1
+            timing['total_ns'] += elapsed
+
+    @contextmanager
+    def timing(self, name):
+        """
+        Measure the block into the aggregate timing.
+
+        :param name: Aggregate timing name.
+        """
+        start = perf_counter_ns()
+
+        try:
+            yield self
+
+        finally:
+            self.add_timing(name, perf_counter_ns() - start)
+
+    def convert(self, option, source, raw, path, origin=None):
+        """
+        Convert the raw value of the option and record its provenance.
+
+        :param option: _CompiledOption object.
+        :param source: One of the 'env', 'file', 'default' and 'cli'.
+        :param raw: Raw value before the conversion.
+        :param path: Looked up locations in order.
+        :param origin: Detail of the source like the file path.
+        :return: Converted value.
+        """
+        key = '{}.{}'.format(option.category, option.name)
+        record = {
+            'source': source,
+            'origin': origin,
+            'raw': raw,
+            'path': path,
+            'resolutions': self.__options[key]['resolutions'] + 1
+            if key in self.__options else 1,
+        }
+
+        self.__options[key] = record
+
+        start = perf_counter_ns()
+
+        try:
+            record['value'] = option.convert(raw)
+            return record['value']
+
+        except Exception as err:
+            record['error'] = str(err)
+            raise
+
+        finally:
+            record['convert_ns'] = perf_counter_ns() - start
+
+    def as_dict(self):
+        """
+        Recorded values as the dictionary.
+
+        :return: {'options': {...}, 'timings': {...}} dictionary.
+        """
+        return {
+            'options': {key: dict(record)
+                        for key, record in self.__options.items()},
+            'timings': {name: dict(timing)
+                        for name, timing in self.__timings.items()},
+        }
+
+    def to_json(self, **kwargs):
+        """
+        Recorded values as the JSON string. The values which JSON can't
+        encode are written by their repr().
+
+        :param kwargs: Keyword arguments of the json.dumps().
+        :return: JSON string.
+        """
+        kwargs.setdefault('default', repr)
+
+        import json
+
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def dump(self, path, **kwargs):
+        """
+        Write the recorded values into the JSON file.
+
+        :param path: Output file path.
+        :param kwargs: Keyword arguments of the json.dumps().
+        """
+        with open(path, 'w') as f_out:
+            f_out.write(self.to_json(**kwargs))
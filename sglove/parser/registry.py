@@ -0,0 +1,148 @@
+import os
+import threading
+
+from collections import OrderedDict
+
+from sglove.parser.exception import *
+
+_DEFAULT_CAPACITY = 32
+
+__DEFAULT_REGISTRY = None
+__DEFAULT_LOCK = threading.Lock()
+
+
+# ======================
+# Option source registry
+# ======================
+class SGLSourceRegistry:
+    """
+    In-process registry of the loaded option sources.
+
+    Each entry is the loaded configuration file and the environment snapshot
+    of an app, keyed by the app name, the absolute configuration file path
+    and the fingerprint of the app's environment variables. The parsers of
+    the same key share the entry instead of loading the file again, and the
+    entry is reloaded if the mtime or the size of the file is changed. The
+    least recently used entries are evicted over the capacity.
+    """
+    def __init__(self, capacity=_DEFAULT_CAPACITY):
+        """
+        Constructor
+
+        :param capacity: Maximum number of the entries.
+        """
+        if not isinstance(capacity, int) or capacity < 1:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Capacity should be the positive integer.')
+
+        self.__capacity = capacity
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def stats(self):
+        return {'hits': self.__hits, 'misses': self.__misses,
+                'entries': len(self.__entries)}
+
+    @staticmethod
+    def __stat(path):
+        stat = os.stat(path)
+
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def acquire(self, manager, path, cache=None):
+        """
+        Load the configuration file into the manager through the registry.
+
+        :param manager: _OptionManager object of the parser.
+        :param path: Configuration file path.
+        :param cache: Optional SGLConfigCache object to use at the loading.
+        """
+        path = os.path.abspath(path)
+        key = (manager.app_name, path,
+               frozenset(manager._env_snapshot.items()))
+        stat = self.__stat(path)
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None and entry[0] == stat:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+
+                manager.load_source(*entry[1])
+                return
+
+            self.__misses += 1
+
+        # The file is loaded out of the lock, so the other apps are not
+        # blocked. The same file may be loaded twice at the first time.
+        manager.load(path, cache=cache)
+
+        with self.__lock:
+            self.__entries[key] = (stat, manager.source)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, app_name=None, path=None):
+        """
+        Remove the entries. The parsers which already use them are not
+        affected.
+
+        :param app_name: App name of the entries. If not specified it,
+                         remove the entries of all apps.
+        :param path: Configuration file path of the entries. If not
+                     specified it, remove the entries of all files.
+        :return: Number of the removed entries.
+        """
+        path = path and os.path.abspath(path)
+
+        with self.__lock:
+            keys = [key for key in self.__entries
+                    if (app_name is None or key[0] == app_name)
+                    and (path is None or key[1] == path)]
+
+            for key in keys:
+                del self.__entries[key]
+
+        return len(keys)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self.invalidate()
+
+
+def default_registry():
+    """
+    Process-wide SGLSourceRegistry object. It is created at the first call.
+
+    :return: SGLSourceRegistry object.
+    """
+    global __DEFAULT_REGISTRY
+
+    with __DEFAULT_LOCK:
+        if __DEFAULT_REGISTRY is None:
+            __DEFAULT_REGISTRY = SGLSourceRegistry()
+
+    return __DEFAULT_REGISTRY
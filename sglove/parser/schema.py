@@ -0,0 +1,190 @@
+import dataclasses
+import types
+import typing
+
+from sglove.parser.exception import *
+from sglove.parser.types import SGLDict, SGLList, SGLSet
+
+# JSON schema type names and their option types.
+__JSON_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': float,
+    'boolean': bool,
+}
+
+# Keys of the property which are passed to the add_argument() as they are.
+__ARGUMENT_KEYS = frozenset(['help', 'required', 'choices', 'metavar',
+                             'minimum', 'maximum', 'pattern', 'path', 'check'])
+
+
+# ===========================
+# JSON schema like dictionary
+# ===========================
+def __property_type(prop):
+    kind = prop.get('type', str)
+
+    if not isinstance(kind, str):
+        return kind
+
+    if kind in __JSON_TYPES:
+        return __JSON_TYPES[kind]
+
+    if kind == 'array':
+        item = __property_type(prop.get('items', {}))
+
+        return SGLSet(item) if prop.get('uniqueItems') else SGLList(item)
+
+    if kind == 'object' and 'properties' not in prop:
+        additional = prop.get('additionalProperties')
+
+        return SGLDict(__property_type(additional)
+                       if isinstance(additional, dict) else str)
+
+    raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                       'Unsupported schema type {!r}.'.format(kind))
+
+
+def __property_entry(name, prop, required):
+    if not isinstance(prop, dict):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Property {} should be a dictionary.'.format(name))
+
+    kwargs = {key: prop[key] for key in __ARGUMENT_KEYS.intersection(prop)}
+
+    if 'description' in prop:
+        kwargs.setdefault('help', prop['description'])
+
+    if 'enum' in prop:
+        kwargs.setdefault('choices', prop['enum'])
+
+    if name in required:
+        kwargs['required'] = True
+
+    return (name, prop.get('short'), prop.get('default'),
+            __property_type(prop), kwargs)
+
+
+def __is_group(prop):
+    return isinstance(prop, dict) and prop.get('type') == 'object' \
+        and 'properties' in prop
+
+
+def __dict_entries(schema):
+    if not isinstance(schema.get('properties'), dict):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Schema should have the properties.')
+
+    core, groups = [], []
+    required = frozenset(schema.get('required', ()))
+
+    for name, prop in schema['properties'].items():
+        if not __is_group(prop):
+            core.append(__property_entry(name, prop, required))
+            continue
+
+        group_required = frozenset(prop.get('required', ()))
+        entries = []
+
+        for sub_name, sub_prop in prop['properties'].items():
+            # Options are only the two depth variables like the config file.
+            if __is_group(sub_prop):
+                raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                                   'Group {} has a nested group.'.format(name))
+
+            entries.append(__property_entry(sub_name, sub_prop,
+                                            group_required))
+
+        groups.append((name, prop.get('description'), entries))
+
+    return core, groups
+
+
+# ================
+# Dataclass schema
+# ================
+__UNION_TYPES = (typing.Union, getattr(types, 'UnionType', typing.Union))
+
+
+def __hint_type(hint):
+    # Optional[X] is X, and the generic containers are the multi-valued types.
+    origin = typing.get_origin(hint)
+    args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+
+    if origin in __UNION_TYPES and len(args) == 1:
+        return __hint_type(args[0])
+
+    if origin is list:
+        return SGLList(*args[:1])
+
+    if origin in (set, frozenset):
+        return SGLSet(*args[:1])
+
+    if origin is dict:
+        return SGLDict(args[1], args[0]) if len(args) == 2 else SGLDict()
+
+    return hint
+
+
+def __field_entry(field, kind):
+    kwargs = {key: field.metadata[key]
+              for key in __ARGUMENT_KEYS.intersection(field.metadata)}
+
+    if field.default is not dataclasses.MISSING:
+        default = field.default
+    elif field.default_factory is not dataclasses.MISSING:
+        default = field.default_factory()
+    else:
+        default = None
+        kwargs.setdefault('required', True)
+
+    return field.name, field.metadata.get('short'), default, kind, kwargs
+
+
+def __dataclass_entries(cls):
+    core, groups = [], []
+    hints = typing.get_type_hints(cls)
+
+    for field in dataclasses.fields(cls):
+        kind = __hint_type(hints.get(field.name, str))
+
+        if isinstance(kind, type) and dataclasses.is_dataclass(kind):
+            group_hints = typing.get_type_hints(kind)
+
+            groups.append((field.name, field.metadata.get('help'), [
+                __field_entry(sub_field,
+                              __hint_type(group_hints.get(sub_field.name, str)))
+                for sub_field in dataclasses.fields(kind)
+            ]))
+
+        else:
+            core.append(__field_entry(field, kind))
+
+    return core, groups
+
+
+def _schema_entries(schema):
+    """
+    Translate the declarative schema into the option entries.
+
+    The schema is the JSON schema like dictionary or the dataclass. In the
+    dictionary, the 'object' properties which have the 'properties' are the
+    groups, and the others are the options. In the dataclass, the fields of
+    the dataclass type are the groups, and the others are the options. Their
+    metadata can have the 'short', 'help', 'required', 'choices' and
+    'metavar' of the option, and the 'minimum', 'maximum', 'pattern', 'path'
+    and 'check' constraints.
+
+    :param schema: Dictionary, dataclass or its instance.
+    :return: (core entries, [(group name, description, entries)]) tuple. Each
+             entry is the (name, short, default, type, kwargs) tuple.
+    """
+    if dataclasses.is_dataclass(schema):
+        return __dataclass_entries(schema if isinstance(schema, type)
+                                   else type(schema))
+
+    if isinstance(schema, dict):
+        return __dict_entries(schema)
+
+    raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                       'Unsupported schema {!r}.'.format(type(schema)))
@@ -0,0 +1,197 @@
+import threading
+
+from sglove.parser.exception import *
+from sglove.parser.options import _FrozenOptions
+
+# Increase it whenever the exported options layout is changed.
+_EXPORT_VERSION = 1
+
+__EXPORT_MAGIC = b'SGLO'
+
+
+# ================================
+# Frozen options export and import
+# ================================
+def export_options(options):
+    """
+    Serialize the frozen options into the compact bytes. The generated
+    options classes are stored as their names and fields, so the bytes can
+    be imported in the other process which has not built the parser.
+
+    :param options: Frozen options from the SGLParser.parse_frozen().
+    :return: Exported bytes.
+    """
+    if not isinstance(options, _FrozenOptions):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Only the frozen options can be exported.')
+
+    import pickle
+
+    try:
+        return __EXPORT_MAGIC + bytes([_EXPORT_VERSION]) + pickle.dumps(
+            options, protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    except (pickle.PicklingError, TypeError, AttributeError):
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Options have unpicklable values.')
+
+
+def import_options(data):
+    """
+    Deserialize the exported bytes into the frozen options.
+
+    :param data: Bytes like object from the export_options().
+    :return: Frozen options object.
+    """
+    import pickle
+
+    header = len(__EXPORT_MAGIC) + 1
+    view = memoryview(data)
+
+    try:
+        if bytes(view[:header]) != __EXPORT_MAGIC + bytes([_EXPORT_VERSION]):
+            raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                               'Not the exported options.')
+
+        with view[header:] as body:
+            return pickle.loads(body)
+
+    except SGLException:
+        raise
+
+    except Exception:
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT)
+
+    finally:
+        view.release()
+
+
+# =====================
+# Shared memory options
+# =====================
+# Imported options of each shared memory block in this process. Those are
+# used in the class, so the names are not mangled.
+_IMPORTED = {}
+_IMPORTED_LOCK = threading.Lock()
+
+
+def _attach_block(name):
+    from multiprocessing import shared_memory
+
+    # The block is owned by the exporting process, so the attaching process
+    # should not track it. Before the track parameter, the multiprocessing
+    # workers share the resource tracker of the owner, and its registration
+    # of the same name is removed once by the owner's unlink().
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SGLSharedOptions:
+    """
+    Frozen options exported into the shared memory block.
+
+    The exporting process owns a single copy of the exported bytes, and the
+    object is pickled as the block name only. So the pool workers receive
+    the tiny handle instead of the whole options, and each worker imports the
+    options from the block once at the first get().
+    """
+
+    def __init__(self, options):
+        """
+        Constructor
+
+        :param options: Frozen options from the SGLParser.parse_frozen().
+        """
+        from multiprocessing import shared_memory
+
+        data = export_options(options)
+
+        self.__block = shared_memory.SharedMemory(create=True, size=len(data))
+        self.__block.buf[:len(data)] = data
+
+        self.__name = self.__block.name
+        self.__size = len(data)
+        self.__owner = True
+
+        with _IMPORTED_LOCK:
+            _IMPORTED[self.__name] = options
+
+    @classmethod
+    def _attach(cls, name, size):
+        shared = cls.__new__(cls)
+        shared.__block = None
+        shared.__name = name
+        shared.__size = size
+        shared.__owner = False
+
+        return shared
+
+    def __reduce__(self):
+        return SGLSharedOptions._attach, (self.__name, self.__size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def is_owner(self):
+        return self.__owner
+
+    def get(self):
+        """
+        Get the frozen options. The options are imported from the block only
+        at the first call in each process.
+
+        :return: Frozen options object.
+        """
+        with _IMPORTED_LOCK:
+            options = _IMPORTED.get(self.__name)
+
+            if options is None:
+                try:
+                    block = _attach_block(self.__name)
+
+                except FileNotFoundError:
+                    raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                                       'Shared options {} are already closed.'
+                                       .format(self.__name))
+
+                view = block.buf[:self.__size]
+
+                try:
+                    options = import_options(view)
+
+                finally:
+                    view.release()
+                    block.close()
+
+                _IMPORTED[self.__name] = options
+
+        return options
+
+    def close(self):
+        """
+        Release the block. The owner also removes the block, so the handles
+        which have not imported the options yet can't import it after this.
+        """
+        with _IMPORTED_LOCK:
+            _IMPORTED.pop(self.__name, None)
+
+        if self.__block is not None:
+            self.__block.close()
+            self.__block.unlink()
+            self.__block = None
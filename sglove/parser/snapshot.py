@@ -0,0 +1,177 @@
+import marshal
+import os
+
+from sglove.parser.config import _cache_directory, _write_atomic
+from sglove.parser.exception import *
+
+# Increase it whenever the snapshot layout is changed.
+_SNAPSHOT_VERSION = 1
+
+
+# =============================
+# Schema snapshot serialization
+# =============================
+def _dump_schema(schema):
+    """
+    Serialize the parser schema into the compact snapshot bytes.
+
+    :param schema: Schema dictionary from the SGLParser.
+    :return: Snapshot bytes.
+    """
+    import pickle
+
+    try:
+        return pickle.dumps(dict(schema, version=_SNAPSHOT_VERSION),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+    except (pickle.PicklingError, TypeError, AttributeError):
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT,
+                           'Schema has unpicklable values.')
+
+
+def _load_schema(data):
+    """
+    Deserialize the snapshot bytes into the parser schema.
+
+    :param data: Snapshot bytes from the _dump_schema().
+    :return: Schema dictionary.
+    """
+    import pickle
+
+    try:
+        schema = pickle.loads(data)
+
+    except Exception:
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT)
+
+    if not isinstance(schema, dict) \
+            or schema.get('version') != _SNAPSHOT_VERSION:
+        raise SGLException(SGL_PARSER_INVALID_SNAPSHOT)
+
+    return schema
+
+
+def _builder_fingerprint(builder, *extra):
+    """
+    Fingerprint of the schema defining function. The source file of the
+    builder and the compiled builder itself are hashed, so any modification
+    of them makes the different fingerprint.
+
+    :param builder: Schema defining function.
+    :param extra: Additional values to distinguish the snapshot.
+    :return: Hex digest string.
+    """
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    digest.update(str(_SNAPSHOT_VERSION).encode())
+    digest.update(repr(extra).encode())
+    digest.update(getattr(builder, '__qualname__', repr(builder)).encode())
+
+    code = getattr(builder, '__code__', None)
+
+    if code is not None:
+        digest.update(marshal.dumps(code))
+
+        try:
+            with open(code.co_filename, 'rb') as f_in:
+                digest.update(f_in.read())
+
+        except OSError:
+            pass
+
+    return digest.hexdigest()
+
+
+# =====================
+# Schema snapshot store
+# =====================
+class SGLSnapshotStore:
+    """
+    On-disk store of the SGLParser schema snapshots.
+
+    Each entry is keyed by the fingerprint of the schema defining code, so the
+    entry of the old code is never matched after the code is changed.
+    """
+    __MAGIC = b'SGLS\x01'
+
+    def __init__(self, directory=None):
+        """
+        Constructor
+
+        :param directory: Store directory. If not specified it, use the
+                          $XDG_CACHE_HOME/sglove or ~/.cache/sglove.
+        """
+        self.__directory = _cache_directory(directory)
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def stats(self):
+        return {'hits': self.__hits, 'misses': self.__misses}
+
+    def entry_path(self, key):
+        """
+        Snapshot entry path of the key.
+
+        :param key: Snapshot key.
+        :return: Snapshot entry file path in the store directory.
+        """
+        return os.path.join(self.__directory, '{}.snapshot'.format(key))
+
+    def load(self, key):
+        """
+        Load the snapshot bytes.
+
+        :param key: Snapshot key.
+        :return: Snapshot bytes or None if there is no valid entry.
+        """
+        try:
+            with open(self.entry_path(key), 'rb') as f_in:
+                data = f_in.read()
+
+        except OSError:
+            data = b''
+
+        if not data.startswith(self.__MAGIC):
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+
+        return data[len(self.__MAGIC):]
+
+    def save(self, key, data):
+        """
+        Save the snapshot bytes.
+
+        :param key: Snapshot key.
+        :param data: Snapshot bytes.
+        """
+        _write_atomic(self.__directory, self.entry_path(key),
+                      [self.__MAGIC, data])
+
+    def invalidate(self, key):
+        """
+        Remove the snapshot entry.
+
+        :param key: Snapshot key.
+        """
+        try:
+            os.unlink(self.entry_path(key))
+
+        except OSError:
+            pass
@@ -0,0 +1,414 @@
+import os
+
+from sglove.parser.config import _open_config
+from sglove.parser.exception import *
+
+
+# =========================
+# Configuration stack layer
+# =========================
+class _Layer:
+    """
+    Single layer of the SGLConfigStack. The layer keeps its values as the
+    flat {(category, name): (value, origin)} dictionary, and the signature of
+    its source to detect the change.
+    """
+    FILE = 'file'
+    DIRECTORY = 'directory'
+    MAPPING = 'mapping'
+
+    def __init__(self, name, kind, source, format=None, pattern=None):
+        self.name = name
+        self.kind = kind
+        self.source = source
+        self.format = format
+        self.pattern = pattern
+        self.signature = None
+        self.values = {}
+
+    def __fragments(self):
+        import fnmatch
+
+        # Fragments are applied in the name order, so the later one wins.
+        names = sorted(
+            name for name in os.listdir(self.source)
+            if not name.startswith('.')
+            and fnmatch.fnmatch(name, self.pattern)
+            and os.path.isfile(os.path.join(self.source, name))
+        )
+
+        return [os.path.join(self.source, name) for name in names]
+
+    @staticmethod
+    def __stat(path):
+        stat = os.stat(path)
+
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def scan(self):
+        """
+        Signature of the current source.
+
+        :return: Comparable signature object.
+        """
+        if self.kind == self.FILE:
+            return self.__stat(self.source)
+
+        elif self.kind == self.DIRECTORY:
+            return tuple(self.__stat(path) for path in self.__fragments())
+
+        return id(self.source)
+
+    @staticmethod
+    def __flatten(config, origin, values):
+        for category in config:
+            variables = config[category]
+
+            # Only the two depth variables can be the option values.
+            if isinstance(variables, dict):
+                for name, value in variables.items():
+                    values[(category, name)] = (value, origin)
+
+    def load(self, cache=None):
+        """
+        Load the source and update the values.
+
+        :param cache: Optional SGLConfigCache object for the files.
+        """
+        signature = self.scan()
+        values = {}
+
+        if self.kind == self.MAPPING:
+            self.__flatten(self.source, None, values)
+
+        else:
+            paths = [self.source] if self.kind == self.FILE \
+                else [path for path, _, _ in signature]
+
+            for path in paths:
+                config = _open_config(path, self.format) if cache is None \
+                    else cache.load(path, format=self.format)
+
+                self.__flatten(config, path, values)
+
+        self.signature = signature
+        self.values = values
+
+
+# ===================
+# Configuration stack
+# ===================
+class SGLConfigStack:
+    """
+    Multi-layer configuration source. The layers are stacked in the added
+    order, and the later layer overrides the earlier one. So add them from
+    the lowest precedence like the system, site, user and job configs. The
+    environment and the CLI arguments still override the whole stack.
+
+    The merged view is kept as the flat index keyed by (category, name) with
+    the provenance of each value. When a layer is changed, only the keys of
+    that layer are merged again.
+    """
+    def __init__(self, cache=None):
+        """
+        Constructor
+
+        :param cache: Optional SGLConfigCache object to reuse the parsed
+                      configuration files.
+        """
+        self.__cache = cache
+        self.__layers = []
+
+        self.__index = {}
+        self.__sources = {}
+        self.__categories = {}
+
+        self.__full_merges = 0
+        self.__partial_merges = 0
+
+    # Two depth mapping interface for the _OptionManager.
+    def __contains__(self, category):
+        return category in self.__categories
+
+    def __getitem__(self, category):
+        return self.__categories[category]
+
+    def __iter__(self):
+        return iter(self.__categories)
+
+    def __len__(self):
+        return len(self.__categories)
+
+    def get(self, category, default=None):
+        return self.__categories.get(category, default)
+
+    @property
+    def layers(self):
+        return [layer.name for layer in self.__layers]
+
+    @property
+    def stats(self):
+        return {'full': self.__full_merges, 'partial': self.__partial_merges}
+
+    def value(self, category, name, default=None):
+        """
+        Merged value of the variable.
+
+        :param category: Configuration's first depth category name.
+        :param name: Configuration's second depth variable name.
+        :param default: Default value if no layer has the variable.
+        :return: Value of the highest precedence layer.
+        """
+        return self.__index.get((category, name), default)
+
+    def source(self, category, name):
+        """
+        Provenance of the merged value.
+
+        :param category: Configuration's first depth category name.
+        :param name: Configuration's second depth variable name.
+        :return: (layer name, origin path) tuple or None. The origin path is
+                 None for the mapping layer.
+        """
+        return self.__sources.get((category, name))
+
+    def items(self):
+        """
+        Flat view of the merged values.
+
+        :return: Iterator of the ((category, name), value) pairs.
+        """
+        return self.__index.items()
+
+    def __find(self, name):
+        for index, layer in enumerate(self.__layers):
+            if layer.name == name:
+                return index
+
+        return None
+
+    def __set(self, key, value, source):
+        category, name = key
+
+        self.__index[key] = value
+        self.__sources[key] = source
+        self.__categories.setdefault(category, {})[name] = value
+
+    def __unset(self, key):
+        category, name = key
+
+        del self.__index[key]
+        del self.__sources[key]
+
+        variables = self.__categories[category]
+        del variables[name]
+
+        if not variables:
+            del self.__categories[category]
+
+    def __merge(self):
+        self.__index.clear()
+        self.__sources.clear()
+        self.__categories.clear()
+
+        for layer in self.__layers:
+            for key, (value, origin) in layer.values.items():
+                self.__set(key, value, (layer.name, origin))
+
+        self.__full_merges += 1
+
+    def __merge_keys(self, keys):
+        # Find the highest precedence layer of each key again.
+        for key in keys:
+            for layer in reversed(self.__layers):
+                if key in layer.values:
+                    value, origin = layer.values[key]
+                    self.__set(key, value, (layer.name, origin))
+                    break
+
+            else:
+                if key in self.__index:
+                    self.__unset(key)
+
+        self.__partial_merges += 1
+
+    def __push(self, layer, loaded=False):
+        if not loaded:
+            layer.load(self.__cache)
+
+        index = self.__find(layer.name)
+
+        if index is None:
+            self.__layers.append(layer)
+            self.__merge_keys(layer.values)
+
+        else:
+            # Replace the layer of the same name in its position.
+            previous = self.__layers[index]
+            self.__layers[index] = layer
+
+            self.__merge_keys(set(previous.values) | set(layer.values))
+
+        return self
+
+    def add_file(self, path, name=None, format=None):
+        """
+        Add the configuration file layer. The layer of the same name is
+        replaced in its position.
+
+        :param path: Configuration file path.
+        :param name: Layer name. If not specified it, use the path.
+        :param format: Format name. If not specified it, detect it.
+        :return: This stack.
+        """
+        if not path or not os.path.isfile(path):
+            raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
+
+        return self.__push(_Layer(name or path, _Layer.FILE, path,
+                                  format=format))
+
+    async def aadd_files(self, paths, format=None, executor=None):
+        """
+        Add the configuration file layers with the asyncio. The files are read
+        and decoded in the executor at the same time, and the layers are
+        stacked in the given order regardless of their loading order.
+
+        :param paths: Iterable of the paths or the (name, path) pairs.
+        :param format: Format name. If not specified it, detect it.
+        :param executor: Executor of the file I/O. If not specified it, use
+                         the event loop's default executor.
+        :return: This stack.
+        """
+        layers = []
+
+        for item in paths:
+            name, path = item if isinstance(item, tuple) else (item, item)
+
+            if not path or not os.path.isfile(path):
+                raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
+
+            layers.append(_Layer(name, _Layer.FILE, path, format=format))
+
+        await self.__load_all(layers, executor)
+
+        for layer in layers:
+            self.__push(layer, loaded=True)
+
+        return self
+
+    def add_directory(self, path, pattern='*', name=None, format=None):
+        """
+        Add the directory of the configuration fragments as a single layer.
+        The fragments are merged in the file name order.
+
+        :param path: Directory path.
+        :param pattern: File name pattern of the fragments.
+        :param name: Layer name. If not specified it, use the path.
+        :param format: Format name. If not specified it, detect it.
+        :return: This stack.
+        """
+        if not path or not os.path.isdir(path):
+            raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
+
+        return self.__push(_Layer(name or path, _Layer.DIRECTORY, path,
+                                  format=format, pattern=pattern))
+
+    def add_mapping(self, name, mapping):
+        """
+        Add the two depth dictionary layer.
+
+        :param name: Layer name.
+        :param mapping: Two depth dictionary of the categories and variables.
+        :return: This stack.
+        """
+        if not isinstance(mapping, dict):
+            raise SGLException(SGL_PARSER_INVALID_CONFIG)
+
+        return self.__push(_Layer(name, _Layer.MAPPING, mapping))
+
+    def remove(self, name):
+        """
+        Remove the layer.
+
+        :param name: Layer name.
+        """
+        index = self.__find(name)
+        if index is None:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Unknown layer {}.'.format(name))
+
+        layer = self.__layers.pop(index)
+
+        self.__merge_keys(layer.values)
+
+    def refresh(self, name=None):
+        """
+        Reload the changed file and directory layers, and merge only their
+        keys again.
+
+        :param name: Layer name to refresh. If not specified it, check all
+                     layers.
+        :return: Names of the reloaded layers.
+        """
+        reloaded = []
+
+        for layer in self.__layers:
+            if name is not None and layer.name != name:
+                continue
+
+            if layer.kind == _Layer.MAPPING and name is None:
+                continue
+
+            if layer.kind != _Layer.MAPPING \
+                    and layer.scan() == layer.signature:
+                continue
+
+            previous = layer.values
+            layer.load(self.__cache)
+
+            self.__merge_keys(set(previous) | set(layer.values))
+            reloaded.append(layer.name)
+
+        return reloaded
+
+    async def arefresh(self, name=None, executor=None):
+        """
+        Reload the changed file and directory layers with the asyncio. The
+        changed layers are loaded in the executor at the same time, and their
+        keys are merged again in the event loop.
+
+        :param name: Layer name to refresh. If not specified it, check all
+                     layers.
+        :param executor: Executor of the file I/O. If not specified it, use
+                         the event loop's default executor.
+        :return: Names of the reloaded layers.
+        """
+        changed = [
+            (layer, layer.values) for layer in self.__layers
+            if (name is None or layer.name == name)
+            and (name is not None if layer.kind == _Layer.MAPPING
+                 else layer.scan() != layer.signature)
+        ]
+
+        await self.__load_all([layer for layer, _ in changed], executor)
+
+        for layer, previous in changed:
+            self.__merge_keys(set(previous) | set(layer.values))
+
+        return [layer.name for layer, _ in changed]
+
+    async def __load_all(self, layers, executor):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, layer.load, self.__cache)
+            for layer in layers
+        ))
+
+    def rebuild(self):
+        """
+        Merge all layers again from the scratch.
+        """
+        self.__merge()
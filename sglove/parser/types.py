@@ -0,0 +1,327 @@
+import array
+
+from sglove.parser.config import _json_loads
+from sglove.parser.exception import *
+
+
+# ===========================
+# String manipulate functions
+# ===========================
+__true_candidates = frozenset(['on', 'yes', 'y', 'true', 't', '1'])
+__false_candidates = frozenset(['off', 'no', 'n', 'false', 'f', '0', 'none'])
+
+# Single lookup table of the boolean words.
+__bool_words = dict.fromkeys(__true_candidates, True)
+__bool_words.update(dict.fromkeys(__false_candidates, False))
+
+
+def _to_bool(value):
+    """
+    Change object to boolean value.
+    :param value: value to change boolean
+    :return: True/False
+    """
+    # 1. Check value is string and change string to boolean
+    if isinstance(value, str):
+        value = __bool_words.get(value.strip().lower())
+
+        if value is not None:
+            return value
+
+    # 2. Check
+    elif isinstance(value, bool) or value is None:
+        return bool(value)
+
+    raise SGLException(SGL_PARSER_ABNORMAL_BOOLEAN)
+
+
+def _to_str(string):
+    return str(string).strip() if string else ''
+
+
+def _converter(type):
+    """
+    Select the conversion function of the type once, so the callers don't
+    need to dispatch the type on every conversion.
+
+    :param type: Variable's type name
+    :return: Function to change a value to the type.
+    """
+    if type is str:
+        return _to_str
+
+    elif type is bool:
+        return _to_bool
+
+    elif type is list:
+        return SGLList()
+
+    elif type is set:
+        return SGLSet()
+
+    elif type is dict:
+        return SGLDict()
+
+    else:
+        return type
+
+
+# ===========================
+# Delimited string tokenizing
+# ===========================
+__CHUNK_SIZE = 1 << 16
+
+
+def _chunks(text, delimiter, chunk_size=__CHUNK_SIZE):
+    """
+    Split the delimited string chunk by chunk. Each chunk is cut at the
+    delimiter after the chunk size, so only the tokens of a chunk are alive
+    at once even if the string has the millions of tokens.
+
+    :param text: Delimited string.
+    :param delimiter: Delimiter string.
+    :param chunk_size: Minimum characters of a chunk.
+    :return: Iterator of the token lists. Empty tokens are dropped.
+    """
+    begin, size = 0, len(text)
+
+    while begin < size:
+        end = text.find(delimiter, begin + chunk_size) \
+            if begin + chunk_size < size else -1
+
+        if end < 0:
+            end = size
+
+        tokens = text[begin:end].split(delimiter)
+
+        yield [token for token in tokens if token] if '' in tokens \
+            else tokens
+
+        begin = end + len(delimiter)
+
+
+def _decode_text(text, structure):
+    # JSON form string is also accepted like the configuration file values.
+    # The other strings which start with the brackets, like the IPv6 host
+    # list '[::1]:80,[::2]:80', are tokenized by the delimiter.
+    head = text.lstrip()[:1]
+
+    if head and head in '[{':
+        try:
+            value = _json_loads(text)
+
+        except ValueError:
+            return None
+
+        if not isinstance(value, structure):
+            raise SGLException(SGL_PARSER_INVALID_VALUE,
+                               'Unexpected JSON value type.')
+
+        return value
+
+    return None
+
+
+# =========================
+# Multi-valued type classes
+# =========================
+class _SGLMultiType:
+    """
+    Base class of the multi-valued option types. The values are accepted as
+    the JSON array or object from the configuration file, the delimited or
+    JSON string from the environment and the repeated CLI arguments.
+    """
+    _STRUCTURE = list
+
+    def __init__(self, item=str, delimiter=','):
+        if not delimiter:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Delimiter should not be empty.')
+
+        self._item = item
+        self._delimiter = delimiter
+        self._convert = _converter(item)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__,
+                               ', '.join(repr(v) for v in self._key()))
+
+    def __reduce__(self):
+        return type(self), self._key()
+
+    def _key(self):
+        return self._item, self._delimiter
+
+    def _from_tokens(self, chunks):
+        raise NotImplementedError
+
+    def _from_values(self, values):
+        raise NotImplementedError
+
+    def __call__(self, value):
+        """
+        Change the raw value to the container.
+
+        :param value: JSON value, delimited string or None.
+        :return: Container of the converted items or None.
+        """
+        if value is None:
+            return None
+
+        if isinstance(value, str):
+            decoded = _decode_text(value, self._STRUCTURE)
+
+            if decoded is None:
+                return self._from_tokens(_chunks(value, self._delimiter))
+
+            value = decoded
+
+        elif not isinstance(value, self._STRUCTURE):
+            raise SGLException(SGL_PARSER_INVALID_VALUE,
+                               'Unexpected value type.')
+
+        return self._from_values(value)
+
+    def merge(self, current, value):
+        """
+        Merge the container of the repeated CLI argument.
+
+        :param current: Container of the previous arguments.
+        :param value: Container of the current argument.
+        :return: Merged container.
+        """
+        current.extend(value)
+
+        return current
+
+
+class SGLList(_SGLMultiType):
+    """
+    List option type. The integer and float items are stored in the compact
+    array.array instead of the list of the Python objects.
+    """
+    __ARRAY_CODES = {int: 'q', float: 'd'}
+
+    def __init__(self, item=str, delimiter=','):
+        """
+        Constructor
+
+        :param item: Item type name.
+        :param delimiter: Item delimiter of the string value.
+        """
+        super(SGLList, self).__init__(item, delimiter)
+
+        self.__code = self.__ARRAY_CODES.get(item)
+
+    def __new_container(self):
+        return array.array(self.__code) if self.__code else []
+
+    def _from_tokens(self, chunks):
+        values = self.__new_container()
+
+        for tokens in chunks:
+            values.extend(map(self._convert, tokens))
+
+        return values
+
+    def _from_values(self, values):
+        container = self.__new_container()
+        container.extend(map(self._convert, values))
+
+        return container
+
+
+class SGLSet(_SGLMultiType):
+    """
+    Set option type. The items are stored in the frozenset.
+    """
+    def __init__(self, item=str, delimiter=','):
+        """
+        Constructor
+
+        :param item: Item type name.
+        :param delimiter: Item delimiter of the string value.
+        """
+        super(SGLSet, self).__init__(item, delimiter)
+
+    def _from_tokens(self, chunks):
+        values = set()
+
+        for tokens in chunks:
+            values.update(map(self._convert, tokens))
+
+        return frozenset(values)
+
+    def _from_values(self, values):
+        return frozenset(map(self._convert, values))
+
+    def merge(self, current, value):
+        return current | value
+
+
+class SGLDict(_SGLMultiType):
+    """
+    Dictionary option type. The string value is the delimited 'key=value'
+    pairs like 'shard0=host0,shard1=host1'.
+    """
+    _STRUCTURE = dict
+
+    def __init__(self, value=str, key=str, delimiter=',', separator='='):
+        """
+        Constructor
+
+        :param value: Value type name.
+        :param key: Key type name.
+        :param delimiter: Pair delimiter of the string value.
+        :param separator: Key and value separator of the string value.
+        """
+        if not separator:
+            raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                               'Separator should not be empty.')
+
+        super(SGLDict, self).__init__(value, delimiter)
+
+        self.__key = key
+        self.__separator = separator
+        self.__convert_key = _converter(key)
+
+    def __reduce__(self):
+        return type(self), (self._item, self.__key, self._delimiter,
+                            self.__separator)
+
+    def _key(self):
+        return self._item, self.__key, self._delimiter, self.__separator
+
+    def _from_tokens(self, chunks):
+        values = {}
+        separator = self.__separator
+        convert_key, convert = self.__convert_key, self._convert
+
+        for tokens in chunks:
+            for token in tokens:
+                key, found, value = token.partition(separator)
+
+                if not found:
+                    raise SGLException(SGL_PARSER_INVALID_VALUE,
+                                       'No separator in {!r}.'.format(token))
+
+                values[convert_key(key)] = convert(value)
+
+        return values
+
+    def _from_values(self, values):
+        convert_key, convert = self.__convert_key, self._convert
+
+        return {convert_key(key): convert(value)
+                for key, value in values.items()}
+
+    def merge(self, current, value):
+        current.update(value)
+
+        return current
@@ -0,0 +1,182 @@
+import array
+import os
+
+from sglove.parser.exception import *
+
+# Declarative constraint keywords of the add_argument().
+_CONSTRAINT_KEYS = ('minimum', 'maximum', 'pattern', 'path', 'check')
+
+# Path constraint kinds and their checking functions.
+__PATH_CHECKS = {
+    'exists': os.path.exists,
+    'file': os.path.isfile,
+    'dir': os.path.isdir,
+}
+
+__MULTI_VALUES = (list, tuple, set, frozenset, array.array)
+
+
+# =============================
+# Compiled constraint functions
+# =============================
+def __minimum(bound):
+    def check(value):
+        if value < bound:
+            return 'should be greater than or equal to {!r}.'.format(bound)
+
+    return check
+
+
+def __maximum(bound):
+    def check(value):
+        if value > bound:
+            return 'should be less than or equal to {!r}.'.format(bound)
+
+    return check
+
+
+def __pattern(pattern):
+    import re
+
+    try:
+        regex = re.compile(pattern)
+
+    except re.error as err:
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Invalid pattern: {}'.format(err))
+
+    def check(value):
+        if not isinstance(value, str) or regex.fullmatch(value) is None:
+            return 'should match {!r}.'.format(regex.pattern)
+
+    return check
+
+
+def __path(kind):
+    exists = __PATH_CHECKS['exists' if kind is True else kind]
+
+    def check(value):
+        if not exists(value):
+            return 'should be the existing {}.'.format(
+                'path' if kind is True else kind
+            )
+
+    return check
+
+
+def __custom(func):
+    def check(value):
+        if not func(value):
+            return 'should pass the {}.'.format(
+                getattr(func, '__name__', repr(func))
+            )
+
+    return check
+
+
+def _split_constraints(kwargs):
+    """
+    Separate the constraint keywords from the add_argument() keywords.
+
+    :param kwargs: Keyword arguments of the add_argument().
+    :return: (argparse keywords, constraints) tuple. The constraints is None
+             if there is no constraint.
+    """
+    if not any(key in kwargs for key in _CONSTRAINT_KEYS):
+        return kwargs, None
+
+    kwargs = dict(kwargs)
+    constraints = {key: kwargs.pop(key) for key in _CONSTRAINT_KEYS
+                   if key in kwargs and kwargs[key] is not None}
+
+    return kwargs, constraints or None
+
+
+def _compile_constraints(constraints):
+    """
+    Compile the declarative constraints into the single validator. Each
+    constraint is checked in the _CONSTRAINT_KEYS order, and the items of
+    the multi-valued option are checked one by one.
+
+    :param constraints: Dictionary of the 'minimum', 'maximum', 'pattern',
+                        'path' ('exists', 'file', 'dir' or True) and 'check'
+                        (callable returns False for the bad value) keys.
+    :return: Validator which returns None or the violation message, or None
+             if there is no constraint.
+    """
+    if not constraints:
+        return None
+
+    builders = {'minimum': __minimum, 'maximum': __maximum,
+                'pattern': __pattern, 'path': __path, 'check': __custom}
+
+    unknown = set(constraints).difference(builders)
+    if unknown:
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Unknown constraints {}.'.format(sorted(unknown)))
+
+    if constraints.get('path', True) not in (True, *__PATH_CHECKS):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Unknown path constraint {!r}.'
+                           .format(constraints['path']))
+
+    if not callable(constraints.get('check', len)):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Check constraint should be callable.')
+
+    checks = tuple(builders[key](constraints[key])
+                   for key in _CONSTRAINT_KEYS if key in constraints)
+
+    def validate(value):
+        # Missing values are the matter of the 'required'.
+        if value is None:
+            return None
+
+        if isinstance(value, dict):
+            items = value.values()
+        elif isinstance(value, __MULTI_VALUES):
+            items = value
+        else:
+            items = (value,)
+
+        try:
+            for item in items:
+                for check in checks:
+                    message = check(item)
+
+                    if message is not None:
+                        return message
+
+        except TypeError as err:
+            return 'can not be checked: {}'.format(err)
+
+        return None
+
+    return validate
+
+
+def _compile_relation(check, dests, message=None):
+    """
+    Compile the cross-field constraint.
+
+    :param check: Function of the values of the dests which returns False for
+                  the bad combination.
+    :param dests: Destination names of the related options.
+    :param message: Optional violation message.
+    :return: Validator of the parsed dictionary which returns None or the
+             violation message.
+    """
+    if not callable(check):
+        raise SGLException(SGL_PARSER_INVALID_PARSING_ARG,
+                           'Check constraint should be callable.')
+
+    if message is None:
+        message = 'should pass the {}.'.format(
+            getattr(check, '__name__', repr(check))
+        )
+
+    def validate(opts):
+        return None if check(*[opts.get(dest) for dest in dests]) \
+            else message
+
+    return validate
@@ -0,0 +1,365 @@
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from sglove.parser.exception import *
+from sglove.parser.options import _FrozenOptions
+
+
+# ===============================
+# Configuration file change waits
+# ===============================
+class _PollingWaiter:
+    """
+    Portable waiter which compares the file status periodically.
+    """
+    def __init__(self, path, stop):
+        self.__path = path
+        self.__stop = stop
+        self.__status = self.__stat()
+
+    def __stat(self):
+        try:
+            stat = os.stat(self.__path)
+
+        except OSError:
+            return None
+
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def wait(self, timeout):
+        """
+        Wait the file change.
+
+        :param timeout: Seconds to wait.
+        :return: True if the file has been changed.
+        """
+        self.__stop.wait(timeout)
+
+        status = self.__stat()
+        changed, self.__status = status != self.__status, status
+
+        return changed
+
+    def close(self):
+        pass
+
+
+class _InotifyWaiter:
+    """
+    Linux waiter using the inotify. The parent directory is watched instead of
+    the file itself, because the editors and the deploy tools usually replace
+    the file by renaming the other one.
+    """
+    __IN_MODIFY = 0x00000002
+    __IN_CLOSE_WRITE = 0x00000008
+    __IN_MOVED_TO = 0x00000080
+    __IN_CREATE = 0x00000100
+    __IN_DELETE = 0x00000200
+    __IN_NONBLOCK = 0x00000800
+    __IN_CLOEXEC = 0x00080000
+
+    __EVENT = struct.Struct('iIII')
+
+    __libc = None
+
+    @classmethod
+    def available(cls):
+        if cls.__libc is None:
+            cls.__libc = False
+
+            if sys.platform.startswith('linux'):
+                import ctypes
+                import ctypes.util
+
+                try:
+                    libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                       use_errno=True)
+
+                    if hasattr(libc, 'inotify_init1'):
+                        cls.__libc = libc
+
+                except OSError:
+                    pass
+
+        return bool(cls.__libc)
+
+    def __init__(self, path, stop):
+        # The ctypes is already imported by the available().
+        import ctypes
+
+        libc = self.__libc
+
+        self.__name = os.fsencode(os.path.basename(path))
+        self.__fd = libc.inotify_init1(self.__IN_NONBLOCK | self.__IN_CLOEXEC)
+
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        mask = self.__IN_MODIFY | self.__IN_CLOSE_WRITE | self.__IN_MOVED_TO \
+            | self.__IN_CREATE | self.__IN_DELETE
+
+        directory = os.fsencode(os.path.dirname(os.path.abspath(path)))
+
+        if libc.inotify_add_watch(self.__fd, directory, mask) < 0:
+            os.close(self.__fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def __read(self):
+        changed = False
+
+        try:
+            buffer = os.read(self.__fd, 64 * 1024)
+
+        except BlockingIOError:
+            return False
+
+        pos = 0
+
+        while pos < len(buffer):
+            _, _, _, length = self.__EVENT.unpack_from(buffer, pos)
+            pos += self.__EVENT.size
+
+            name = buffer[pos:pos + length].rstrip(b'\0')
+            pos += length
+
+            changed = changed or name == self.__name
+
+        return changed
+
+    def wait(self, timeout):
+        """
+        Wait the file change.
+
+        :param timeout: Seconds to wait.
+        :return: True if the file has been changed.
+        """
+        deadline = time.monotonic() + timeout
+
+        # Events of the other files in the directory don't stop the waiting.
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+
+            readable, _, _ = select.select([self.__fd], [], [], remaining)
+
+            if not readable:
+                return False
+
+            if self.__read():
+                return True
+
+    def close(self):
+        os.close(self.__fd)
+
+
+# ===================================
+# Hot-reloading configuration watcher
+# ===================================
+def _items(options):
+    if isinstance(options, _FrozenOptions):
+        return zip(options._fields, options)
+
+    return vars(options).items()
+
+
+def _flatten(options):
+    """
+    Flatten the parsed namespace into the dotted name and value pairs.
+
+    :param options: Namespace or frozen options from the SGLParser.
+    :return: Dictionary of 'name' or 'group.name' keys.
+    """
+    from argparse import Namespace
+
+    flat = {}
+
+    for key, value in _items(options):
+        if isinstance(value, (Namespace, _FrozenOptions)):
+            flat.update({
+                '{}.{}'.format(key, name): sub
+                for name, sub in _items(value)
+            })
+
+        else:
+            flat[key] = value
+
+    return flat
+
+
+class SGLConfigWatcher:
+    """
+    Opt-in watcher which reloads the SGLParser's configuration file when it
+    is changed, and swaps the parsed options.
+
+    The options are never modified after they are published. The new options
+    are built in the watcher thread and replaced with the single reference
+    assignment, so the readers always see a consistent snapshot without any
+    lock. The watcher owns the parser after start(), so don't call the
+    parser's methods from the other threads.
+    """
+    def __init__(self, parser, args=None, interval=1.0, debounce=0.1,
+                 polling=False, frozen=False):
+        """
+        Constructor
+
+        :param parser: SGLParser object to reload and parse.
+        :param args: Arguments for the parse_args() of each reload.
+        :param interval: Seconds to check the stop request or, if the polling
+                         is used, to compare the file status.
+        :param debounce: Quiet seconds to wait after the last change. Bursts
+                         of writes make only a single reload.
+        :param polling: Use the polling even if the inotify is available.
+        :param frozen: Publish the frozen options from the parse_frozen()
+                       instead of the namespace.
+        """
+        if not parser.config_path:
+            raise SGLException(SGL_PARSER_CONFIG_NOT_EXIST)
+
+        self.__parser = parser
+        self.__args = list(args) if args is not None else []
+        self.__interval = interval
+        self.__debounce = debounce
+        self.__polling = polling or not _InotifyWaiter.available()
+        self.__parse = parser.parse_frozen if frozen else parser.parse_args
+
+        self.__options = self.__parse(self.__args)
+        self.__flat = _flatten(self.__options)
+        self.__generation = 0
+        self.__error = None
+
+        self.__callbacks = []
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    @property
+    def options(self):
+        return self.__options
+
+    @property
+    def generation(self):
+        return self.__generation
+
+    @property
+    def last_error(self):
+        return self.__error
+
+    @property
+    def is_polling(self):
+        return self.__polling
+
+    def subscribe(self, callback):
+        """
+        Register the callback of the changes. The callback is called with the
+        changed {key: (old, new)} dictionary and the new options, and only if
+        there is a changed key.
+
+        :param callback: Callable object.
+        """
+        # Copy-on-write to iterate callbacks without any lock.
+        self.__callbacks = self.__callbacks + [callback]
+
+    def reload(self):
+        """
+        Reload the configuration file and publish the new options.
+
+        :return: Changed {key: (old, new)} dictionary.
+        """
+        try:
+            self.__parser.reload()
+            options = self.__parse(self.__args)
+
+        except (Exception, SystemExit) as err:
+            # Keep the current options if the file is broken or removed, or
+            # has the bad value. The argparse exits on the missing required
+            # value, and it should not stop the watcher thread either.
+            self.__error = err
+            return {}
+
+        flat = _flatten(options)
+        changes = {
+            key: (self.__flat.get(key), value)
+            for key, value in flat.items()
+            if key not in self.__flat or self.__flat[key] != value
+        }
+
+        self.__flat = flat
+        self.__options = options
+        self.__generation += 1
+        self.__error = None
+
+        if changes:
+            for callback in self.__callbacks:
+                try:
+                    callback(changes, options)
+
+                except Exception as err:
+                    self.__error = err
+
+        return changes
+
+    def __run(self, waiter):
+        try:
+            while not self.__stop.is_set():
+                if not waiter.wait(self.__interval):
+                    continue
+
+                # Wait until the writes are settled down.
+                while not self.__stop.is_set() \
+                        and waiter.wait(self.__debounce):
+                    pass
+
+                if not self.__stop.is_set():
+                    self.reload()
+
+        finally:
+            waiter.close()
+
+    def start(self):
+        """
+        Start the watcher thread. If the inotify can't watch the file, the
+        polling is used instead.
+        """
+        if self.__thread is not None:
+            return
+
+        path = self.__parser.config_path
+
+        waiter = None
+
+        if not self.__polling:
+            try:
+                waiter = _InotifyWaiter(path, self.__stop)
+
+            except OSError:
+                # The inotify instances or watches are limited per user,
+                # and the containers often run out of them.
+                self.__polling = True
+
+        if waiter is None:
+            waiter = _PollingWaiter(path, self.__stop)
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, args=(waiter,),
+                                         name='SGLConfigWatcher', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop the watcher thread and wait its termination.
+        """
+        if self.__thread is None:
+            return
+
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
@@ -6,3 +6,23 @@ class classproperty(object):
 
     def __get__(self, instance, owner):
         return self.getter(owner)
+
+
+class lazy_regex(object):
+    """
+    Regular expression which is compiled at its first use. The re module is
+    also imported at that time, so the module level and the class level
+    patterns cost nothing at the import. After the compile, the attributes of
+    the compiled pattern are cached in this object.
+    """
+    def __init__(self, pattern, flags=0):
+        self.__pattern = pattern
+        self.__flags = flags
+
+    def __getattr__(self, name):
+        import re
+
+        value = getattr(re.compile(self.__pattern, self.__flags), name)
+        setattr(self, name, value)
+
+        return value
@@ -0,0 +1,63 @@
+import re
+import unittest
+
+from sglove.exception import SGLException, __ErrorCode
+
+TEST_ERROR = __ErrorCode(0, 'Test error.')
+
+
+class _Raiser:
+    def raise_error(self, desc=None):
+        raise SGLException(TEST_ERROR, desc)
+
+
+class TestSGLException(unittest.TestCase):
+    # Module name depends on the test runner's top level directory.
+    __REGEX_CALLER = re.compile(
+        r'^Test error\. (?:detail )?\({}\._Raiser\.raise_error:L#\d+\)$'
+        .format(re.escape(_Raiser.__module__))
+    )
+
+    def setUp(self):
+        self.__mode = SGLException.set_caller_info(
+            SGLException.CALLER_INFO_LAZY
+        )
+
+    def tearDown(self):
+        SGLException.set_caller_info(self.__mode)
+
+    def __raise(self, desc=None):
+        with self.assertRaises(SGLException) as err:
+            _Raiser().raise_error(desc)
+
+        self.assertEqual(err.exception.code, TEST_ERROR)
+
+        return err.exception
+
+    def test_caller_info(self):
+        for mode in [SGLException.CALLER_INFO_LAZY,
+                     SGLException.CALLER_INFO_EAGER]:
+            SGLException.set_caller_info(mode)
+
+            self.assertRegex(str(self.__raise()), self.__REGEX_CALLER)
+            self.assertRegex(str(self.__raise('detail')), self.__REGEX_CALLER)
+
+            # Message is built only once.
+            err = self.__raise()
+            self.assertIs(err.message, err.message)
+            self.assertIn(err.message, repr(err))
+
+            # Message is the only argument.
+            err = self.__raise('detail')
+            self.assertEqual(err.args, (err.message,))
+
+    def test_caller_info_off(self):
+        SGLException.set_caller_info(SGLException.CALLER_INFO_OFF)
+
+        self.assertEqual(str(self.__raise()), 'Test error.')
+        self.assertEqual(str(self.__raise('detail')), 'Test error. detail')
+        self.assertEqual(self.__raise().args, ('Test error.',))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            SGLException.set_caller_info('unknown')
@@ -1,5 +1,6 @@
 import random
 import string
+import sys
 import unittest
 
 
@@ -87,6 +88,14 @@ class ParserTestItem:
 class ParserTestCase(unittest.TestCase):
     _APP_NAME = 'TEST'
 
+    def setUp(self):
+        # Parsers scan the sys.argv at the construction, so the arguments of
+        # the test runner are hidden during each test.
+        self._argv = sys.argv
+        sys.argv = [self._argv[0]]
+
+        self.addCleanup(setattr, sys, 'argv', self._argv)
+
     @staticmethod
     def __gen_random_case(use_uval=False):
         # 1. String Options
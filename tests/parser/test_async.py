@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLConfigStack, SGLParser, _OptionManager
+
+
+class TestAsyncLoading(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def __gen_random_configs(self):
+        return {
+            category: {name: value.f_val for name, value in values.items()}
+            for category, values in self._gen_random_inputs(self.__TEST_COUNT)
+                                        .items()
+        }
+
+    @staticmethod
+    def __define(parser, configs):
+        for category, variables in configs.items():
+            group = parser.add_argument_group(category)
+
+            for name in variables:
+                group.add_argument(name)
+
+        return parser
+
+    def test_aload(self):
+        configs = self.__gen_random_configs()
+
+        with utils.config_file(configs) as temp_file:
+            manager = _OptionManager(self._APP_NAME)
+
+            asyncio.run(manager.aload(temp_file))
+
+            for category, variables in configs.items():
+                for name, value in variables.items():
+                    self.assertEqual(manager.default_value(
+                        category, name, type=type(value)
+                    ), value)
+
+            with self.assertRaises(SGLException) as err:
+                asyncio.run(manager.aload(utils.get_temp_file()))
+
+            self.assertEqual(err.exception.code, SGL_PARSER_CONFIG_NOT_EXIST)
+
+    def test_create(self):
+        configs = self.__gen_random_configs()
+
+        with utils.config_file(configs) as temp_file:
+            expected = self.__define(SGLParser(self._APP_NAME, temp_file),
+                                     configs).parse_args([])
+
+            async def create():
+                with ThreadPoolExecutor(2) as executor:
+                    return await SGLParser.create(self._APP_NAME, temp_file,
+                                                  executor=executor)
+
+            parser = self.__define(asyncio.run(create()), configs)
+
+            self.assertEqual(parser.config_path, temp_file)
+            self.assertEqual(parser.parse_args([]), expected)
+
+    def test_stack(self):
+        layers = [self.__gen_random_configs() for _ in range(4)]
+        files = [utils.config_file(configs) for configs in layers]
+
+        try:
+            names = ['layer{}'.format(i) for i in range(len(files) - 1)]
+
+            expected = SGLConfigStack()
+            for name, temp in zip(names, files):
+                expected.add_file(temp.path, name=name)
+
+            async def create():
+                stack = SGLConfigStack()
+
+                await stack.aadd_files([(name, temp.path) for name, temp
+                                        in zip(names, files)])
+
+                return await SGLParser.create(self._APP_NAME, files[-1].path,
+                                              stack=stack)
+
+            parser = asyncio.run(create())
+            expected.add_file(files[-1].path, name='config')
+
+            # Layers are stacked in the given order.
+            self.assertEqual(parser.stack.layers, names + ['config'])
+            self.assertEqual(dict(parser.stack.items()),
+                             dict(expected.items()))
+
+            # Only the changed layer is reloaded.
+            with open(files[0].path, 'w') as f_out:
+                json.dump({'added': {'name': 'value'}}, f_out)
+
+            stat = os.stat(files[0].path)
+            os.utime(files[0].path,
+                     ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            self.assertEqual(asyncio.run(parser.stack.arefresh()),
+                             [names[0]])
+            self.assertEqual(parser.stack.value('added', 'name'), 'value')
+
+        finally:
+            for temp in files:
+                temp.unlink()
+
+    def test_areload(self):
+        with utils.config_file({'group': {'name': 'first'}}) as temp_file:
+            parser = SGLParser(self._APP_NAME, temp_file)
+            parser.add_argument_group('group').add_argument('name')
+
+            self.assertEqual(parser.parse_args([]).group.name, 'first')
+
+            with open(temp_file, 'w') as f_out:
+                json.dump({'group': {'name': 'second'}}, f_out)
+
+            asyncio.run(parser.areload())
+
+            self.assertEqual(parser.parse_args([]).group.name, 'second')
@@ -0,0 +1,167 @@
+import contextlib
+import io
+import os
+import warnings
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, SGLUnknownEnvWarning, _scan_command
+
+_built_commands = []
+
+
+def _build_deploy(command):
+    _built_commands.append(command.name)
+
+    command.add_argument('target', default='local')
+    command.add_argument('force', default=False, type=bool)
+    command.add_argument('retry', default=1, type=int)
+
+
+class TestSGLCommand(ParserTestCase):
+    __COMMAND_COUNT = 20
+
+    def setUp(self):
+        super(TestSGLCommand, self).setUp()
+
+        self.__built = []
+
+    def __builder(self, name):
+        def build(command):
+            self.__built.append(command.name)
+
+            command.add_argument('value', default=name)
+            command.add_argument('count', default=0, type=int)
+
+        return build
+
+    def __build(self, path=None):
+        parser = SGLParser(self._APP_NAME, path)
+        parser.add_argument_group('group').add_argument('name', default='g')
+
+        names = ['command{}'.format(i) for i in range(self.__COMMAND_COUNT)]
+        for name in names:
+            parser.add_subcommand(name, self.__builder(name), desc=name)
+
+        return parser, names
+
+    def test_scan_command(self):
+        for args, expected in [
+            ([], (None, False)),
+            (['run'], ('run', False)),
+            (['--group-name', 'run', 'deploy'], ('deploy', False)),
+            (['--group-name=run', 'deploy'], ('deploy', False)),
+            (['-c', 'path', 'deploy', '-h'], ('deploy', False)),
+            (['-cpath', 'deploy'], ('deploy', False)),
+            (['--help'], (None, True)),
+            (['-h', '--', 'deploy'], ('deploy', True)),
+        ]:
+            self.assertEqual(_scan_command(args), expected)
+
+    def test_lazy(self):
+        parser, names = self.__build()
+
+        # 1. No subcommand
+        values = parser.parse_args(['--group-name', 'command1'])
+
+        self.assertIsNone(values.command)
+        self.assertEqual(values.group.name, 'command1')
+        self.assertEqual(self.__built, [])
+
+        # 2. Only the selected subcommand is built.
+        values = parser.parse_args(['command3', '--command3-count', '3'])
+
+        self.assertEqual(values.command, 'command3')
+        self.assertEqual(values.command3.value, 'command3')
+        self.assertEqual(values.command3.count, 3)
+        self.assertFalse(hasattr(values, 'command4'))
+        self.assertEqual(self.__built, ['command3'])
+
+        # 3. The built subcommand is reused.
+        values = parser.parse_args(['command5'])
+        self.assertEqual(values.command5.count, 0)
+
+        values = parser.parse_args(['command3'])
+        self.assertEqual(values.command3.count, 0)
+
+        self.assertEqual(self.__built, ['command3', 'command5'])
+
+    def test_defaults(self):
+        env = '{}_COMMAND1_COUNT'.format(self._APP_NAME.upper())
+
+        with utils.config_file({'command1': {'value': 'file'}}) as temp_file:
+            os.environ[env] = '10'
+
+            try:
+                parser, _ = self.__build(temp_file)
+
+                # Subcommand's environment is not the unknown one.
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error', SGLUnknownEnvWarning)
+
+                    values = parser.parse_args(['command1']).command1
+
+            finally:
+                del os.environ[env]
+
+        self.assertEqual((values.value, values.count), ('file', 10))
+
+    def test_help(self):
+        parser, names = self.__build()
+
+        for args in [['--help'], ['unknown']]:
+            out = io.StringIO()
+
+            with self.assertRaises(SystemExit), \
+                    contextlib.redirect_stdout(out), \
+                    contextlib.redirect_stderr(out):
+                parser.parse_args(args)
+
+            for name in names:
+                self.assertIn(name, out.getvalue())
+
+        # Listing doesn't build the subcommands.
+        self.assertEqual(self.__built, [])
+
+    def test_frozen(self):
+        parser, _ = self.__build()
+
+        frozen = parser.parse_frozen(['command2', '--command2-count', '2'])
+
+        self.assertEqual(frozen.command, 'command2')
+        self.assertEqual(frozen.command2.count, 2)
+        self.assertEqual(frozen.group.name, 'g')
+
+        self.assertIsNone(parser.parse_frozen([]).command)
+
+    def test_snapshot(self):
+        parser = SGLParser(self._APP_NAME)
+        parser.add_subcommand('deploy', _build_deploy)
+
+        restored = SGLParser.restore(parser.snapshot())
+        values = restored.parse_args(['deploy', '--deploy-force', 'yes'])
+
+        self.assertEqual((values.deploy.target, values.deploy.force,
+                          values.deploy.retry), ('local', True, 1))
+        self.assertEqual(_built_commands, ['deploy'])
+
+    def test_invalid(self):
+        parser, names = self.__build()
+
+        for name in [names[0], 'group', 'command']:
+            with self.assertRaises(SGLException) as err:
+                parser.add_subcommand(name, self.__builder(name))
+
+            self.assertEqual(err.exception.code, SGL_PARSER_DUPLICATED_NAME)
+
+        with self.assertRaises(SGLException) as err:
+            parser.add_subcommand('invalid', None)
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_PARSING_ARG)
+
+        with self.assertRaises(SGLException) as err:
+            parser.add_subcommand('in valid', self.__builder('in valid'))
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_NAME_FORMAT)
@@ -0,0 +1,381 @@
+import configparser
+import io
+import json
+import os
+import random
+import shutil
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser
+from sglove.parser.config import SGLConfigCache, register_config_format, \
+    _LazyJSONConfig, _detect_format, _open_config
+
+try:
+    import msgpack
+
+except ImportError:
+    msgpack = None
+
+try:
+    import yaml
+
+except ImportError:
+    yaml = None
+
+
+class TestLazyJSONConfig(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def __gen_random_configs(self):
+        configs = {
+            category: {name: value.f_val for name, value in values.items()}
+            for category, values in self._gen_random_inputs(self.__TEST_COUNT)
+                                        .items()
+        }
+
+        # Nested values, escaped strings and scalar categories
+        configs[self._gen_random_name()] = {
+            'nested': {'list': [1, [2, {'3': '}]'}], '{'], 'dict': {}},
+            'escaped': 'quote " back slash \\ brace } [ unicode é',
+        }
+        configs[self._gen_random_name()] = {'a': 'close } brace', 'b': '}'}
+        configs[self._gen_random_name()] = 'scalar " value }'
+        configs[self._gen_random_name()] = [1, 2, {'a': [3]}]
+        configs[self._gen_random_name()] = None
+
+        return configs
+
+    def test_normal(self):
+        configs = self.__gen_random_configs()
+
+        for indent in [None, 0, 4]:
+            with utils.config_file(configs) as temp_file:
+                with open(temp_file, 'w') as f_out:
+                    json.dump(configs, f_out, indent=indent)
+
+                loaded = _LazyJSONConfig(temp_file)
+
+                self.assertEqual(set(loaded), set(configs))
+                self.assertEqual(len(loaded), len(configs))
+
+                # Access categories in the random order.
+                categories = list(configs)
+                random.shuffle(categories)
+
+                for category in categories:
+                    self.assertIn(category, loaded)
+                    self.assertEqual(loaded[category], configs[category])
+                    self.assertEqual(loaded.get(category), configs[category])
+
+                self.assertNotIn(self._gen_random_string(), loaded)
+                self.assertIsNone(loaded.get(self._gen_random_string()))
+
+    def test_duplicated_category(self):
+        with utils.config_file({}) as temp_file:
+            with open(temp_file, 'w') as f_out:
+                f_out.write('{"a": {"b": 1}, "c": {}, "a": {"b": 2}}')
+
+            self.assertEqual(_LazyJSONConfig(temp_file)['a'], {'b': 2})
+
+    def test_big_integer(self):
+        configs = {'group': {'ident': 2 ** 64 + 1, 'negative': -2 ** 63 - 1,
+                             'list': [2 ** 70], 'small': 2 ** 63}}
+
+        with utils.config_file(configs) as temp_file:
+            loaded = _LazyJSONConfig(temp_file)
+
+            self.assertEqual(loaded['group'], configs['group'])
+            self.assertIsInstance(loaded['group']['ident'], int)
+
+        with utils.config_file(configs) as temp_file:
+            parser = SGLParser(self._APP_NAME, default_config=temp_file)
+            group = parser.add_argument_group('group')
+
+            group.add_argument('ident', default=0, type=int)
+            group.add_argument('negative', default='', type=str)
+
+            values = parser.parse_args([]).group
+
+            self.assertEqual(values.ident, 2 ** 64 + 1)
+            self.assertEqual(values.negative, str(-2 ** 63 - 1))
+
+    def test_rewritten_file(self):
+        configs = {'c{}'.format(i): {'value': i} for i in range(50)}
+
+        with utils.config_file(configs) as temp_file:
+            loaded = _LazyJSONConfig(temp_file)
+            self.assertEqual(loaded['c0'], {'value': 0})
+
+            # The in place rewrite doesn't change the loaded categories.
+            with open(temp_file, 'w') as f_out:
+                f_out.write('{}')
+
+            self.assertEqual(loaded['c40'], {'value': 40})
+
+    def test_invalid_config(self):
+        test_case = ['', '[]', '{', '{"a": {"b": 1}', '{"a" {}}',
+                     '{"a": {}} {}', '{"a": {"b": }}', '{"a": [1, 2}']
+
+        for case in test_case:
+            with utils.config_file({}) as temp_file:
+                with open(temp_file, 'w') as f_out:
+                    f_out.write(case)
+
+                with self.assertRaises(SGLException) as err:
+                    loaded = _LazyJSONConfig(temp_file)
+                    loaded.get('a')
+
+                self.assertEqual(err.exception.code, SGL_PARSER_INVALID_CONFIG)
+
+
+class TestSGLConfigCache(ParserTestCase):
+    __TEST_COUNT = 20
+
+    def setUp(self):
+        self.__directory = utils.get_temp_file(self._gen_random_name())
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory, ignore_errors=True)
+
+    def __gen_random_configs(self):
+        return {
+            category: {name: value.f_val for name, value in values.items()}
+            for category, values in self._gen_random_inputs(self.__TEST_COUNT)
+                                        .items()
+        }
+
+    def __check(self, cache, path, configs, hits, misses):
+        loaded = cache.load(path)
+
+        self.assertEqual({c: loaded[c] for c in loaded}, configs)
+        self.assertEqual(cache.stats, {'hits': hits, 'misses': misses})
+
+    def test_normal(self):
+        configs = self.__gen_random_configs()
+        cache = SGLConfigCache(self.__directory)
+
+        with utils.config_file(configs) as temp_file:
+            # 1. First loading builds the cache entry.
+            self.__check(cache, temp_file, configs, 0, 1)
+            self.assertTrue(os.path.exists(cache.entry_path(temp_file)))
+
+            # 2. Reuse the entry in the same and the other cache objects.
+            self.__check(cache, temp_file, configs, 1, 1)
+            self.__check(SGLConfigCache(self.__directory),
+                         temp_file, configs, 1, 0)
+
+            # 3. Touched but not modified file reuses the entry.
+            stat = os.stat(temp_file)
+            os.utime(temp_file, ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 10 ** 9))
+
+            self.__check(cache, temp_file, configs, 2, 1)
+            self.__check(cache, temp_file, configs, 3, 1)
+
+            # 4. Modified file invalidates the entry.
+            configs = self.__gen_random_configs()
+
+            with open(temp_file, 'w') as f_out:
+                json.dump(configs, f_out)
+
+            self.__check(cache, temp_file, configs, 3, 2)
+            self.__check(cache, temp_file, configs, 4, 2)
+
+    def test_broken_entry(self):
+        configs = self.__gen_random_configs()
+        cache = SGLConfigCache(self.__directory)
+
+        with utils.config_file(configs) as temp_file:
+            self.__check(cache, temp_file, configs, 0, 1)
+
+            with open(cache.entry_path(temp_file), 'wb') as f_out:
+                f_out.write(b'broken entry')
+
+            self.__check(cache, temp_file, configs, 0, 2)
+            self.__check(cache, temp_file, configs, 1, 2)
+
+    def test_default_directory(self):
+        saved = os.environ.get('XDG_CACHE_HOME')
+
+        try:
+            os.environ['XDG_CACHE_HOME'] = self.__directory
+
+            self.assertEqual(SGLConfigCache().directory,
+                             os.path.join(self.__directory, 'sglove'))
+
+        finally:
+            if saved is None:
+                del os.environ['XDG_CACHE_HOME']
+            else:
+                os.environ['XDG_CACHE_HOME'] = saved
+
+
+class TestConfigFormat(ParserTestCase):
+    __TEST_COUNT = 20
+
+    def setUp(self):
+        self.__paths = []
+
+    def tearDown(self):
+        for path in self.__paths:
+            os.unlink(path)
+
+    def __gen_random_configs(self):
+        return {
+            category: {name: value.f_val for name, value in values.items()}
+            for category, values in self._gen_random_inputs(self.__TEST_COUNT)
+                                        .items()
+        }
+
+    @staticmethod
+    def __dump_toml(configs):
+        def _value(value):
+            if isinstance(value, bool):
+                return 'true' if value else 'false'
+
+            return json.dumps(value)
+
+        return '\n'.join(
+            '[{}]\n{}\n'.format(category, '\n'.join(
+                '{} = {}'.format(name, _value(value))
+                for name, value in values.items()
+            ))
+            for category, values in configs.items()
+        ).encode()
+
+    @staticmethod
+    def __dump_ini(configs):
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.optionxform = str
+        parser.read_dict(configs)
+
+        buffer = io.StringIO()
+        parser.write(buffer)
+
+        return buffer.getvalue().encode()
+
+    def __writers(self):
+        writers = {
+            'json': ('.json', lambda c: json.dumps(c).encode(), None),
+            'toml': ('.toml', self.__dump_toml, None),
+            'ini': ('.ini', self.__dump_ini, str),
+        }
+
+        if msgpack:
+            writers['msgpack'] = ('.msgpack', msgpack.packb, None)
+
+        if yaml:
+            writers['yaml'] = ('.yaml',
+                               lambda c: b'---\n' + yaml.safe_dump(c).encode(),
+                               None)
+
+        return writers
+
+    def __write(self, extension, data):
+        path = utils.get_temp_file(ext=extension.lstrip('.'))
+        self.__paths.append(path)
+
+        with open(path, 'wb') as f_out:
+            f_out.write(data)
+
+        return path
+
+    def __check(self, loaded, configs, type):
+        self.assertEqual(set(loaded), set(configs))
+
+        for category, values in configs.items():
+            expected = values if type is None else {
+                name: type(value) for name, value in values.items()
+            }
+
+            self.assertEqual(loaded[category], expected)
+
+    def test_normal(self):
+        configs = self.__gen_random_configs()
+
+        for format, (extension, dump, type) in self.__writers().items():
+            path = self.__write(extension, dump(configs))
+
+            # 1. Detect the format from the extension.
+            self.assertEqual(_detect_format(path), format)
+            self.__check(_open_config(path), configs, type)
+
+            # 2. Specify the format explicitly.
+            self.__check(_open_config(path, format), configs, type)
+
+    def test_magic(self):
+        configs = self.__gen_random_configs()
+
+        for format, (extension, dump, type) in self.__writers().items():
+            path = self.__write('.conf-unknown', dump(configs))
+
+            # TOML and INI don't have the magic bytes.
+            if format in ('toml', 'ini'):
+                continue
+
+            self.assertEqual(_detect_format(path), format)
+            self.__check(_open_config(path), configs, type)
+
+    def test_ambiguous_extension(self):
+        configs = self.__gen_random_configs()
+
+        # JSON files of the generic names are still the JSON.
+        for extension in ['.conf', '.cfg', '.CONF']:
+            path = self.__write(extension, json.dumps(configs).encode())
+
+            self.assertEqual(_detect_format(path), 'json')
+            self.__check(_open_config(path), configs, None)
+
+        for extension in ['.conf', '.cfg']:
+            path = self.__write(extension, self.__dump_ini(configs))
+
+            self.assertEqual(_detect_format(path), 'ini')
+            self.__check(_open_config(path), configs, str)
+
+    def test_cache(self):
+        configs = self.__gen_random_configs()
+        directory = utils.get_temp_file(self._gen_random_name())
+
+        try:
+            for _, (extension, dump, type) in self.__writers().items():
+                path = self.__write(extension, dump(configs))
+                cache = SGLConfigCache(directory)
+
+                self.__check(cache.load(path), configs, type)
+                self.__check(cache.load(path), configs, type)
+
+                self.assertEqual(cache.stats, {'hits': 1, 'misses': 1})
+
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_register(self):
+        configs = self.__gen_random_configs()
+        path = self.__write('.custom', json.dumps(configs).encode())
+
+        register_config_format('custom', lambda p: configs, ['.custom'])
+
+        self.assertEqual(_detect_format(path), 'custom')
+        self.assertIs(_open_config(path), configs)
+
+    def test_invalid_config(self):
+        for extension, data in [('.toml', b'[a\nb = '), ('.ini', b'a = 1'),
+                                ('.yaml', b'- 1\n- 2\n'),
+                                ('.yaml', b'a: [1, 2')]:
+            if extension == '.yaml' and not yaml:
+                continue
+
+            path = self.__write(extension, data)
+
+            with self.assertRaises(SGLException) as err:
+                _open_config(path)
+
+            self.assertEqual(err.exception.code, SGL_PARSER_INVALID_CONFIG)
+
+        with self.assertRaises(SGLException) as err:
+            _open_config(self.__write('.json', b'{}'), 'unknown')
+
+        self.assertEqual(err.exception.code, SGL_PARSER_UNSUPPORTED_FORMAT)
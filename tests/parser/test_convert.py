@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import convert_batch, _converter, _numpy
+
+
+class TestConvertBatch(ParserTestCase):
+    __TEST_COUNT = 500
+
+    def __gen_random_values(self):
+        return {
+            str: [self._gen_random_string() for _ in range(self.__TEST_COUNT)],
+            int: [str(random.randint(-999, 999))
+                  for _ in range(self.__TEST_COUNT)],
+            float: [str(random.uniform(-999, 999))
+                    for _ in range(self.__TEST_COUNT)],
+            bool: [random.choice([' On', 'yes', 'Y', 'TRUE', 't', '1', 'off',
+                                  'No', 'n', 'False ', 'f', '0', 'none'])
+                   for _ in range(self.__TEST_COUNT)],
+        }
+
+    @staticmethod
+    def __inject_errors(values):
+        invalid = {
+            index: 'invalid value'
+            for index in random.sample(range(len(values)), len(values) // 10)
+        }
+
+        values = list(values)
+
+        for index, value in invalid.items():
+            values[index] = value
+
+        return values, invalid
+
+    def test_normal(self):
+        for type, values in self.__gen_random_values().items():
+            result = convert_batch(values, type)
+
+            self.assertEqual(result.values,
+                             [_converter(type)(v) for v in values])
+            self.assertEqual(result.errors, {})
+
+    def test_errors(self):
+        for type, values in self.__gen_random_values().items():
+            if type is str:
+                continue
+
+            values, invalid = self.__inject_errors(values)
+
+            result = convert_batch(values, type)
+
+            # Bad values are reported per index and the others are converted.
+            self.assertEqual(set(result.errors), set(invalid))
+
+            for index, value in enumerate(values):
+                if index in invalid:
+                    self.assertIsNone(result.values[index])
+                else:
+                    self.assertEqual(result.values[index],
+                                     _converter(type)(value))
+
+        result = convert_batch(['yes', 'maybe'], bool)
+
+        self.assertEqual(result.errors[1].code, SGL_PARSER_ABNORMAL_BOOLEAN)
+
+    @unittest.skipUnless(_numpy(), 'NumPy is not installed.')
+    def test_numpy(self):
+        np = _numpy()
+
+        for type, values in self.__gen_random_values().items():
+            # 1. Vectorized conversion
+            result = convert_batch(np.array(values), type)
+
+            self.assertIsInstance(result.values, np.ndarray)
+            self.assertEqual(result.values.tolist(),
+                             [_converter(type)(v) for v in values])
+            self.assertEqual(result.errors, {})
+
+            if type is str:
+                continue
+
+            # 2. Bad values are reported per index.
+            values, invalid = self.__inject_errors(values)
+
+            result = convert_batch(np.array(values), type)
+
+            self.assertEqual(set(result.errors), set(invalid))
+
+            for index in invalid:
+                self.assertIsNone(result.values[index])
+
+        # 3. Numeric array to the other numeric type
+        result = convert_batch(np.array([1.9, -1.9, 0.0]), int)
+
+        self.assertEqual(result.values.tolist(), [1, -1, 0])
+        self.assertEqual(set(convert_batch(np.array([1.0, np.nan]), int)
+                             .errors), {1})
+
+        # 4. Values out of the int64 range are not wrapped.
+        for values in [np.array([1, 2 ** 63 + 5], dtype=np.uint64),
+                       np.array([1.0, 1e20, -1e20])]:
+            result = convert_batch(values, int)
+
+            self.assertEqual(result.values.tolist(),
+                             [int(v) for v in values.tolist()])
+            self.assertEqual(result.errors, {})
+
+        self.assertEqual(convert_batch(np.array([1, 2], dtype=np.uint64),
+                                       int).values.dtype, np.int64)
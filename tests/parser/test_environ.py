@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLDict, SGLList, SGLParser, SGLSet
+
+
+class TestExportEnviron(ParserTestCase):
+    def setUp(self):
+        super(TestExportEnviron, self).setUp()
+
+        self.__environ = dict(os.environ)
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.__environ)
+
+    def __build(self, config):
+        parser = SGLParser(self._APP_NAME, default_config=config)
+        parser.add_argument('verbose', type=bool)
+        parser.add_argument('name', default='app')
+
+        group = parser.add_argument_group('group')
+        group.add_argument('count', default=1, type=int)
+        group.add_argument('ratio', default=0.5, type=float)
+        group.add_argument('ports', default='80', type=SGLList(int))
+        group.add_argument('tags', type=SGLSet())
+        group.add_argument('shards', type=SGLDict(int))
+        group.add_argument('empty', type=SGLList())
+
+        return parser
+
+    def __values(self, parser):
+        values = parser.parse_args([])
+        group = values.group
+
+        return (values.verbose, values.name, group.count, group.ratio,
+                group.ports.tolist(), group.tags, group.shards, group.empty)
+
+    def test_export(self):
+        prefix = self._APP_NAME.upper()
+
+        with utils.config_file({'group': {'count': 10,
+                                          'tags': ['a', 'b c']}}) as path:
+            parent = self.__build(path)
+            args = ['--core-verbose', 'yes', '--group-shards', 'x=1,y=2',
+                    '--core-name', "it's"]
+
+            os.environ['{}_GROUP_RATIO'.format(prefix)] = '2.5'
+            expected = (True, "it's", 10, 2.5, [80], frozenset(['a', 'b c']),
+                        {'x': 1, 'y': 2}, None)
+
+            environ = parent.export_environ(args)
+
+            self.assertEqual(environ['{}__OPTIONS'.format(prefix)], '')
+            self.assertEqual(environ['{}_GROUP_COUNT'.format(prefix)], '10')
+            self.assertEqual(json.loads(
+                environ['{}_GROUP_SHARDS'.format(prefix)]
+            ), {'x': 1, 'y': 2})
+            self.assertNotIn('{}_GROUP_EMPTY'.format(prefix), environ)
+
+            blob = parent.export_environ(args, blob=True)
+
+            self.assertEqual(list(blob), ['{}__OPTIONS'.format(prefix)])
+            self.assertEqual(json.loads(
+                blob['{}__OPTIONS'.format(prefix)].partition(':')[2]
+            )['{}_GROUP_COUNT'.format(prefix)], 10)
+
+            # The child processes never read the configuration file.
+            with open(path, 'w') as f_out:
+                json.dump({'group': {'count': 20}}, f_out)
+
+            for exported in [environ, blob]:
+                os.environ.update(exported)
+
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')
+                    child = self.__build(path)
+
+                    self.assertEqual(self.__values(child), expected)
+
+                for key in exported:
+                    del os.environ[key]
+
+    def test_config_argument(self):
+        with utils.config_file({'group': {'count': 10}}) as first, \
+                utils.config_file({'group': {'count': 20}}) as second:
+            os.environ.update(self.__build(first).export_environ([],
+                                                                 blob=True))
+
+            # The explicit config file is loaded instead of the exported
+            # options.
+            for argv in [['-c', second], ['--config={}'.format(second)]]:
+                sys.argv[1:] = argv
+                child = self.__build(first)
+
+                self.assertEqual(child.config_path, second)
+                self.assertEqual(child.parse_args([]).group.count, 20)
+
+            sys.argv[1:] = []
+            self.assertEqual(self.__build(second).parse_args([]).group.count,
+                             10)
+
+    def test_shell(self):
+        parser = self.__build(None)
+        snippet = parser.export_shell(['--core-name', "a 'b' $c"], blob=True)
+        name = '{}__OPTIONS'.format(self._APP_NAME.upper())
+
+        output = subprocess.check_output(
+            ['sh', '-c', '{}printf %s "${}"'.format(snippet, name)],
+            universal_newlines=True
+        )
+
+        self.assertEqual(output, parser.export_environ(
+            ['--core-name', "a 'b' $c"], blob=True
+        )[name])
+
+        os.environ[name] = output
+        self.assertEqual(self.__build(None).parse_args([]).name, "a 'b' $c")
+
+    def test_broken(self):
+        name = '{}__OPTIONS'.format(self._APP_NAME.upper())
+
+        for text in ['broken', 'SGLE1:gASVBQAAAAAAAAB9lC4=', 'SGLE2:{',
+                     'SGLE2:[1, 2]']:
+            os.environ[name] = text
+
+            with self.assertRaises(SGLException) as err:
+                self.__build(None)
+
+            self.assertEqual(err.exception.code, SGL_PARSER_INVALID_SNAPSHOT)
@@ -0,0 +1,145 @@
+import contextlib
+import io
+import os
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, _is_config_only
+
+
+class TestFastPath(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def setUp(self):
+        super(TestFastPath, self).setUp()
+
+        self.__env = '{}_GROUP_OPT1'.format(self._APP_NAME.upper())
+        os.environ[self.__env] = '-1'
+
+    def tearDown(self):
+        del os.environ[self.__env]
+
+    def __build(self, config=None):
+        parser = SGLParser(self._APP_NAME, default_config=config)
+        parser.add_argument('verbose', type=bool)
+
+        group = parser.add_argument_group('group')
+        for i in range(self.__TEST_COUNT):
+            group.add_argument('opt{}'.format(i), default=i, type=int)
+
+        return parser
+
+    def test_config_only(self):
+        for args in [[], ['-c', 'a'], ['--config', 'a'], ['-ca'], ['-c=a'],
+                     ['--config=a', '-c', 'b']]:
+            self.assertTrue(_is_config_only(args))
+
+        for args in [['-c'], ['--config', '--help'], ['--help'], ['-h'],
+                     ['--core-verbose', 'yes'], ['--conf', 'a'], ['run'],
+                     ['-c', 'a', '--']]:
+            self.assertFalse(_is_config_only(args))
+
+    def test_no_argparse(self):
+        with utils.config_file({'group': {'opt0': 100}}) as temp_file:
+            parser = self.__build(temp_file)
+
+            for args in [[], ['-c', temp_file], ['--config={}'.format(temp_file)]]:
+                values = parser.parse_args(args)
+
+                self.assertFalse(values.verbose)
+                self.assertEqual(values.group.opt0, 100)
+                self.assertEqual(values.group.opt1, -1)
+                self.assertEqual(values.group.opt2, 2)
+
+            self.assertEqual(parser.parse_args(['-c', 'other']).group.opt0,
+                             100)
+
+            # The argparse is never built without the flags.
+            self.assertFalse(parser._is_bound)
+
+            # Same values with the argparse.
+            expected = vars(parser.parse_args([]).group)
+            flagged = parser.parse_args(['--core-verbose', 'yes'])
+
+            self.assertTrue(parser._is_bound)
+            self.assertTrue(flagged.verbose)
+            self.assertEqual(vars(flagged.group), expected)
+            self.assertEqual(vars(parser.parse_args([]).group), expected)
+
+    def __assert_error(self, code, func, *args, **kwargs):
+        with self.assertRaises(SGLException) as err:
+            func(*args, **kwargs)
+
+        self.assertEqual(err.exception.code, code)
+
+    def test_registration_error(self):
+        parser = SGLParser(self._APP_NAME)
+        parser.add_argument('aa', short='v')
+
+        group = parser.add_argument_group('group')
+        group.add_argument('opt1', default=1, type=int)
+
+        # 1. The argparse errors are found without the argparse.
+        for short in ['v', 'c', 'h']:
+            self.__assert_error(SGL_PARSER_DUPLICATED_NAME,
+                                group.add_argument, 'bb', short=short)
+
+        self.__assert_error(SGL_PARSER_INVALID_PARSING_ARG,
+                            group.add_argument, 'bb', short='cx')
+        self.__assert_error(SGL_PARSER_INVALID_PARSING_ARG,
+                            parser.add_argument, 'cc', bogus=1)
+        self.__assert_error(SGL_PARSER_DUPLICATED_NAME,
+                            group.add_argument, 'opt1')
+
+        self.assertFalse(parser._is_bound)
+        self.assertEqual(parser.parse_args([]).group.opt1, -1)
+
+        # 2. Nothing is registered by the failed calls.
+        group.add_argument('bb', short='b', help='bb', metavar='BB')
+        self.assertEqual(parser.parse_args(['-b', 'x']).group.bb, 'x')
+
+        # 3. The subcommand has its own argparse parser.
+        def build(command):
+            command.add_argument('dd', short='v')
+
+            with self.assertRaises(SGLException):
+                command.add_argument('ee', short='c')
+
+        parser.add_subcommand('run', build)
+        self.assertEqual(parser.parse_args(['run', '-v', 'x']).run.dd, 'x')
+
+    def test_registration_error_restored(self):
+        parser = SGLParser(self._APP_NAME)
+        group = parser.add_argument_group('group')
+        group.add_argument('aa', short='v')
+        group.add_argument('opt1', default=1, type=int)
+
+        restored = SGLParser.restore(parser.snapshot())
+
+        self.__assert_error(SGL_PARSER_DUPLICATED_NAME,
+                            restored.add_argument, 'bb', short='v')
+
+        # The schema takes the option strings back on the failure.
+        self.__assert_error(SGL_PARSER_INVALID_PARSING_ARG,
+                            restored.add_schema, {'properties': {
+                                'other': {'type': 'object', 'properties': {
+                                    'cc': {'type': 'string', 'short': 'x'},
+                                }},
+                                'dd': {'type': 'string', 'short': 'cd'},
+                            }})
+
+        restored.add_argument('cc', short='x')
+        self.assertEqual(restored.parse_args(['-x', 'y']).cc, 'y')
+
+    def test_help(self):
+        parser = self.__build()
+
+        out = io.StringIO()
+
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(out):
+            parser.parse_args(['--help'])
+
+        self.assertTrue(parser._is_bound)
+        self.assertIn('--group-opt0', out.getvalue())
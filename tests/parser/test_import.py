@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import sglove
+
+
+class TestImportTime(unittest.TestCase):
+    # Cumulative import time budget of the sglove.parser in micro seconds.
+    __BUDGET_US = 40000
+    __REPEAT = 3
+
+    # Heavy modules which should be imported only at their first use.
+    __LAZY_MODULES = ('argparse', 'asyncio', 'ctypes', 'dataclasses',
+                      'hashlib', 'inspect', 'json', 'multiprocessing',
+                      'pickle', 're', 'tempfile', 'typing')
+
+    def setUp(self):
+        self.__cache = tempfile.TemporaryDirectory()
+
+        self.__env = dict(os.environ)
+        self.__env.pop('PYTHONDONTWRITEBYTECODE', None)
+        self.__env['PYTHONPYCACHEPREFIX'] = self.__cache.name
+
+        # Import this source tree, not the installed one.
+        package = os.path.dirname(os.path.abspath(sglove.__file__))
+        paths = [os.path.dirname(package)]
+        if self.__env.get('PYTHONPATH'):
+            paths.append(self.__env['PYTHONPATH'])
+
+        self.__env['PYTHONPATH'] = os.pathsep.join(paths)
+
+        # Write the bytecode caches to measure the import only.
+        self.__import_times()
+
+    def tearDown(self):
+        self.__cache.cleanup()
+
+    def __import_times(self):
+        output = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import sglove.parser'],
+            env=self.__env, stderr=subprocess.PIPE, check=True,
+            universal_newlines=True
+        ).stderr
+
+        # import time: self [us] | cumulative | imported package
+        times = {}
+
+        for line in output.splitlines():
+            fields = line.split('|')
+
+            if len(fields) == 3 and fields[1].strip().isdigit():
+                times[fields[2].strip()] = int(fields[1])
+
+        return times
+
+    def test_lazy_modules(self):
+        times = self.__import_times()
+
+        self.assertIn('sglove.parser', times)
+
+        for module in self.__LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_budget(self):
+        elapsed = min(self.__import_times()['sglove.parser']
+                      for _ in range(self.__REPEAT))
+
+        self.assertLess(elapsed, self.__BUDGET_US)
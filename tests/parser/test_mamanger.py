@@ -7,7 +7,7 @@ from tests import utils
 from tests.parser import ParserTestCase
 
 from sglove.parser.exception import *
-from sglove.parser import _OptionManager
+from sglove.parser import _OptionManager, _CompiledOption
 
 
 class TestOptionManager(ParserTestCase):
@@ -72,6 +72,85 @@ class TestOptionManager(ParserTestCase):
             self.assertEqual(manager.long_arg(k, v), self._to_arg_name(k, v))
             self.assertEqual(manager.dest_name(k, v), self._to_dest_name(k, v))
 
+    def test_compile(self):
+        manager = _OptionManager(self._APP_NAME)
+
+        for _ in range(self.__TEST_COUNT):
+            category = self._gen_random_string()
+            name = self._gen_random_string()
+
+            option = manager.compile(category, name, type=int)
+
+            self.assertIsInstance(option, _CompiledOption)
+            self.assertEqual(option.category, category)
+            self.assertEqual(option.name, name)
+            self.assertEqual(option.dest, manager.dest_name(category, name))
+            self.assertEqual(option.env, manager.env_name(category, name))
+            self.assertEqual(option.arg, manager.long_arg(category, name))
+            self.assertEqual(option.convert('10'), 10)
+
+            # Compiled option is immutable and doesn't have the __dict__.
+            with self.assertRaises(AttributeError):
+                option.dest = self._gen_random_string()
+
+            with self.assertRaises(TypeError):
+                vars(option)
+
+        # Compiling also checks the name format.
+        with self.assertRaises(SGLException) as err:
+            manager.compile(self._gen_random_string(suffix='-'),
+                            self._gen_random_string())
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_NAME_FORMAT)
+
+    def test_environ_snapshot(self):
+        manager = _OptionManager(self._APP_NAME)
+        options = [manager.compile(self._gen_random_string(),
+                                   self._gen_random_string())
+                   for _ in range(self.__TEST_COUNT)]
+
+        environ = {option.env: self._gen_random_string()
+                   for option in options}
+        unknown = {self._to_env_name(self._gen_random_name()): 'unknown'
+                   for _ in range(self.__TEST_COUNT)}
+        others = {'OTHER_{}'.format(option.env): 'other'
+                  for option in options}
+
+        manager = _OptionManager(self._APP_NAME,
+                                 environ=dict(environ, **unknown, **others))
+
+        # 1. Snapshot has only the prefixed variables.
+        self.assertEqual(manager._env_snapshot, dict(environ, **unknown))
+
+        for option in options:
+            self.assertEqual(manager.resolve(option), environ[option.env])
+
+        # 2. Unknown variables don't match any option.
+        self.assertEqual(manager.unknown_environ(options), sorted(unknown))
+        self.assertEqual(manager.unknown_environ([]),
+                         sorted(dict(environ, **unknown)))
+
+    def test_environ_refresh(self):
+        # Empty dictionary means the system environment, so add a dummy.
+        environ = {'DUMMY': 'dummy'}
+        manager = _OptionManager(self._APP_NAME, environ=environ)
+        option = manager.compile(self._gen_random_string(),
+                                 self._gen_random_string())
+
+        default = self._gen_random_string()
+        value = self._gen_random_string()
+
+        self.assertEqual(manager.resolve(option, default), default)
+
+        # Snapshot is not changed until the refresh.
+        environ[option.env] = value
+
+        self.assertEqual(manager.resolve(option, default), default)
+
+        manager.refresh_environ()
+
+        self.assertEqual(manager.resolve(option, default), value)
+
     def test_invalid_initialization(self):
         # 1. Enter invalid type.
         with self.assertRaises(SGLException) as err:
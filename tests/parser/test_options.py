@@ -0,0 +1,72 @@
+import threading
+
+from tests.parser import ParserTestCase
+
+from sglove.parser.options import SGLOptionsHolder, _frozen_type
+
+
+class TestFrozenOptions(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def test_normal(self):
+        fields = [self._gen_random_string() for _ in range(self.__TEST_COUNT)]
+        values = [self._gen_random_string() for _ in fields]
+
+        options = _frozen_type(self._gen_random_name(), fields)(values)
+
+        # Hyphenated names are available through the getattr().
+        for field, value in zip(fields, values):
+            self.assertEqual(getattr(options, field), value)
+
+        self.assertEqual(options._asdict(), dict(zip(fields, values)))
+        self.assertEqual(list(options), values)
+
+        with self.assertRaises(AttributeError):
+            setattr(options, fields[0], None)
+
+        with self.assertRaises(AttributeError):
+            options.unknown = None
+
+
+class TestSGLOptionsHolder(ParserTestCase):
+    __TEST_COUNT = 1000
+
+    def test_swap(self):
+        first, second = object(), object()
+
+        holder = SGLOptionsHolder(first)
+
+        self.assertIs(holder.current, first)
+        self.assertIs(holder.swap(second), first)
+        self.assertIs(holder.current, second)
+
+        self.assertFalse(holder.compare_and_swap(first, first))
+        self.assertIs(holder.current, second)
+
+        self.assertTrue(holder.compare_and_swap(second, first))
+        self.assertIs(holder.current, first)
+
+    def test_consistent_read(self):
+        options_type = _frozen_type('options', ['first', 'second'])
+        holder = SGLOptionsHolder(options_type([0, 0]))
+        broken = []
+
+        def read():
+            for _ in range(self.__TEST_COUNT):
+                current = holder.current
+
+                if current.first != current.second:
+                    broken.append(current)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+
+        for reader in readers:
+            reader.start()
+
+        for value in range(self.__TEST_COUNT):
+            holder.swap(options_type([value, value]))
+
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(broken, [])
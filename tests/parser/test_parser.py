@@ -5,12 +5,16 @@ from tests.parser import ParserTestCase
 
 import os
 import random
+import shutil
+import sys
+import warnings
 
 import tests.utils as utils
 
 # Test target
 from sglove.parser.exception import *
-from sglove.parser import SGLParser, _OptionManager
+from sglove.parser import SGLParser, SGLConfigCache, _OptionManager, \
+    _scan_config
 
 
 class TestSGLParserBase(ParserTestCase):
@@ -19,7 +23,12 @@ class TestSGLParserBase(ParserTestCase):
     def __check_all_values(self, test_case, parsed, func):
         for category, values in test_case.items():
             for name, value in values.items():
-                self.assertEqual(parsed[category][name], func(value))
+                group = parsed[category]
+
+                if not isinstance(group, dict):
+                    group = group._asdict()
+
+                self.assertEqual(group[name], func(value))
 
     def __gen_test_inputs(self, test_case):
         manager = _OptionManager(self._APP_NAME)
@@ -121,6 +130,77 @@ class TestSGLParserBase(ParserTestCase):
         finally:
             self.__cleanup(conf, envs)
 
+    def test_parse_frozen(self):
+        # 0. Build test case
+        test_case = self._gen_random_inputs(self.__TEST_COUNT, True)
+
+        conf, envs, args = self.__gen_test_inputs(test_case)
+
+        try:
+            parser = SGLParser(self._APP_NAME, conf.path)
+
+            self.__parser_load(parser, test_case)
+
+            # 1. Frozen options should have the same values with namespace
+            frozen = parser.parse_frozen(args)
+            values = self.__extract_namespace(parser.parse_args(args))
+
+            self.assertEqual({
+                c: s._asdict() if c in test_case else s
+                for c, s in frozen._asdict().items()
+            }, values)
+
+            self.__check_all_values(test_case,
+                                    {c: getattr(frozen, c) for c in test_case},
+                                    lambda v: v.expected)
+
+            # 2. Frozen options are immutable and don't have the __dict__.
+            category = next(iter(test_case))
+
+            with self.assertRaises(AttributeError):
+                setattr(getattr(frozen, category), 'value', None)
+
+            with self.assertRaises(AttributeError):
+                setattr(frozen, category, None)
+
+            self.assertFalse(hasattr(frozen, '__dict__'))
+
+            # 3. Generated classes are reused for the same schema.
+            self.assertIs(type(parser.parse_frozen(args)), type(frozen))
+
+            parser.add_argument(self._gen_random_name())
+
+            self.assertIsNot(type(parser.parse_frozen(args)), type(frozen))
+
+        finally:
+            self.__cleanup(conf, envs)
+
+    def test_config_cache(self):
+        # 0. Build test case
+        test_case = self._gen_random_inputs(self.__TEST_COUNT, True)
+
+        conf, envs, args = self.__gen_test_inputs(test_case)
+        cache = SGLConfigCache(utils.get_temp_file(self._gen_random_name()))
+
+        try:
+            # 1. Parse twice. First one builds the entry and second one uses.
+            for hits, misses in [(0, 1), (1, 1)]:
+                parser = SGLParser(self._APP_NAME, conf.path, cache=cache)
+
+                self.__parser_load(parser, test_case)
+
+                values = self.__extract_namespace(parser.parse_args(args))
+
+                self.__check_all_values(test_case, values,
+                                        lambda v: v.expected)
+
+                self.assertEqual(cache.stats,
+                                 {'hits': hits, 'misses': misses})
+
+        finally:
+            self.__cleanup(conf, envs)
+            shutil.rmtree(cache.directory, ignore_errors=True)
+
     def test_duplicated_name_in_parser(self):
         # 0. Build test case
         test_case = self._gen_random_common_inputs(self.__TEST_COUNT)
@@ -188,3 +268,72 @@ class TestSGLParserBase(ParserTestCase):
         self.__test_abnormal_kwargs(
             lambda k, **kwargs: group.add_argument(k, **kwargs)
         )
+
+    def test_unknown_environ(self):
+        known = self._gen_random_name()
+        unknown = self._to_env_name(self._gen_random_name())
+
+        os.environ[unknown] = self._gen_random_string()
+
+        try:
+            # 1. Unknown variable is warned only once.
+            parser = SGLParser(self._APP_NAME)
+            parser.add_argument(known)
+
+            with self.assertWarns(SGLUnknownEnvWarning) as warned:
+                parser.parse_args([])
+
+            self.assertIn(unknown, str(warned.warning))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                parser.parse_args([])
+
+            # 2. Warning can be disabled.
+            parser = SGLParser(self._APP_NAME, warn_unknown_env=False)
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                parser.parse_args([])
+
+        finally:
+            del os.environ[unknown]
+
+    def test_config_scan(self):
+        path = self._gen_random_string()
+        other = self._gen_random_string()
+
+        test_case = [
+            ([], None),
+            (['-c', path], path),
+            (['--config', path], path),
+            (['-c{}'.format(path)], path),
+            (['-c={}'.format(path)], path),
+            (['--config={}'.format(path)], path),
+            (['--name', other, '-c', other, '--config', path], path),
+            (['-h', '--help', '-c', path], path),
+            (['-c', path, '--', '-c', other], path),
+            (['--conf', path], path),
+            (['--con={}'.format(path)], path),
+            (['--c', other, '--co', path], path),
+            (['--', '--conf', other], None),
+            (['--configs', other, '--cx={}'.format(other)], None),
+        ]
+
+        for args, expected in test_case:
+            self.assertEqual(_scan_config(args), expected)
+
+        # Default value should be used only if there is no config argument.
+        self.assertEqual(_scan_config([], other), other)
+        self.assertEqual(_scan_config(['-c', path], other), path)
+
+        # The abbreviation argparse accepts loads the file too.
+        with utils.config_file({'core': {'name': 'fromfile'}}) as temp_file:
+            for args in [['--conf', temp_file],
+                         ['--con={}'.format(temp_file)]]:
+                sys.argv = [self._argv[0]] + args
+
+                parser = SGLParser(self._APP_NAME)
+                parser.add_argument('name')
+
+                self.assertEqual(parser.parse_args().name, 'fromfile')
@@ -0,0 +1,86 @@
+import json
+import os
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser import SGLConfigStack, SGLParser, SGLProfiler
+
+
+class TestSGLProfiler(ParserTestCase):
+    def __build(self, profiler, path=None, stack=None):
+        parser = SGLParser(self._APP_NAME, path, stack=stack,
+                           profiler=profiler)
+        group = parser.add_argument_group('group')
+
+        group.add_argument('env', default=0, type=int)
+        group.add_argument('file', default=0, type=int)
+        group.add_argument('default', default=3, type=int)
+        group.add_argument('cli', default=0, type=int)
+
+        return parser
+
+    def test_provenance(self):
+        profiler = SGLProfiler()
+        env = '{}_GROUP_ENV'.format(self._APP_NAME.upper())
+
+        with utils.config_file({'group': {'file': 2}}) as temp_file:
+            os.environ[env] = '1'
+
+            try:
+                parser = self.__build(profiler, temp_file)
+                values = parser.parse_args(['--group-cli', '4']).group
+
+            finally:
+                del os.environ[env]
+
+        self.assertIs(parser.profiler, profiler)
+        self.assertEqual((values.env, values.file, values.default, values.cli),
+                         (1, 2, 3, 4))
+
+        options = profiler.options
+
+        self.assertEqual(options['group.env']['source'], 'env')
+        self.assertEqual(options['group.env']['raw'], '1')
+        self.assertEqual(options['group.env']['path'], ['env:{}'.format(env)])
+
+        self.assertEqual(options['group.file']['source'], 'file')
+        self.assertEqual(options['group.file']['origin'], temp_file)
+        self.assertEqual(options['group.file']['value'], 2)
+
+        self.assertEqual(options['group.default']['source'], 'default')
+        self.assertEqual(options['group.default']['path'][-1], 'default')
+
+        # CLI value overrides the resolved default.
+        self.assertEqual(options['group.cli']['source'], 'cli')
+        self.assertEqual(options['group.cli']['value'], 4)
+        self.assertEqual(options['group.cli']['resolutions'], 2)
+
+        for record in options.values():
+            self.assertGreaterEqual(record['convert_ns'], 0)
+
+        for name in ['config_load', 'env_scan', 'argparse_build', 'parse']:
+            self.assertGreaterEqual(profiler.timings[name]['count'], 1)
+            self.assertGreater(profiler.timings[name]['total_ns'], 0)
+
+        # Dumped JSON has the same values.
+        self.assertEqual(json.loads(profiler.to_json()),
+                         json.loads(json.dumps(profiler.as_dict())))
+
+        profiler.reset()
+        self.assertEqual(profiler.as_dict(), {'options': {}, 'timings': {}})
+
+    def test_stack_origin(self):
+        profiler = SGLProfiler()
+        stack = SGLConfigStack().add_mapping('base', {'group': {'file': 2}})
+
+        self.__build(profiler, stack=stack).parse_args([])
+
+        self.assertEqual(profiler.options['group.file']['origin'],
+                         ('base', None))
+
+    def test_disabled(self):
+        parser = self.__build(None)
+
+        self.assertIsNone(parser.profiler)
+        self.assertEqual(parser.parse_args([]).group.default, 3)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, SGLSourceRegistry, default_registry
+
+
+class TestSourceRegistry(ParserTestCase):
+    def setUp(self):
+        super(TestSourceRegistry, self).setUp()
+
+        self.__env = '{}_GROUP_ENV'.format(self._APP_NAME.upper())
+
+    def tearDown(self):
+        os.environ.pop(self.__env, None)
+
+    def __build(self, path, registry):
+        return self.__define(SGLParser(self._APP_NAME, default_config=path,
+                                       registry=registry))
+
+    def __define(self, parser):
+        group = parser.add_argument_group('group')
+        group.add_argument('value', default=0, type=int)
+        group.add_argument('env', default='none')
+
+        return parser
+
+    def __values(self, parser):
+        values = parser.parse_args([]).group
+
+        return values.value, values.env
+
+    def test_share(self):
+        registry = SGLSourceRegistry()
+
+        with utils.config_file({'group': {'value': 1}}) as path:
+            first = self.__build(path, registry)
+            second = self.__build(path, registry)
+
+            self.assertEqual(registry.stats,
+                             {'hits': 1, 'misses': 1, 'entries': 1})
+            self.assertIs(first._manager.source[0],
+                          second._manager.source[0])
+            self.assertEqual(self.__values(second), (1, 'none'))
+
+            # Different environment is the different entry.
+            os.environ[self.__env] = 'set'
+
+            self.assertEqual(self.__values(self.__build(path, registry)),
+                             (1, 'set'))
+            self.assertEqual(registry.misses, 2)
+
+            # Modified file is loaded again.
+            with open(path, 'w') as f_out:
+                json.dump({'group': {'value': 200}}, f_out)
+
+            self.assertEqual(self.__values(self.__build(path, registry)),
+                             (200, 'set'))
+            self.assertEqual(registry.misses, 3)
+            self.assertEqual(len(registry), 2)
+
+            # Sharing parsers are not affected by the environment refresh.
+            del os.environ[self.__env]
+            second.reload()
+
+            self.assertEqual(self.__values(second), (200, 'none'))
+            self.assertEqual(self.__values(first), (1, 'none'))
+
+    def test_create(self):
+        registry = SGLSourceRegistry()
+
+        async def create(path):
+            return self.__define(await SGLParser.create(
+                self._APP_NAME, default_config=path, registry=registry
+            ))
+
+        with utils.config_file({'group': {'value': 1}}) as path:
+            first = asyncio.run(create(path))
+            second = self.__build(path, registry)
+            third = asyncio.run(create(path))
+
+            self.assertEqual(registry.stats,
+                             {'hits': 2, 'misses': 1, 'entries': 1})
+            self.assertIs(first._manager.source[0],
+                          third._manager.source[0])
+
+            for parser in [first, second, third]:
+                self.assertEqual(self.__values(parser), (1, 'none'))
+
+    def test_evict(self):
+        registry = SGLSourceRegistry(capacity=2)
+
+        with utils.config_file({'group': {'value': 1}}) as first, \
+                utils.config_file({'group': {'value': 2}}) as second, \
+                utils.config_file({'group': {'value': 3}}) as third:
+            for path in [first, second, first, third, first]:
+                self.__build(path, registry)
+
+            # The second is the least recently used one.
+            self.assertEqual(registry.stats,
+                             {'hits': 2, 'misses': 3, 'entries': 2})
+
+            self.assertEqual(registry.invalidate(path=second), 0)
+            self.assertEqual(registry.invalidate(app_name='OTHER'), 0)
+            self.assertEqual(registry.invalidate(path=first), 1)
+
+            self.__build(first, registry)
+            self.assertEqual(registry.misses, 4)
+
+            self.assertEqual(registry.invalidate(app_name=self._APP_NAME), 2)
+            self.assertEqual(len(registry), 0)
+
+    def test_default(self):
+        self.assertIs(default_registry(), default_registry())
+
+        for capacity in [0, None]:
+            with self.assertRaises(SGLException) as err:
+                SGLSourceRegistry(capacity)
+
+            self.assertEqual(err.exception.code,
+                             SGL_PARSER_INVALID_PARSING_ARG)
@@ -0,0 +1,141 @@
+import array
+import dataclasses
+import typing
+
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser
+
+
+@dataclasses.dataclass
+class _Database:
+    host: str = 'localhost'
+    port: int = 5432
+    replicas: typing.List[int] = dataclasses.field(default_factory=list)
+    timeout: typing.Optional[float] = dataclasses.field(
+        default=1.5, metadata={'help': 'Timeout seconds'}
+    )
+
+
+@dataclasses.dataclass
+class _Options:
+    database: _Database
+    verbose: bool = dataclasses.field(default=False, metadata={'short': 'v'})
+
+
+class TestSGLSchema(ParserTestCase):
+    __TEST_COUNT = 100
+
+    def __gen_schema(self):
+        return {
+            'properties': {
+                'verbose': {'type': 'boolean', 'default': False,
+                            'short': 'v'},
+                'database': {
+                    'type': 'object',
+                    'description': 'Database options',
+                    'properties': {
+                        'host': {'type': 'string', 'default': 'localhost'},
+                        'port': {'type': 'integer', 'default': 5432},
+                        'mode': {'enum': ['ro', 'rw'], 'default': 'ro'},
+                        'replicas': {'type': 'array',
+                                     'items': {'type': 'integer'}},
+                        'tags': {'type': 'array', 'uniqueItems': True},
+                        'weights': {'type': 'object',
+                                    'additionalProperties':
+                                        {'type': 'number'}},
+                    },
+                },
+                'large': {
+                    'type': 'object',
+                    'properties': {
+                        'opt{}'.format(i): {'type': 'integer', 'default': i}
+                        for i in range(self.__TEST_COUNT)
+                    },
+                },
+            },
+        }
+
+    def test_dict(self):
+        parser = SGLParser(self._APP_NAME)
+        groups = parser.add_schema(self.__gen_schema())
+
+        self.assertEqual(list(groups), ['database', 'large'])
+        self.assertEqual(groups['database'].description, 'Database options')
+
+        values = parser.parse_args([
+            '-v', 'yes', '--database-port', '1', '--database-mode', 'rw',
+            '--database-replicas', '1,2', '--database-tags', 'a,a',
+            '--database-weights', 'a=0.5',
+        ])
+
+        self.assertTrue(values.verbose)
+        self.assertEqual(values.database.host, 'localhost')
+        self.assertEqual(values.database.port, 1)
+        self.assertEqual(values.database.mode, 'rw')
+        self.assertEqual(values.database.replicas, array.array('q', [1, 2]))
+        self.assertEqual(values.database.tags, frozenset(['a']))
+        self.assertEqual(values.database.weights, {'a': 0.5})
+        self.assertEqual([getattr(values.large, 'opt{}'.format(i))
+                          for i in range(self.__TEST_COUNT)],
+                         list(range(self.__TEST_COUNT)))
+
+    def test_dataclass(self):
+        for schema in [_Options, _Options(_Database())]:
+            parser = SGLParser(self._APP_NAME)
+            parser.add_schema(schema)
+
+            values = parser.parse_args(['--database-replicas', '3'])
+
+            self.assertFalse(values.verbose)
+            self.assertEqual(values.database.host, 'localhost')
+            self.assertEqual(values.database.port, 5432)
+            self.assertEqual(values.database.replicas.tolist(), [3])
+            self.assertEqual(values.database.timeout, 1.5)
+
+    def test_deferred(self):
+        # Restored parser registers the schema without the argparse.
+        parser = SGLParser.restore(SGLParser(self._APP_NAME).snapshot())
+        parser.add_schema(self.__gen_schema())
+
+        self.assertEqual(parser.parse_args([]).database.port, 5432)
+        self.assertEqual(parser.parse_args(['--database-port', '2'])
+                         .database.port, 2)
+
+    def test_atomic(self):
+        parser = SGLParser(self._APP_NAME)
+        parser.add_argument_group('registered')
+
+        # Invalid schemas don't register anything.
+        for schema, code in [
+            ({'properties': {'registered': {'type': 'object',
+                                            'properties': {}}}},
+             SGL_PARSER_DUPLICATED_NAME),
+            ({'properties': {'group': {'type': 'object',
+                                       'properties': {'bad name': {}}}}},
+             SGL_PARSER_INVALID_NAME_FORMAT),
+            ({'properties': {'group': {'type': 'object', 'properties': {
+                'nested': {'type': 'object', 'properties': {}}}}}},
+             SGL_PARSER_INVALID_PARSING_ARG),
+            ({'properties': {'opt': {'type': 'unknown'}}},
+             SGL_PARSER_INVALID_PARSING_ARG),
+            ({}, SGL_PARSER_INVALID_PARSING_ARG),
+            ([], SGL_PARSER_INVALID_PARSING_ARG),
+        ]:
+            with self.assertRaises(SGLException) as err:
+                parser.add_schema(schema)
+
+            self.assertEqual(err.exception.code, code)
+
+        values = parser.parse_args([])
+        self.assertFalse(hasattr(values, 'group'))
+        self.assertFalse(hasattr(values, 'opt'))
+
+        # Duplicated names in the same batch
+        with self.assertRaises(SGLException) as err:
+            parser.add_argument_group('group')._extend([
+                ('name', None, None, str, {}), ('name', None, None, str, {})
+            ])
+
+        self.assertEqual(err.exception.code, SGL_PARSER_DUPLICATED_NAME)
@@ -0,0 +1,79 @@
+import multiprocessing
+import pickle
+
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, SGLSharedOptions, SGLSet, \
+    export_options, import_options
+
+
+def _read_shared(shared):
+    options = shared.get()
+
+    return options.verbose, options.database.port, shared.get() is options
+
+
+class TestSharedOptions(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def __parse(self):
+        parser = SGLParser(self._APP_NAME)
+        parser.add_argument('verbose', type=bool)
+
+        database = parser.add_argument_group('database')
+        database.add_argument('port', default=5432, type=int)
+        database.add_argument('tags', default='a,b', type=SGLSet())
+
+        large = parser.add_argument_group('large')
+        for i in range(self.__TEST_COUNT):
+            large.add_argument('opt-{}'.format(i), default=i, type=int)
+
+        return parser.parse_frozen(['--core-verbose', 'yes'])
+
+    def test_export(self):
+        options = self.__parse()
+
+        for loaded in [import_options(export_options(options)),
+                       pickle.loads(pickle.dumps(options))]:
+            self.assertEqual(loaded, options)
+            self.assertIs(type(loaded), type(options))
+            self.assertIs(type(loaded.database), type(options.database))
+            self.assertEqual(loaded.database.tags, frozenset(['a', 'b']))
+            self.assertEqual(getattr(loaded.large, 'opt-1'), 1)
+
+        for data in [b'', b'SGLO\x00', export_options(options)[:-1]]:
+            with self.assertRaises(SGLException) as err:
+                import_options(data)
+
+            self.assertEqual(err.exception.code, SGL_PARSER_INVALID_SNAPSHOT)
+
+        with self.assertRaises(SGLException) as err:
+            export_options(options._asdict())
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_PARSING_ARG)
+
+    def test_shared(self):
+        options = self.__parse()
+
+        with SGLSharedOptions(options) as shared:
+            handle = pickle.dumps(shared)
+
+            # Only the block name is pickled.
+            self.assertLess(len(handle), shared.size)
+            self.assertTrue(shared.is_owner)
+            self.assertIs(shared.get(), options)
+
+            # Spawned workers don't inherit the options.
+            context = multiprocessing.get_context('spawn')
+
+            with context.Pool(2) as pool:
+                results = pool.map(_read_shared, [shared] * 4)
+
+            self.assertEqual(results, [(True, 5432, True)] * 4)
+
+        # Closed blocks can't be attached.
+        with self.assertRaises(SGLException) as err:
+            pickle.loads(handle).get()
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_SNAPSHOT)
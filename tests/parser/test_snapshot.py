@@ -0,0 +1,169 @@
+import os
+import shutil
+
+from argparse import Namespace
+from collections import defaultdict
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, SGLSnapshotStore, _OptionManager
+from sglove.parser.snapshot import _builder_fingerprint
+
+
+class TestSGLParserSnapshot(ParserTestCase):
+    __TEST_COUNT = 50
+
+    def setUp(self):
+        super(TestSGLParserSnapshot, self).setUp()
+
+        self.__directory = utils.get_temp_file(self._gen_random_name())
+        self.__envs = []
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory, ignore_errors=True)
+
+        for key in self.__envs:
+            del os.environ[key]
+
+    def __gen_test_inputs(self, test_case):
+        manager = _OptionManager(self._APP_NAME)
+
+        configs = defaultdict(dict)
+        args = []
+
+        for category, values in test_case.items():
+            for name, value in values.items():
+                if value.is_env_choosable:
+                    key = manager.env_name(category, name)
+                    os.environ[key] = str(value.e_val)
+                    self.__envs.append(key)
+
+                if value.is_file_choosable:
+                    configs[category].update({name: value.f_val})
+
+                if value.is_user_choosable:
+                    args.append('{}={}'.format(manager.long_arg(category, name),
+                                               value.u_val))
+
+        return configs, args
+
+    @staticmethod
+    def __builder(test_case):
+        def build(parser):
+            for category, values in test_case.items():
+                group = parser.add_argument_group(category, category)
+
+                for name, value in values.items():
+                    group.add_argument(name, default=value.default,
+                                       type=value.type)
+
+        return build
+
+    def __check_all_values(self, test_case, namespace, func):
+        for category, values in test_case.items():
+            for name, value in values.items():
+                self.assertEqual(getattr(getattr(namespace, category), name),
+                                 func(value))
+
+    def test_restore(self):
+        test_case = self._gen_random_inputs(self.__TEST_COUNT, True)
+        configs, args = self.__gen_test_inputs(test_case)
+
+        with utils.config_file(configs) as temp_file:
+            parser = SGLParser(self._APP_NAME, temp_file)
+            self.__builder(test_case)(parser)
+
+            data = parser.snapshot()
+
+            # 1. No argument case doesn't build the argparse parser.
+            restored = SGLParser.restore(data, default_config=temp_file)
+
+            self.assertEqual(restored.parse_args([]), parser.parse_args([]))
+            self.assertFalse(restored._is_bound)
+
+            # 2. User arguments build the argparse parser on demand.
+            self.assertEqual(restored.parse_args(args), parser.parse_args(args))
+            self.assertTrue(restored._is_bound)
+
+            self.__check_all_values(test_case, restored.parse_args(args),
+                                    lambda v: v.expected)
+
+    def test_restore_required(self):
+        data = SGLParser(self._APP_NAME).snapshot()
+
+        parser = SGLParser.restore(data)
+        parser.add_argument(self._gen_random_name(), required=True,
+                            default=None, type=lambda v: v)
+
+        # Missing required argument should be reported by the argparse.
+        with self.assertRaises(SystemExit):
+            parser.parse_args([])
+
+    def test_invalid_snapshot(self):
+        for data in [b'', b'invalid snapshot', b'\x80\x04N.']:
+            with self.assertRaises(SGLException) as err:
+                SGLParser.restore(data)
+
+            self.assertEqual(err.exception.code, SGL_PARSER_INVALID_SNAPSHOT)
+
+        # Unpicklable type can't be stored in the snapshot.
+        parser = SGLParser(self._APP_NAME)
+        parser.add_argument(self._gen_random_name(), type=lambda v: v)
+
+        with self.assertRaises(SGLException) as err:
+            parser.snapshot()
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_SNAPSHOT)
+
+    def test_from_builder(self):
+        test_case = self._gen_random_inputs(self.__TEST_COUNT)
+        configs, _ = self.__gen_test_inputs(test_case)
+
+        store = SGLSnapshotStore(self.__directory)
+        builder = self.__builder(test_case)
+
+        with utils.config_file(configs) as temp_file:
+            # 1. First one builds the snapshot, and second one restores it.
+            for hits, misses in [(0, 1), (1, 1)]:
+                parser = SGLParser.from_builder(self._APP_NAME, builder,
+                                                default_config=temp_file,
+                                                store=store)
+
+                self.__check_all_values(test_case, parser.parse_args([]),
+                                        lambda v: v.expected)
+
+                self.assertEqual(store.stats,
+                                 {'hits': hits, 'misses': misses})
+
+            # 2. Broken snapshot is rebuilt.
+            key = _builder_fingerprint(builder, self._APP_NAME)
+
+            with open(store.entry_path(key), 'rb') as f_in:
+                magic = f_in.read(5)
+
+            with open(store.entry_path(key), 'wb') as f_out:
+                f_out.write(magic + b'broken snapshot')
+
+            parser = SGLParser.from_builder(self._APP_NAME, builder,
+                                            default_config=temp_file,
+                                            store=store)
+
+            self.assertIsInstance(parser.parse_args([]), Namespace)
+            self.assertIsNotNone(store.load(key))
+            self.assertIsNotNone(SGLParser.restore(store.load(key)))
+
+    def test_fingerprint(self):
+        def first(parser):
+            parser.add_argument('first')
+
+        def second(parser):
+            parser.add_argument('second')
+
+        self.assertEqual(_builder_fingerprint(first, self._APP_NAME),
+                         _builder_fingerprint(first, self._APP_NAME))
+        self.assertNotEqual(_builder_fingerprint(first, self._APP_NAME),
+                            _builder_fingerprint(second, self._APP_NAME))
+        self.assertNotEqual(_builder_fingerprint(first, self._APP_NAME),
+                            _builder_fingerprint(first, 'OTHER'))
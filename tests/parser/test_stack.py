@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLConfigStack, SGLParser
+
+
+class TestSGLConfigStack(ParserTestCase):
+    __TEST_COUNT = 20
+
+    def setUp(self):
+        super(TestSGLConfigStack, self).setUp()
+
+        self.__directory = utils.get_temp_file(self._gen_random_name())
+        os.makedirs(self.__directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory, ignore_errors=True)
+
+    def __gen_random_configs(self):
+        return {
+            category: {name: value.f_val for name, value in values.items()}
+            for category, values in self._gen_random_inputs(self.__TEST_COUNT)
+                                        .items()
+        }
+
+    def __write(self, name, configs):
+        path = os.path.join(self.__directory, name)
+
+        with open(path, 'w') as f_out:
+            json.dump(configs, f_out)
+
+        return path
+
+    @staticmethod
+    def __merge(*layers):
+        merged = {}
+
+        for configs in layers:
+            for category, values in configs.items():
+                merged.setdefault(category, {}).update(values)
+
+        return merged
+
+    @staticmethod
+    def __override(configs, values):
+        # Override the half of variables by the new values.
+        return {
+            category: {
+                name: values.get(category, {}).get(name, value)
+                for i, (name, value) in enumerate(variables.items()) if i % 2
+            }
+            for category, variables in configs.items()
+        }
+
+    def __check(self, stack, expected):
+        self.assertEqual({c: stack[c] for c in stack}, expected)
+
+        for category, variables in expected.items():
+            for name, value in variables.items():
+                self.assertEqual(stack.value(category, name), value)
+
+    def test_precedence(self):
+        system = self.__gen_random_configs()
+        user = self.__override(system, self.__gen_random_configs())
+        job = self.__override(system, self.__gen_random_configs())
+
+        system_path = self.__write('system.json', system)
+        user_path = self.__write('user.json', user)
+
+        stack = SGLConfigStack()
+        stack.add_file(system_path, name='system')
+        stack.add_file(user_path, name='user')
+        stack.add_mapping('job', job)
+
+        self.assertEqual(stack.layers, ['system', 'user', 'job'])
+        self.__check(stack, self.__merge(system, user, job))
+
+        # Provenance of each value
+        for category, variables in system.items():
+            for name in variables:
+                if name in job.get(category, {}):
+                    source = ('job', None)
+                elif name in user.get(category, {}):
+                    source = ('user', user_path)
+                else:
+                    source = ('system', system_path)
+
+                self.assertEqual(stack.source(category, name), source)
+
+        # Removing the layer restores the lower layer values.
+        stack.remove('job')
+        self.__check(stack, self.__merge(system, user))
+
+        with self.assertRaises(SGLException) as err:
+            stack.remove('job')
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_PARSING_ARG)
+
+    def test_directory(self):
+        fragments = [self.__gen_random_configs() for _ in range(3)]
+
+        fragment_dir = os.path.join(self.__directory, 'conf.d')
+        os.makedirs(fragment_dir)
+
+        # Fragments are merged in the name order.
+        for i, configs in enumerate(reversed(fragments)):
+            with open(os.path.join(fragment_dir,
+                                   '{}.json'.format(9 - i)), 'w') as f_out:
+                json.dump(configs, f_out)
+
+        stack = SGLConfigStack().add_directory(fragment_dir, '*.json')
+
+        self.__check(stack, self.__merge(*reversed(fragments)))
+
+    def test_refresh(self):
+        base = self.__gen_random_configs()
+        top = self.__override(base, self.__gen_random_configs())
+
+        base_path = self.__write('base.json', base)
+        top_path = self.__write('top.json', top)
+
+        stack = SGLConfigStack()
+        stack.add_file(base_path, name='base').add_file(top_path, name='top')
+
+        # 1. Nothing changed.
+        partial = stack.stats['partial']
+
+        self.assertEqual(stack.refresh(), [])
+        self.assertEqual(stack.stats['partial'], partial)
+
+        # 2. Only the changed layer is merged again without the full merge.
+        top = self.__override(base, self.__gen_random_configs())
+        self.__write('top.json', dict(top, added={'name': 'value'}))
+
+        stat = os.stat(top_path)
+        os.utime(top_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertEqual(stack.refresh(), ['top'])
+        self.assertEqual(stack.stats, {'full': 0, 'partial': partial + 1})
+        self.__check(stack, self.__merge(base, top,
+                                         {'added': {'name': 'value'}}))
+
+        # 3. Full merge makes the same result.
+        stack.rebuild()
+        self.__check(stack, self.__merge(base, top,
+                                         {'added': {'name': 'value'}}))
+
+    def test_invalid_layer(self):
+        stack = SGLConfigStack()
+
+        for func in [lambda: stack.add_file(self.__directory),
+                     lambda: stack.add_directory(utils.get_temp_file())]:
+            with self.assertRaises(SGLException) as err:
+                func()
+
+            self.assertEqual(err.exception.code, SGL_PARSER_CONFIG_NOT_EXIST)
+
+        with self.assertRaises(SGLException) as err:
+            stack.add_mapping('invalid', [])
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_CONFIG)
+
+    def test_parser(self):
+        base = {'group': {'first': 'base', 'second': 'base'}}
+        config = {'group': {'second': 'config'}}
+
+        stack = SGLConfigStack().add_mapping('base', base)
+
+        # Config file is the top layer of the stack.
+        parser = SGLParser(self._APP_NAME,
+                           self.__write('config.json', config),
+                           stack=stack)
+
+        group = parser.add_argument_group('group')
+        group.add_argument('first', default='default')
+        group.add_argument('second', default='default')
+        group.add_argument('third', default='default')
+
+        values = parser.parse_args([]).group
+
+        self.assertEqual((values.first, values.second, values.third),
+                         ('base', 'config', 'default'))
+        self.assertEqual(stack.layers, ['base', 'config'])
@@ -0,0 +1,140 @@
+import dataclasses
+import typing
+import unittest
+
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser
+
+try:
+    import attr
+
+except ImportError:
+    attr = None
+
+
+@dataclasses.dataclass
+class _Database:
+    host: str
+    port: int
+    extra: str = 'extra'
+
+
+@dataclasses.dataclass
+class _Options:
+    verbose: bool
+    database: _Database
+    cache: typing.Any = None
+    count: int = dataclasses.field(default_factory=lambda: 10)
+
+
+class _Group(typing.NamedTuple):
+    host: str
+    port: int
+
+
+class TestTypedOutput(ParserTestCase):
+    def __build(self):
+        parser = SGLParser(self._APP_NAME)
+        parser.add_argument('verbose', type=bool)
+
+        database = parser.add_argument_group('database')
+        database.add_argument('host', default='localhost')
+        database.add_argument('port', default=5432, type=int)
+
+        cache = parser.add_argument_group('cache')
+        cache.add_argument('max-size', default=10, type=int)
+
+        return parser
+
+    def test_dataclass(self):
+        parser = self.__build()
+        options = parser.parse_args(['--database-port', '1'], into=_Options)
+
+        self.assertEqual(options, _Options(
+            verbose=False, database=_Database('localhost', 1), count=10,
+            cache=options.cache
+        ))
+
+        # Group without the annotated class is the generated slots class.
+        self.assertEqual(options.cache.max_size, 10)
+        self.assertFalse(hasattr(options.cache, '__dict__'))
+
+        # Filling function is reused.
+        self.assertEqual(parser.parse_args([], into=_Options).database,
+                         _Database('localhost', 5432))
+
+    def test_named_tuple(self):
+        @dataclasses.dataclass
+        class Options:
+            database: _Group
+
+        options = self.__build().parse_args([], into=Options)
+
+        self.assertEqual(options.database, _Group('localhost', 5432))
+
+    @unittest.skipIf(attr is None, 'attrs is not installed.')
+    def test_attrs(self):
+        @attr.s(slots=True)
+        class Database:
+            host = attr.ib()
+            _port = attr.ib()
+
+        @attr.s(slots=True)
+        class Options:
+            database = attr.ib(type=Database)
+            verbose = attr.ib(default=True)
+            tags = attr.ib(factory=list)
+
+        options = self.__build().parse_args(['--database-host', 'db'],
+                                            into=Options)
+
+        self.assertEqual(options, Options(Database('db', 5432), False, []))
+
+    def test_slots(self):
+        parser = self.__build()
+
+        options = parser.parse_args(['--core-verbose', 'yes'], into='slots')
+
+        self.assertTrue(options.verbose)
+        self.assertEqual(options.database.port, 5432)
+        self.assertEqual(options.cache.max_size, 10)
+        self.assertEqual(options.database._asdict(),
+                         {'host': 'localhost', 'port': 5432})
+
+        for target in [options, options.database]:
+            self.assertFalse(hasattr(target, '__dict__'))
+
+            with self.assertRaises(AttributeError):
+                target.unknown = None
+
+        # Slots options are mutable.
+        options.database.port = 1
+        self.assertEqual(options.database.port, 1)
+
+        self.assertEqual(type(parser.parse_args([], into='slots')),
+                         type(options))
+
+    def test_command(self):
+        parser = self.__build()
+        parser.add_subcommand('run', lambda c: c.add_argument('jobs',
+                                                              default=1,
+                                                              type=int))
+
+        options = parser.parse_args(['run', '--run-jobs', '4'], into='slots')
+
+        self.assertEqual((options.command, options.run.jobs), ('run', 4))
+        self.assertIsNone(parser.parse_args([], into='slots').command)
+
+    def test_missing_field(self):
+        @dataclasses.dataclass
+        class Options:
+            unknown: str
+
+        for into in [Options, object]:
+            with self.assertRaises(SGLException) as err:
+                self.__build().parse_args([], into=into)
+
+            self.assertEqual(err.exception.code,
+                             SGL_PARSER_INVALID_PARSING_ARG)
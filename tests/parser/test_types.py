@@ -0,0 +1,132 @@
+import array
+import os
+import pickle
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLDict, SGLList, SGLParser, SGLSet
+from sglove.parser.types import _chunks
+
+
+class TestMultiValuedTypes(ParserTestCase):
+    __TEST_COUNT = 1000
+
+    def test_chunks(self):
+        values = [str(i) for i in range(self.__TEST_COUNT)]
+        text = ','.join(values)
+
+        for chunk_size in [1, 7, 100, len(text), len(text) * 2]:
+            chunks = list(_chunks(text, ',', chunk_size))
+
+            self.assertEqual(sum(chunks, []), values)
+
+        # Empty tokens are dropped.
+        self.assertEqual(sum(_chunks(',a,,b,', ','), []), ['a', 'b'])
+        self.assertEqual(list(_chunks('', ',')), [])
+
+    def test_list(self):
+        values = list(range(self.__TEST_COUNT))
+        text = ','.join(map(str, values))
+
+        # Numeric items are stored in the array.
+        for raw in [text, '[{}]'.format(text), values]:
+            converted = SGLList(int)(raw)
+
+            self.assertIsInstance(converted, array.array)
+            self.assertEqual(converted.tolist(), values)
+
+        self.assertEqual(SGLList(float, ';')('1.5;2').tolist(), [1.5, 2.0])
+        self.assertEqual(SGLList()(' a , b'), ['a', 'b'])
+        self.assertEqual(SGLList(bool)('yes,no'), [True, False])
+        self.assertIsNone(SGLList()(None))
+
+        # Broken JSON strings are the delimited strings.
+        self.assertEqual(SGLList()('[::1]:80,[::2]:80'),
+                         ['[::1]:80', '[::2]:80'])
+        self.assertEqual(SGLSet()('{a},{b}'), frozenset(['{a}', '{b}']))
+        self.assertEqual(SGLDict()('[::1]=a'), {'[::1]': 'a'})
+
+        for raw in ['1,a', '[1, ']:
+            with self.assertRaises(ValueError):
+                SGLList(int)(raw)
+
+        for raw in ['{"a": 1}', 1]:
+            with self.assertRaises(SGLException) as err:
+                SGLList(int)(raw)
+
+            self.assertEqual(err.exception.code, SGL_PARSER_INVALID_VALUE)
+
+    def test_set(self):
+        self.assertEqual(SGLSet()('a,b,a'), frozenset(['a', 'b']))
+        self.assertEqual(SGLSet(int)([1, 2, 2]), frozenset([1, 2]))
+        self.assertEqual(SGLSet(int).merge(frozenset([1]), frozenset([2])),
+                         frozenset([1, 2]))
+
+    def test_dict(self):
+        expected = {'shard{}'.format(i): i for i in range(self.__TEST_COUNT)}
+        text = ','.join('{}={}'.format(k, v) for k, v in expected.items())
+
+        convert = SGLDict(int)
+
+        self.assertEqual(convert(text), expected)
+        self.assertEqual(convert({k: str(v) for k, v in expected.items()}),
+                         expected)
+        self.assertEqual(SGLDict(key=int, separator=':')('1:a, 2:b'),
+                         {1: 'a', 2: 'b'})
+
+        with self.assertRaises(SGLException) as err:
+            convert('shard0')
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_VALUE)
+
+    def test_pickle(self):
+        for convert in [SGLList(int, ';'), SGLSet(), SGLDict(float, int)]:
+            self.assertEqual(pickle.loads(pickle.dumps(convert)), convert)
+
+        self.assertNotEqual(SGLList(int), SGLList(float))
+
+    def test_parser(self):
+        env = '{}_GROUP_PORTS'.format(self._APP_NAME.upper())
+
+        configs = {'group': {'hosts': ['a', 'b'], 'shards': {'s0': 'a'}}}
+
+        with utils.config_file(configs) as temp_file:
+            os.environ[env] = '80,443'
+
+            try:
+                parser = SGLParser(self._APP_NAME, temp_file)
+                group = parser.add_argument_group('group')
+
+                group.add_argument('hosts', type=list)
+                group.add_argument('shards', type=dict)
+                group.add_argument('ports', type=SGLList(int))
+                group.add_argument('tags', type=set, default='x,y')
+
+                # 1. Values from the file, env and default
+                values = parser.parse_args([]).group
+
+                self.assertEqual(values.hosts, ['a', 'b'])
+                self.assertEqual(values.shards, {'s0': 'a'})
+                self.assertEqual(values.ports, array.array('q', [80, 443]))
+                self.assertEqual(values.tags, frozenset(['x', 'y']))
+
+                # 2. Repeated arguments replace the default and are merged.
+                values = parser.parse_args([
+                    '--group-hosts', 'c', '--group-hosts', 'd,e',
+                    '--group-shards', 's1=b', '--group-shards', 's2=c',
+                    '--group-tags', 'z',
+                ]).group
+
+                self.assertEqual(values.hosts, ['c', 'd', 'e'])
+                self.assertEqual(values.shards, {'s1': 'b', 's2': 'c'})
+                self.assertEqual(values.ports.tolist(), [80, 443])
+                self.assertEqual(values.tags, frozenset(['z']))
+
+                # 3. Default values are not modified by the merge.
+                self.assertEqual(parser.parse_args([]).group.hosts,
+                                 ['a', 'b'])
+
+            finally:
+                del os.environ[env]
@@ -0,0 +1,135 @@
+import os
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLList, SGLParser
+from sglove.parser.validate import _compile_constraints
+
+
+def _ordered(low, high):
+    return low <= high
+
+
+class TestSGLValidation(ParserTestCase):
+    def setUp(self):
+        super(TestSGLValidation, self).setUp()
+
+        self.__envs = []
+
+    def tearDown(self):
+        for key in self.__envs:
+            del os.environ[key]
+
+    def __set_env(self, key, value):
+        os.environ[key] = value
+        self.__envs.append(key)
+
+    def __build(self, parser):
+        parser.add_argument('name', default='app', pattern=r'[a-z]+')
+
+        group = parser.add_argument_group('range')
+        group.add_argument('low', default=1, type=int, minimum=0)
+        group.add_argument('high', default=10, type=int, maximum=100)
+        group.add_argument('ports', default='80', type=SGLList(int),
+                           minimum=1, maximum=65535)
+
+        parser.add_constraint(_ordered, 'range.low', 'range.high',
+                              message='should be ordered.')
+
+        return parser
+
+    def test_compile(self):
+        self.assertIsNone(_compile_constraints(None))
+
+        validate = _compile_constraints({'minimum': 0, 'maximum': 9})
+
+        self.assertIsNone(validate(5))
+        self.assertIsNone(validate(None))
+        self.assertIn('greater', validate(-1))
+        self.assertIn('less', validate(10))
+        self.assertIsNone(validate([1, 2]))
+        self.assertIsNotNone(validate({'a': 1, 'b': 10}))
+        self.assertIn('can not be checked', validate('a'))
+
+        with utils.config_file({}) as temp_file:
+            self.assertIsNone(_compile_constraints({'path': 'file'})(temp_file))
+            self.assertIsNotNone(_compile_constraints({'path': 'dir'})(
+                temp_file
+            ))
+            self.assertIsNone(_compile_constraints({'path': True})(temp_file))
+
+        self.assertIsNotNone(_compile_constraints({'check': bool})(0))
+
+        for constraints in [{'pattern': '('}, {'path': 'unknown'},
+                            {'check': 1}, {'unknown': 1}]:
+            with self.assertRaises(SGLException) as err:
+                _compile_constraints(constraints)
+
+            self.assertEqual(err.exception.code,
+                             SGL_PARSER_INVALID_PARSING_ARG)
+
+    def test_report(self):
+        env = '{}_RANGE_LOW'.format(self._APP_NAME.upper())
+        self.__set_env(env, '-1')
+
+        # Deferred parser checks them while resolving without the argparse.
+        for parser in [self.__build(SGLParser(self._APP_NAME)),
+                       self.__build(SGLParser.restore(
+                           SGLParser(self._APP_NAME).snapshot()
+                       ))]:
+            for args in [[], ['--core-name', 'Bad', '--range-high', '200',
+                              '--range-ports', '80,0']]:
+                with self.assertRaises(SGLValidationError) as err:
+                    parser.parse_args(args)
+
+                self.assertEqual(err.exception.code,
+                                 SGL_PARSER_CONSTRAINT_VIOLATION)
+
+                options = [v.option for v in err.exception.violations]
+                expected = ['range.low'] if not args else \
+                    ['core.name', 'range.low', 'range.high', 'range.ports']
+
+                self.assertEqual(options, expected)
+
+        # Cross-field constraint
+        del os.environ[env]
+        self.__envs.remove(env)
+
+        parser = self.__build(SGLParser(self._APP_NAME))
+
+        with self.assertRaises(SGLValidationError) as err:
+            parser.parse_frozen(['--range-low', '20'])
+
+        self.assertEqual(err.exception.violations, (SGLViolation(
+            'range.low,range.high', (20, 10), 'should be ordered.'
+        ),))
+
+        self.assertEqual(parser.parse_args(['--range-high', '50']).range.high,
+                         50)
+
+    def test_snapshot(self):
+        parser = self.__build(SGLParser(self._APP_NAME))
+        restored = SGLParser.restore(parser.snapshot())
+
+        self.assertEqual(restored.parse_args([]).range.ports.tolist(), [80])
+
+        with self.assertRaises(SGLValidationError):
+            restored.parse_args(['--range-low', '11'])
+
+    def test_invalid(self):
+        parser = SGLParser(self._APP_NAME)
+
+        with self.assertRaises(SGLException) as err:
+            parser.add_argument('value', type=int, minimum=0, pattern='(')
+
+        self.assertEqual(err.exception.code, SGL_PARSER_INVALID_PARSING_ARG)
+        self.assertFalse(hasattr(parser.parse_args([]), 'value'))
+
+        for names in [('unknown',), ('group.unknown',)]:
+            with self.assertRaises(SGLException) as err:
+                parser.add_constraint(_ordered, *names)
+
+            self.assertEqual(err.exception.code,
+                             SGL_PARSER_INVALID_PARSING_ARG)
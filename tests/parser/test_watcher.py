@@ -0,0 +1,177 @@
+import errno
+import json
+import os
+import time
+
+from unittest import mock
+
+from tests import utils
+from tests.parser import ParserTestCase
+
+from sglove.parser.exception import *
+from sglove.parser import SGLParser, SGLConfigWatcher
+
+
+class TestSGLConfigWatcher(ParserTestCase):
+    __TIMEOUT = 5.0
+
+    @staticmethod
+    def __write(path, configs):
+        # Replace the file like the deploy tools do.
+        temp = '{}.tmp'.format(path)
+
+        with open(temp, 'w') as f_out:
+            json.dump(configs, f_out)
+
+        os.replace(temp, path)
+
+    def __build(self, path):
+        parser = SGLParser(self._APP_NAME, path)
+        group = parser.add_argument_group('group')
+
+        group.add_argument('number', default=0, type=int)
+        group.add_argument('name', default='default', type=str)
+
+        return parser
+
+    def __wait_generation(self, watcher, generation):
+        deadline = time.monotonic() + self.__TIMEOUT
+
+        while watcher.generation < generation:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_reload(self):
+        configs = {'group': {'number': 1, 'name': 'first'}}
+
+        with utils.config_file(configs) as temp_file:
+            watcher = SGLConfigWatcher(self.__build(temp_file))
+            changes = []
+
+            watcher.subscribe(lambda c, o: changes.append(c))
+
+            old = watcher.options
+            self.assertEqual(old.group.number, 1)
+
+            # 1. Only the changed keys are notified.
+            self.__write(temp_file, {'group': {'number': 2, 'name': 'first'}})
+
+            self.assertEqual(watcher.reload(), {'group.number': (1, 2)})
+            self.assertEqual(changes, [{'group.number': (1, 2)}])
+            self.assertEqual(watcher.options.group.number, 2)
+            self.assertEqual(watcher.generation, 1)
+
+            # Published options are never modified.
+            self.assertEqual(old.group.number, 1)
+
+            # 2. Unchanged file doesn't call the callback.
+            self.assertEqual(watcher.reload(), {})
+            self.assertEqual(len(changes), 1)
+
+            # 3. Broken file keeps the current options.
+            with open(temp_file, 'w') as f_out:
+                f_out.write('{"group": ')
+
+            self.assertEqual(watcher.reload(), {})
+            self.assertEqual(watcher.options.group.number, 2)
+            self.assertEqual(watcher.last_error.code,
+                             SGL_PARSER_INVALID_CONFIG)
+
+    def test_frozen_reload(self):
+        configs = {'group': {'number': 1, 'name': 'first'}}
+
+        with utils.config_file(configs) as temp_file:
+            watcher = SGLConfigWatcher(self.__build(temp_file), frozen=True)
+
+            self.assertEqual(watcher.options.group.number, 1)
+
+            self.__write(temp_file, {'group': {'number': 2, 'name': 'second'}})
+
+            self.assertEqual(watcher.reload(), {'group.number': (1, 2),
+                                                'group.name': ('first',
+                                                               'second')})
+            self.assertEqual(watcher.options.group.number, 2)
+
+    def __test_watch(self, polling):
+        configs = {'group': {'number': 1, 'name': 'first'}}
+
+        with utils.config_file(configs) as temp_file:
+            watcher = SGLConfigWatcher(self.__build(temp_file),
+                                       interval=0.01, debounce=0.05,
+                                       polling=polling)
+
+            with watcher:
+                time.sleep(0.05)
+
+                for number in range(2, 5):
+                    self.__write(temp_file, {'group': {'number': number,
+                                                       'name': 'second'}})
+
+                self.__wait_generation(watcher, 1)
+
+                self.assertEqual(watcher.options.group.number, 4)
+                self.assertEqual(watcher.options.group.name, 'second')
+
+    def test_bad_value(self):
+        configs = {'group': {'number': 1, 'name': 'first'}}
+
+        with utils.config_file(configs) as temp_file:
+            watcher = SGLConfigWatcher(self.__build(temp_file),
+                                       interval=0.01, debounce=0.05,
+                                       polling=True)
+
+            with watcher:
+                time.sleep(0.05)
+
+                # 1. The value which fails the conversion is kept as the
+                #    error, and the thread keeps watching.
+                self.__write(temp_file, {'group': {'number': 'abc'}})
+
+                deadline = time.monotonic() + self.__TIMEOUT
+                while watcher.last_error is None:
+                    self.assertLess(time.monotonic(), deadline)
+                    time.sleep(0.01)
+
+                self.assertIsInstance(watcher.last_error, ValueError)
+                self.assertEqual(watcher.options.group.number, 1)
+
+                # 2. The next valid edit is published.
+                self.__write(temp_file, {'group': {'number': 2}})
+                self.__wait_generation(watcher, 1)
+
+                self.assertEqual(watcher.options.group.number, 2)
+                self.assertIsNone(watcher.last_error)
+
+    def test_polling_watch(self):
+        self.__test_watch(polling=True)
+
+    def test_native_watch(self):
+        self.__test_watch(polling=False)
+
+    def test_inotify_failure(self):
+        configs = {'group': {'number': 1, 'name': 'first'}}
+
+        with utils.config_file(configs) as temp_file:
+            watcher = SGLConfigWatcher(self.__build(temp_file),
+                                       interval=0.01, debounce=0.05)
+
+            # The inotify limit of the user is reached.
+            with mock.patch('sglove.parser.watcher._InotifyWaiter',
+                            side_effect=OSError(errno.EMFILE,
+                                                'inotify_init1 failed')):
+                watcher.start()
+
+            with watcher:
+                self.assertTrue(watcher.is_polling)
+                time.sleep(0.05)
+
+                self.__write(temp_file, {'group': {'number': 2}})
+                self.__wait_generation(watcher, 1)
+
+                self.assertEqual(watcher.options.group.number, 2)
+
+    def test_no_config(self):
+        with self.assertRaises(SGLException) as err:
+            SGLConfigWatcher(SGLParser(self._APP_NAME))
+
+        self.assertEqual(err.exception.code, SGL_PARSER_CONFIG_NOT_EXIST)